@@ -0,0 +1,54 @@
+"""
+Mueve al archivo histórico (config.db.archive.path) los contratos cerrados: fecha_fin
+anterior a la retención, todas sus órdenes en 'PAGO_EN_TRAMITE' y todos sus reportes
+'RESUELTO'. Junto con cada contrato se mueven sus artículos, programaciones, órdenes de
+compra, entradas de bodega, registros contables, reportes de incumplimiento y los
+movimientos y cortes de inventario de sus artículos.
+
+Uso:
+    python archivar_contratos.py [--url sqlite:///sigvcf_data.db] [--archivo sigvcf_archivo.db]
+                                 [--hasta AAAA-MM-DD] [--compactar]
+
+Puede repetirse sin riesgo: una corrida interrumpida se completa en la siguiente.
+"""
+import argparse
+import datetime
+import sys
+
+from containers import Container
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="URL de la base de datos (por defecto, la de la aplicación).")
+    parser.add_argument("--archivo", default=None, help="Ruta del archivo histórico.")
+    parser.add_argument("--hasta", type=datetime.date.fromisoformat, default=None,
+                        help="Archiva los contratos con fecha_fin anterior a esta fecha (por defecto, hoy menos la retención).")
+    parser.add_argument("--compactar", action="store_true", help="Ejecuta VACUUM en la base principal al terminar.")
+    args = parser.parse_args()
+
+    container = Container()
+    if args.url:
+        container.config.db.url.from_value(args.url)
+    if args.archivo:
+        container.config.db.archive.path.from_value(args.archivo)
+    container.config.db.archive.enabled.from_value(True)
+
+    movidas = container.archive_service().archivar(args.hasta)
+    if not movidas:
+        print("No hay contratos cerrados que archivar.")
+        return 0
+    print(f"Archivados en {container.config.db.archive.path()}:")
+    for tabla, filas in movidas.items():
+        print(f"  {tabla:<25} {filas}")
+
+    if args.compactar:
+        # VACUUM no puede correr dentro de una transacción: se ejecuta sobre la conexión DBAPI.
+        with container.db_engine().connect() as conn:
+            conn.connection.dbapi_connection.execute("VACUUM")
+        print("Base principal compactada.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
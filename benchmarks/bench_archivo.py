@@ -0,0 +1,193 @@
+"""
+Mide los listados principales antes y después de mover los contratos cerrados al archivo
+histórico, y el costo de las consultas históricas que se resuelven en el archivo.
+
+El conjunto sintético tiene N contratos con A artículos cada uno; una fracción está cerrada
+(fecha_fin de años atrás, órdenes en 'PAGO_EN_TRAMITE' y reportes resueltos) y el resto
+sigue activa.
+
+Uso:
+    python -m benchmarks.bench_archivo [--contratos 5000] [--articulos 20] [--activos 0.1]
+"""
+import argparse
+import datetime
+import os
+import tempfile
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import cronometro, resumen_ms, temp_engine
+from sigvcf.core.domain.models import (
+    ArticuloContrato, Contrato, CorteInventario, EntradaBodega, MovimientoInventario, OrdenDeCompra,
+    ProgramacionMensual, Proveedor, RegistroContable, ReporteIncumplimiento, Rol, Usuario,
+)
+from sigvcf.infrastructure.persistence.archive import ArchiveService
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.modules.administrativo.services import AdministrativoService
+from sigvcf.modules.almacen.services import AlmacenService
+from sigvcf.modules.nutricion.services import NutricionService
+from sigvcf.modules.proveedores.services import ProveedorService
+
+_HOY = datetime.date.today()
+_REPETICIONES = 10
+
+
+def _sembrar(engine, contratos: int, articulos: int, activos: float) -> int:
+    """Inserta el conjunto con executemany de Core; devuelve el número de contratos cerrados."""
+    cerrados = int(contratos * (1 - activos))
+    with engine.begin() as conn:
+        conn.execute(insert(Rol), [{"id": 1, "nombre_rol": "Admin", "permisos": {}}])
+        conn.execute(insert(Usuario), [{"id": 1, "nombre": "bench", "password_hash": "x", "rol_id": 1}])
+        conn.execute(insert(Proveedor), [
+            {"id": p, "razon_social": f"Proveedor {p}", "rfc": f"RFC{p:09d}"} for p in range(1, 51)
+        ])
+        conn.execute(insert(Contrato), [
+            {
+                "id": c, "codigo_licitacion": f"LPL-{c:06d}", "proveedor_id": c % 50 + 1,
+                "fecha_inicio": datetime.date(2015, 1, 1),
+                "fecha_fin": datetime.date(2016 + c % 5, 12, 31) if c <= cerrados else _HOY + datetime.timedelta(days=180),
+            }
+            for c in range(1, contratos + 1)
+        ])
+        conn.execute(insert(ArticuloContrato), [
+            {
+                "id": (c - 1) * articulos + a + 1, "contrato_id": c, "clave_articulo": f"A-{c}-{a}",
+                "descripcion": f"Artículo {a} del contrato {c}", "unidad_medida": "kg", "precio_unitario": 10.0,
+                "cant_maxima": 100000, "cant_consumida": 0, "clasificacion": "GRANOS",
+            }
+            for c in range(1, contratos + 1) for a in range(articulos)
+        ])
+        conn.execute(insert(ProgramacionMensual), [
+            {
+                "usuario_id": 1, "articulo_contrato_id": (c - 1) * articulos + 1,
+                "mes_anho": datetime.date(2016, mes, 1), "cantidades_por_dia": {"1": 1, "15": 2},
+            }
+            for c in range(1, contratos + 1) for mes in range(1, 13)
+        ])
+        conn.execute(insert(OrdenDeCompra), [
+            {
+                "id": c * 3 + o, "contrato_id": c, "fecha_entrega_programada": datetime.date(2016, 1 + o, 1),
+                "estado": "PAGO_EN_TRAMITE" if c <= cerrados else "APROBADA",
+            }
+            for c in range(1, contratos + 1) for o in range(3)
+        ])
+        conn.execute(insert(EntradaBodega), [
+            {
+                "id": c * 3 + o, "folio_rb": f"RB-{c * 3 + o:08d}", "orden_compra_id": c * 3 + o,
+                "fecha_recepcion": datetime.datetime(2016, 1 + o, 5), "factura_xml_path": "/f.xml",
+                "recepcionista_id": 1,
+            }
+            for c in range(1, cerrados + 1) for o in range(3)
+        ])
+        # Cada entrada anota su primer artículo en el libro, con un corte al mes siguiente.
+        conn.execute(insert(MovimientoInventario), [
+            {
+                "articulo_contrato_id": (c - 1) * articulos + 1, "fecha": datetime.datetime(2016, 1 + o, 5),
+                "tipo": "ENTRADA", "cantidad": 10, "referencia": f"RB-{c * 3 + o:08d}",
+            }
+            for c in range(1, contratos + 1) for o in range(3)
+        ])
+        conn.execute(insert(CorteInventario), [
+            {"articulo_contrato_id": (c - 1) * articulos + 1, "fecha_corte": datetime.datetime(2016, 5, 1),
+             "existencia": 30}
+            for c in range(1, contratos + 1)
+        ])
+        conn.execute(insert(RegistroContable), [
+            {"entrada_bodega_id": c * 3 + o, "asiento_contable": "POLIZA", "contador_id": 1}
+            for c in range(1, cerrados + 1) for o in range(3)
+        ])
+        conn.execute(insert(ReporteIncumplimiento), [
+            {"contrato_id": c, "tipo": "ATRASO", "estado": "RESUELTO", "descripcion": f"Reporte {c}"}
+            for c in range(1, contratos + 1, 4)
+        ])
+    return cerrados
+
+
+def _listados(uow) -> dict:
+    administrativo, almacen, nutricion = AdministrativoService(uow), AlmacenService(uow), NutricionService(uow)
+    casos = {
+        "listar_contratos": administrativo.listar_contratos,
+        "obtener_estado_stock": almacen.obtener_estado_stock,
+        "obtener_articulos_disponibles": nutricion.obtener_articulos_disponibles,
+    }
+    tiempos = {}
+    for nombre, caso in casos.items():
+        tiempos[nombre] = []
+        for _ in range(_REPETICIONES):
+            with cronometro(tiempos[nombre]):
+                filas = len(caso())
+        tiempos[nombre] = (tiempos[nombre], filas)
+    return tiempos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contratos", type=int, default=5000)
+    parser.add_argument("--articulos", type=int, default=20)
+    parser.add_argument("--activos", type=float, default=0.1)
+    args = parser.parse_args()
+    ruta_archivo = os.path.join(tempfile.mkdtemp(prefix="sigvcf_bench_"), "archivo.db")
+
+    with temp_engine() as engine:
+        cerrados = _sembrar(engine, args.contratos, args.articulos, args.activos)
+        archivo = ArchiveService(engine, path=ruta_archivo, enabled=True)
+        uow = SqlAlchemyUnitOfWork(
+            sessionmaker(bind=engine, autoflush=False), archive=archivo,
+            archive_session_factory=sessionmaker(bind=archivo.engine, autoflush=False),
+        )
+        print(f"{args.contratos} contratos ({cerrados} cerrados) x {args.articulos} artículos")
+        antes = _listados(uow)
+
+        duracion = []
+        with cronometro(duracion):
+            movidas = archivo.archivar()
+        print(f"Archivado: {movidas.get('contrato', 0)} contratos en {duracion[0] * 1000:.0f} ms  {movidas}")
+        with engine.connect() as conn:
+            restantes = conn.execute(select(func.count()).select_from(Contrato)).scalar_one()
+        assert restantes == args.contratos - cerrados, restantes
+        with engine.connect() as conn:
+            # Nada en la base principal queda apuntando a filas que se movieron al archivo.
+            huerfanas = conn.exec_driver_sql("PRAGMA foreign_key_check").all()
+            movimientos = conn.execute(select(func.count()).select_from(MovimientoInventario)).scalar_one()
+        assert not huerfanas, huerfanas[:10]
+        assert movimientos == 3 * (args.contratos - cerrados), movimientos
+        print("  foreign_key_check vacío tras archivar: OK")
+        with engine.connect() as conn:
+            # Un contrato nuevo no recibe el id de uno archivado (AUTOINCREMENT).
+            nuevo = conn.execute(insert(Contrato).values(
+                codigo_licitacion="LPL-NUEVO", proveedor_id=1, fecha_inicio=_HOY, fecha_fin=_HOY,
+            ).returning(Contrato.id)).scalar_one()
+            conn.rollback()
+        with archivo.engine.connect() as conn:
+            archivado = conn.execute(select(func.max(Contrato.id))).scalar()
+        assert nuevo > archivado, (nuevo, archivado)
+        print("  los ids archivados no se reutilizan: OK")
+
+        despues = _listados(uow)
+        print("Listados (base principal):")
+        for nombre, (tiempos, filas) in antes.items():
+            tiempos_despues, filas_despues = despues[nombre]
+            print(f"  {nombre}:")
+            print(f"    antes   ({filas:6d} filas): {resumen_ms(tiempos)}")
+            print(f"    después ({filas_despues:6d} filas): {resumen_ms(tiempos_despues)}")
+
+        administrativo, proveedores = AdministrativoService(uow), ProveedorService(uow)
+        contrato_id, orden_id = 2, 2 * 3
+        por_id, entrega = [], []
+        for _ in range(_REPETICIONES):
+            with cronometro(por_id):
+                contrato = administrativo.obtener_contrato_por_id(contrato_id)
+            with cronometro(entrega):
+                estado = proveedores.consultar_estado_entrega(f"RB-{orden_id:08d}", contrato_id % 50 + 1)
+        assert contrato is not None and len(contrato.articulos) == args.articulos
+        assert estado.estado_orden_compra == "PAGO_EN_TRAMITE"
+        print("Consultas históricas (base principal y luego archivo):")
+        print(f"  obtener_contrato_por_id: {resumen_ms(por_id)}")
+        print(f"  consultar_estado_entrega: {resumen_ms(entrega)}")
+        print(f"  listar_contratos_archivados: {len(administrativo.listar_contratos_archivados())} contratos")
+        archivo.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Compara la escritura objeto por objeto contra las operaciones masivas de los repositorios.
+
+Casos:
+  - alta de una licitación con N artículos (crear_o_actualizar_contrato),
+  - un año de propuestas de aprovisionamiento (generar_propuesta_aprovisionamiento),
+  - upsert de programaciones mensuales (add por objeto vs. upsert_many).
+
+Uso:
+    python -m benchmarks.bench_bulk_writes [--articulos 5000] [--propuestas 5000]
+"""
+import argparse
+import datetime
+import time
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import temp_engine
+from sigvcf.core.domain.models import ArticuloContrato, Contrato, OrdenDeCompra, Proveedor, ProgramacionMensual
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.modules.administrativo.dto import ArticuloContratoDTO, ContratoDTO
+from sigvcf.modules.administrativo.services import AdministrativoService
+from sigvcf.modules.almacen.dto import OrdenCompraCreateDTO
+from sigvcf.modules.almacen.services import AlmacenService
+
+
+def _medir(etiqueta: str, funcion) -> None:
+    inicio = time.perf_counter()
+    funcion()
+    print(f"  {etiqueta:<42} {(time.perf_counter() - inicio) * 1000:9.1f} ms")
+
+
+def _preparar(engine):
+    uow = SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False))
+    with uow:
+        uow.proveedores.add(Proveedor(id=1, razon_social="Proveedor Bench", rfc="BENCH000000"))
+    return uow
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articulos", type=int, default=5000)
+    parser.add_argument("--propuestas", type=int, default=5000)
+    args = parser.parse_args()
+
+    articulos = [
+        ArticuloContratoDTO(
+            clave_articulo=f"A-{i:05d}", descripcion=f"Artículo {i}", unidad_medida="kg",
+            precio_unitario=12.5, cant_maxima=1000, clasificacion="GRANOS",
+        )
+        for i in range(args.articulos)
+    ]
+    hoy = datetime.date(2025, 1, 1)
+    propuestas = [
+        OrdenCompraCreateDTO(contrato_id=1, fecha_entrega_programada=hoy + datetime.timedelta(days=i % 365))
+        for i in range(args.propuestas)
+    ]
+
+    print(f"Licitación con {args.articulos} artículos:")
+    with temp_engine() as engine:
+        uow = _preparar(engine)
+
+        def por_objeto():
+            with uow:
+                contrato = Contrato(
+                    codigo_licitacion="LPL-OBJ", fecha_inicio=hoy, fecha_fin=hoy, proveedor_id=1,
+                    articulos=[ArticuloContrato(**art.model_dump()) for art in articulos],
+                )
+                uow.contratos.add(contrato)
+                uow.commit()
+
+        _medir("ORM, un objeto por artículo", por_objeto)
+        servicio = AdministrativoService(uow)
+        dto = ContratoDTO(codigo_licitacion="LPL-BULK", fecha_inicio=hoy, fecha_fin=hoy,
+                          proveedor_id=1, articulos=articulos)
+        _medir("crear_o_actualizar_contrato (add_many)", lambda: servicio.crear_o_actualizar_contrato(dto))
+
+    print(f"Propuestas de aprovisionamiento ({args.propuestas}):")
+    with temp_engine() as engine:
+        uow = _preparar(engine)
+        with uow:
+            uow.contratos.add(Contrato(id=1, codigo_licitacion="LPL-1", fecha_inicio=hoy, fecha_fin=hoy, proveedor_id=1))
+
+        def por_objeto():
+            with uow:
+                for propuesta in propuestas:
+                    uow.contratos.get(propuesta.contrato_id)
+                    uow.ordenes_de_compra.add(OrdenDeCompra(estado='BORRADOR', **propuesta.model_dump()))
+                uow.commit()
+
+        def modo_bulk():
+            with uow:
+                with uow.bulk():
+                    for propuesta in propuestas:
+                        uow.ordenes_de_compra.add(OrdenDeCompra(estado='BORRADOR', **propuesta.model_dump()))
+                uow.commit()
+
+        _medir("ORM, un objeto por propuesta", por_objeto)
+        _medir("uow.bulk() + repo.add()", modo_bulk)
+        servicio = AlmacenService(uow)
+        _medir("generar_propuesta_aprovisionamiento", lambda: servicio.generar_propuesta_aprovisionamiento(propuestas))
+
+    print(f"Upsert de programaciones ({args.articulos} artículos x 12 meses):")
+    with temp_engine() as engine:
+        uow = _preparar(engine)
+        filas = [
+            {
+                "usuario_id": 1, "articulo_contrato_id": a, "mes_anho": datetime.date(2025, mes, 1),
+                "cantidades_por_dia": {"1": 10, "15": 20},
+            }
+            for a in range(1, args.articulos + 1) for mes in range(1, 13)
+        ]
+
+        def por_objeto():
+            with uow:
+                for fila in filas:
+                    existente = uow.programaciones_mensuales.find_one_by(
+                        articulo_contrato_id=fila["articulo_contrato_id"], mes_anho=fila["mes_anho"]
+                    )
+                    if existente:
+                        existente.cantidades_por_dia = fila["cantidades_por_dia"]
+                    else:
+                        uow.programaciones_mensuales.add(ProgramacionMensual(**fila))
+                uow.commit()
+
+        def upsert():
+            with uow:
+                uow.programaciones_mensuales.upsert_many(filas, conflict_keys=["articulo_contrato_id", "mes_anho"])
+                uow.commit()
+
+        _medir("find_one_by + add por programación", por_objeto)
+        _medir("upsert_many (ON CONFLICT DO UPDATE)", upsert)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Búsqueda de artículos de contrato por texto con N artículos.
+
+Compara, para prefijos de palabras tal como se escriben en el buscador:
+  - carga completa + filtro en cliente: lo que hacía ContratosView con QSortFilterProxyModel,
+    que necesita tener todas las filas en el modelo de la tabla,
+  - LIKE '%palabra%' en SQL (una condición por palabra): no puede usar índices; con un
+    LIMIT y un término frecuente termina pronto, pero con uno poco frecuente recorre la tabla,
+  - FTS5 (SearchService.buscar_articulos): índice invertido con prefijos, ordenado por bm25.
+Se miden dos casos: prefijos de productos (términos frecuentes) y claves de artículo
+(términos que aparecen en una sola fila).
+También mide SearchService.buscar_contratos, que filtra la lista de contratos.
+
+Uso:
+    python -m benchmarks.bench_busqueda [--articulos 50000] [--consultas 50]
+"""
+import argparse
+import datetime
+import random
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import cronometro, resumen_ms, temp_engine
+from sigvcf.core.domain.models import ArticuloContrato, Contrato, Proveedor
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.modules.busqueda.services import SearchService
+
+_PRODUCTOS = (
+    "arroz", "frijol", "lenteja", "garbanzo", "avena", "harina", "azúcar", "aceite", "atún", "sardina",
+    "leche", "yogur", "queso", "mantequilla", "huevo", "pollo", "res", "cerdo", "pescado", "jamón",
+    "manzana", "plátano", "naranja", "papaya", "jitomate", "cebolla", "zanahoria", "papa", "calabaza", "chile",
+)
+_DETALLES = (
+    "entero", "descremado", "orgánico", "congelado", "fresco", "enlatado", "en polvo", "granel",
+    "grano largo", "bajo en sodio", "sin azúcar", "deshidratado", "en agua", "en aceite", "rebanado",
+)
+_ARTICULOS_POR_CONTRATO = 50
+
+
+def _sembrar(engine, articulos: int) -> None:
+    aleatorio = random.Random(19)
+    contratos = max(1, articulos // _ARTICULOS_POR_CONTRATO)
+    with engine.begin() as conn:
+        conn.execute(insert(Proveedor), [
+            {"id": p, "razon_social": f"Comercializadora {aleatorio.choice(_PRODUCTOS).title()} {p}", "rfc": f"RFC{p:09d}"}
+            for p in range(1, 201)
+        ])
+        conn.execute(insert(Contrato), [
+            {"id": c, "codigo_licitacion": f"LPL-{c:06d}", "proveedor_id": c % 200 + 1,
+             "fecha_inicio": datetime.date(2024, 1, 1), "fecha_fin": datetime.date(2024, 12, 31)}
+            for c in range(1, contratos + 1)
+        ])
+        conn.execute(insert(ArticuloContrato), [
+            {"id": a, "contrato_id": (a - 1) // _ARTICULOS_POR_CONTRATO + 1, "clave_articulo": f"ART-{a:07d}",
+             "descripcion": f"{aleatorio.choice(_PRODUCTOS).capitalize()} {aleatorio.choice(_DETALLES)} "
+                            f"presentación {aleatorio.randint(1, 50)} kg",
+             "unidad_medida": "kg", "precio_unitario": 1.0, "cant_maxima": 1000, "clasificacion": "GRANOS"}
+            for a in range(1, contratos * _ARTICULOS_POR_CONTRATO + 1)
+        ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articulos", type=int, default=50_000)
+    parser.add_argument("--consultas", type=int, default=50)
+    parser.add_argument("--limite", type=int, default=50)
+    args = parser.parse_args()
+
+    with temp_engine() as engine:
+        _sembrar(engine, args.articulos)
+        uow = SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False))
+        servicio = SearchService(uow)
+
+        aleatorio = random.Random(7)
+        # Prefijos de 3 a 5 letras de una o dos palabras, como al escribir en el buscador.
+        textos = []
+        for _ in range(args.consultas):
+            palabras = [aleatorio.choice(_PRODUCTOS)] + ([aleatorio.choice(_DETALLES)] if aleatorio.random() < 0.5 else [])
+            textos.append(" ".join(p.split()[0][:aleatorio.randint(3, 5)] for p in palabras))
+
+        claves = [f"{aleatorio.randint(1, args.articulos):07d}" for _ in range(args.consultas)]
+
+        for caso, consultas in (("prefijos de producto", textos), ("claves de artículo", claves)):
+            cliente, like, fts, contratos = [], [], [], []
+            for texto in consultas:
+                palabras = texto.lower().split()
+                with cronometro(cliente):
+                    with uow.readonly():
+                        filas = uow.session.execute(
+                            select(ArticuloContrato.id, ArticuloContrato.clave_articulo, ArticuloContrato.descripcion)
+                        ).all()
+                    [f for f in filas
+                     if all(p in f"{f.clave_articulo} {f.descripcion}".lower() for p in palabras)][:args.limite]
+                with cronometro(like):
+                    with uow.readonly():
+                        texto_articulo = ArticuloContrato.clave_articulo + " " + ArticuloContrato.descripcion
+                        uow.session.execute(
+                            select(ArticuloContrato.id, ArticuloContrato.descripcion)
+                            .where(*[texto_articulo.like(f"%{p}%") for p in palabras])
+                            .limit(args.limite)
+                        ).all()
+                with cronometro(fts):
+                    resultados = servicio.buscar_articulos(texto, args.limite)
+                assert resultados and all(r.tipo == 'ARTICULO' for r in resultados), texto
+                with cronometro(contratos):
+                    servicio.buscar_contratos(texto)
+
+            print(f"{args.articulos} artículos, {args.consultas} búsquedas de {caso} (límite {args.limite}):")
+            print(f"  carga completa + filtro en cliente: {resumen_ms(cliente)}")
+            print(f"  LIKE '%palabra%':                   {resumen_ms(like)}")
+            print(f"  FTS5 con prefijos (bm25):           {resumen_ms(fts)}")
+            print(f"  buscar_contratos (FTS5):            {resumen_ms(contratos)}")
+
+
+if __name__ == "__main__":
+    main()
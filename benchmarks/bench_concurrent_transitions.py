@@ -0,0 +1,173 @@
+"""
+Prueba de estrés de despachos concurrentes: varios hilos (terminales de almacén) escanean
+los mismos códigos QR a la vez.
+
+Compara dos implementaciones de AlmacenService.despachar_requerimiento:
+  - lectura-modificación-escritura: SELECT del requerimiento y de cada artículo, cambio de
+    estado y `cant_consumida += n` en Python (la implementación anterior),
+  - transiciones atómicas: UPDATE condicional del estado con verificación de rowcount e
+    incrementos del lado de SQL (la implementación actual).
+
+Para cada una informa el rendimiento (intentos y despachos por segundo) y la corrección:
+cada requerimiento debe despacharse exactamente una vez, y el consumo de cada artículo
+debe ser exactamente requerimientos x cantidad programada. Los intentos que fallan con
+"database is locked" se cuentan aparte: la terminal tendría que volver a escanear.
+
+Uso:
+    python -m benchmarks.bench_concurrent_transitions [--hilos 8] [--requerimientos 200] [--articulos 20]
+"""
+import argparse
+import collections
+import datetime
+import random
+import threading
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import temp_engine
+from sigvcf.core.domain.models import (
+    ArticuloContrato, Contrato, Proveedor, SalidaRequerimiento,
+)
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.modules.almacen.services import AlmacenService
+
+_MES = datetime.date(2025, 3, 1)
+_CANTIDAD_POR_DIA = 2
+_DIAS = 30
+
+
+class _AlmacenLecturaEscritura(AlmacenService):
+    """La implementación anterior del despacho, conservada solo para comparar."""
+
+    def despachar_requerimiento(self, qr_id: str) -> None:
+        with self.uow:
+            requerimiento = self.uow.salidas_requerimiento.find_one_by(qr_id=qr_id)
+            if not requerimiento:
+                raise ValueError(f"Requerimiento con QR ID '{qr_id}' no encontrado.")
+            if requerimiento.estado != 'PREVIA':
+                raise ValueError(f"El requerimiento '{qr_id}' no está en estado 'PREVIA' para ser despachado.")
+            for prog in self.uow.programaciones_mensuales.find(mes_anho=_MES):
+                articulo = self.uow.articulos_contrato.get(prog.articulo_contrato_id)
+                articulo.cant_consumida += sum(prog.cantidades_por_dia.values())
+            requerimiento.estado = 'SURTIDA'
+            self.uow.commit()
+
+
+def _preparar(engine, requerimientos: int, articulos: int) -> list:
+    uow = SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False))
+    with uow:
+        uow.proveedores.add(Proveedor(id=1, razon_social="Proveedor Bench", rfc="BENCH000000"))
+        uow.contratos.add(Contrato(
+            id=1, codigo_licitacion="LIC-BENCH", proveedor_id=1,
+            fecha_inicio=_MES, fecha_fin=_MES + datetime.timedelta(days=365),
+        ))
+        uow.articulos_contrato.add_many([
+            {"id": i + 1, "contrato_id": 1, "clave_articulo": f"A-{i:05d}", "descripcion": f"Artículo {i}",
+             "unidad_medida": "kg", "precio_unitario": 1.0, "cant_maxima": 10**9, "cant_consumida": 0,
+             "clasificacion": "GRANOS"}
+            for i in range(articulos)
+        ])
+        uow.programaciones_mensuales.add_many([
+            {"usuario_id": None, "articulo_contrato_id": i + 1, "mes_anho": _MES,
+             "cantidades_por_dia": {dia: _CANTIDAD_POR_DIA for dia in range(1, _DIAS + 1)}}
+            for i in range(articulos)
+        ])
+        qr_ids = [f"REQ-{_MES:%Y%m}-{n:08X}" for n in range(requerimientos)]
+        uow.salidas_requerimiento.add_many([
+            {"qr_id": qr, "usuario_solicitante_id": None, "estado": "PREVIA",
+             "fecha_generacion": datetime.datetime(2025, 3, 1)}
+            for qr in qr_ids
+        ])
+        uow.commit()
+    return qr_ids
+
+
+def _correr(engine, servicio_cls, qr_ids: list, hilos: int) -> dict:
+    despachos = collections.Counter()
+    conteo = collections.Counter()
+    lock = threading.Lock()
+    barrera = threading.Barrier(hilos)
+
+    def terminal(semilla: int):
+        servicio = servicio_cls(SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False)))
+        pendientes = list(qr_ids)
+        random.Random(semilla).shuffle(pendientes)
+        barrera.wait()
+        for qr in pendientes:
+            try:
+                servicio.despachar_requerimiento(qr)
+                resultado = "despachado"
+            except ValueError:
+                resultado = "rechazado"
+            except OperationalError:
+                resultado = "bloqueado"
+            with lock:
+                conteo[resultado] += 1
+                if resultado == "despachado":
+                    despachos[qr] += 1
+
+    trabajadores = [threading.Thread(target=terminal, args=(n,)) for n in range(hilos)]
+    inicio = time.perf_counter()
+    for t in trabajadores:
+        t.start()
+    for t in trabajadores:
+        t.join()
+    duracion = time.perf_counter() - inicio
+
+    uow = SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False))
+    with uow.readonly():
+        surtidos = uow.session.execute(
+            select(func.count()).where(SalidaRequerimiento.estado == 'SURTIDA')
+        ).scalar_one()
+        consumos = set(uow.session.execute(select(ArticuloContrato.cant_consumida)).scalars())
+    return {
+        "duracion": duracion, "conteo": conteo, "dobles": sum(1 for n in despachos.values() if n > 1),
+        "despachados": len(despachos), "surtidos": surtidos, "consumos": consumos,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hilos", type=int, default=8)
+    parser.add_argument("--requerimientos", type=int, default=200)
+    parser.add_argument("--articulos", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{args.hilos} terminales escanean los mismos {args.requerimientos} QR "
+          f"({args.articulos} artículos programados por mes):")
+    correcto = True
+    for etiqueta, servicio_cls in (
+        ("lectura-modificación-escritura", _AlmacenLecturaEscritura),
+        ("transiciones atómicas", AlmacenService),
+    ):
+        with temp_engine() as engine:
+            qr_ids = _preparar(engine, args.requerimientos, args.articulos)
+            r = _correr(engine, servicio_cls, qr_ids, args.hilos)
+
+        intentos = sum(r["conteo"].values())
+        # Consumo esperado por artículo según los requerimientos que quedaron SURTIDOS.
+        esperado = r["surtidos"] * _CANTIDAD_POR_DIA * _DIAS
+        consumo_ok = r["consumos"] == {esperado}
+        ok = r["dobles"] == 0 and r["surtidos"] == r["despachados"] and consumo_ok
+        if servicio_cls is AlmacenService:
+            # Con las transiciones atómicas ningún escaneo debe perderse por bloqueo.
+            ok = ok and r["surtidos"] == args.requerimientos and not r["conteo"]["bloqueado"]
+            correcto = ok
+        consumo = "correcto" if consumo_ok else f"INCORRECTO {sorted(r['consumos'])[:3]} != {esperado}"
+        print(f"  {etiqueta}:")
+        print(f"    {intentos / r['duracion']:8.0f} intentos/s  {r['despachados'] / r['duracion']:7.0f} despachos/s  "
+              f"({r['duracion']:.2f} s)")
+        print(f"    despachados={r['despachados']}  rechazados={r['conteo']['rechazado']}  "
+              f"bloqueados={r['conteo']['bloqueado']}  dobles={r['dobles']}  "
+              f"consumo={consumo}"
+              f"  {'OK' if ok else 'ERROR'}")
+
+    if not correcto:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
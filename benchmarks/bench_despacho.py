@@ -0,0 +1,138 @@
+"""
+Despacho de un requerimiento mensual con N artículos programados en el mes.
+
+Compara el descuento de stock y el registro en el libro de movimientos:
+  - por programación: recorre las programaciones del mes, suma el JSON en Python y hace
+    un get() y un UPDATE por artículo (1 + 2N sentencias),
+  - agregado + UPDATE por artículo: el total del mes se suma en SQL, pero se aplica con
+    un UPDATE por artículo y un executemany para el libro (2 + N sentencias),
+  - operación de conjunto: AlmacenService.despachar_requerimiento, un INSERT ... SELECT
+    para el libro y un UPDATE ... FROM para el stock (2 sentencias).
+Cada variante despacha su propio requerimiento y se comprueba que todas dejan los mismos
+totales consumidos.
+
+Uso:
+    python -m benchmarks.bench_despacho [--articulos 2000] [--repeticiones 10]
+"""
+import argparse
+import datetime
+import random
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import cronometro, resumen_ms, temp_engine
+from sigvcf.core.domain.models import (
+    ArticuloContrato, Contrato, ProgramacionDia, ProgramacionMensual, Proveedor, Rol,
+    SalidaRequerimiento, Usuario,
+)
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.modules.almacen.services import AlmacenService
+
+_MES = datetime.date(2025, 3, 1)
+
+
+def _sembrar(engine, articulos: int, requerimientos: int) -> None:
+    aleatorio = random.Random(22)
+    with engine.begin() as conn:
+        conn.execute(insert(Rol), [{"id": 1, "nombre_rol": "Admin", "permisos": {}}])
+        conn.execute(insert(Usuario), [{"id": 1, "nombre": "bench", "password_hash": "x", "rol_id": 1}])
+        conn.execute(insert(Proveedor), [{"id": 1, "razon_social": "Proveedor", "rfc": "RFC000000001"}])
+        conn.execute(insert(Contrato), [{
+            "id": 1, "codigo_licitacion": "LPL-1", "proveedor_id": 1,
+            "fecha_inicio": datetime.date(2025, 1, 1), "fecha_fin": datetime.date(2025, 12, 31),
+        }])
+        conn.execute(insert(ArticuloContrato), [
+            {"id": a, "contrato_id": 1, "clave_articulo": f"A-{a}", "descripcion": f"Artículo {a}",
+             "unidad_medida": "kg", "precio_unitario": 1.0, "cant_maxima": 10**9, "cant_consumida": 0,
+             "clasificacion": "GRANOS"}
+            for a in range(1, articulos + 1)
+        ])
+        conn.execute(insert(ProgramacionMensual), [
+            {"usuario_id": 1, "articulo_contrato_id": a, "mes_anho": _MES,
+             "cantidades_por_dia": {str(d): aleatorio.randint(0, 20) for d in range(1, 32)}}
+            for a in range(1, articulos + 1)
+        ])
+        conn.execute(insert(SalidaRequerimiento), [
+            {"qr_id": f"REQ-{_MES:%Y%m}-{n:04d}", "usuario_solicitante_id": 1, "estado": "PREVIA"}
+            for n in range(requerimientos)
+        ])
+
+
+def _por_programacion(uow: SqlAlchemyUnitOfWork, qr_id: str) -> None:
+    with uow:
+        uow.salidas_requerimiento.transition(qr_id, 'PREVIA', 'SURTIDA', by="qr_id")
+        fecha = datetime.datetime.utcnow()
+        salidas = []
+        for programacion in uow.programaciones_mensuales.find(mes_anho=_MES):
+            cantidad = sum(programacion.cantidades_por_dia.values())
+            if cantidad > 0 and uow.articulos_contrato.get(programacion.articulo_contrato_id):
+                uow.articulos_contrato.increment(programacion.articulo_contrato_id, cant_consumida=cantidad)
+                salidas.append({"articulo_contrato_id": programacion.articulo_contrato_id, "fecha": fecha,
+                                "tipo": 'SALIDA', "cantidad": -cantidad, "referencia": qr_id})
+        uow.movimientos_inventario.add_many(salidas)
+        uow.commit()
+
+
+def _agregado_por_articulo(uow: SqlAlchemyUnitOfWork, qr_id: str) -> None:
+    with uow:
+        uow.salidas_requerimiento.transition(qr_id, 'PREVIA', 'SURTIDA', by="qr_id")
+        totales = uow.session.execute(
+            select(ProgramacionMensual.articulo_contrato_id, func.sum(ProgramacionDia.cantidad))
+            .join(ProgramacionDia, ProgramacionDia.programacion_id == ProgramacionMensual.id)
+            .where(ProgramacionMensual.mes_anho == _MES)
+            .group_by(ProgramacionMensual.id)
+        ).all()
+        fecha = datetime.datetime.utcnow()
+        salidas = []
+        for articulo_id, cantidad in totales:
+            if cantidad > 0 and uow.articulos_contrato.increment(articulo_id, cant_consumida=cantidad):
+                salidas.append({"articulo_contrato_id": articulo_id, "fecha": fecha, "tipo": 'SALIDA',
+                                "cantidad": -cantidad, "referencia": qr_id})
+        uow.movimientos_inventario.add_many(salidas)
+        uow.commit()
+
+
+def _consumido(engine) -> dict:
+    with engine.connect() as conn:
+        return dict(conn.execute(select(ArticuloContrato.id, ArticuloContrato.cant_consumida)).all())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articulos", type=int, default=2000)
+    parser.add_argument("--repeticiones", type=int, default=10)
+    args = parser.parse_args()
+
+    with temp_engine() as engine:
+        _sembrar(engine, args.articulos, 3 * args.repeticiones)
+        uow = SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False))
+        servicio = AlmacenService(uow)
+        variantes = {
+            "por programación (1 + 2N)": lambda qr: _por_programacion(uow, qr),
+            "agregado + UPDATE por artículo (2 + N)": lambda qr: _agregado_por_articulo(uow, qr),
+            "operación de conjunto (2)": servicio.despachar_requerimiento,
+        }
+
+        qr_ids = iter(f"REQ-{_MES:%Y%m}-{n:04d}" for n in range(3 * args.repeticiones))
+        tiempos = {nombre: [] for nombre in variantes}
+        incrementos = {}
+        for nombre, despachar in variantes.items():
+            antes = _consumido(engine)
+            for _ in range(args.repeticiones):
+                qr_id = next(qr_ids)
+                with cronometro(tiempos[nombre]):
+                    despachar(qr_id)
+            despues = _consumido(engine)
+            incrementos[nombre] = {a: despues[a] - antes[a] for a in despues}
+        referencia = next(iter(incrementos.values()))
+        assert all(inc == referencia for inc in incrementos.values())
+
+        print(f"Despacho de un requerimiento con {args.articulos} artículos programados en el mes:")
+        for nombre, valores in tiempos.items():
+            print(f"  {nombre:<40} {resumen_ms(valores)}")
+        print("  mismos totales consumidos en las tres variantes: OK")
+
+
+if __name__ == "__main__":
+    main()
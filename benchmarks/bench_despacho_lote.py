@@ -0,0 +1,126 @@
+"""
+Sesión de escaneo en el andén: N requerimientos despachados uno por uno frente a un lote.
+
+Compara:
+  - uno por uno: lo que hacía AlmacenViewModel.despachar_por_qr por cada lectura, una
+    transacción (con su COMMIT y fsync) por requerimiento y una recarga del estado de
+    stock después de cada despacho,
+  - lote: AlmacenService.despachar_requerimientos con todos los QR en una transacción
+    (un SAVEPOINT por requerimiento) y una sola recarga del stock al final.
+Cada sesión incluye un QR duplicado y uno inexistente para ejercitar los rechazos, y se
+comprueba que ambas variantes dejan los mismos totales consumidos.
+
+Uso:
+    python -m benchmarks.bench_despacho_lote [--articulos 500] [--escaneos 50] [--repeticiones 5]
+"""
+import argparse
+import datetime
+import random
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import cronometro, resumen_ms, temp_engine
+from sigvcf.core.domain.models import (
+    ArticuloContrato, Contrato, ProgramacionMensual, Proveedor, Rol, SalidaRequerimiento, Usuario,
+)
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.modules.almacen.services import AlmacenService
+
+_MES = datetime.date(2025, 3, 1)
+
+
+def _qr(n: int) -> str:
+    return f"REQ-{_MES:%Y%m}-{n:05d}"
+
+
+def _sembrar(engine, articulos: int, requerimientos: int) -> None:
+    aleatorio = random.Random(23)
+    with engine.begin() as conn:
+        conn.execute(insert(Rol), [{"id": 1, "nombre_rol": "Admin", "permisos": {}}])
+        conn.execute(insert(Usuario), [{"id": 1, "nombre": "bench", "password_hash": "x", "rol_id": 1}])
+        conn.execute(insert(Proveedor), [{"id": 1, "razon_social": "Proveedor", "rfc": "RFC000000001"}])
+        conn.execute(insert(Contrato), [{
+            "id": 1, "codigo_licitacion": "LPL-1", "proveedor_id": 1,
+            "fecha_inicio": datetime.date(2025, 1, 1), "fecha_fin": datetime.date(2025, 12, 31),
+        }])
+        conn.execute(insert(ArticuloContrato), [
+            {"id": a, "contrato_id": 1, "clave_articulo": f"A-{a}", "descripcion": f"Artículo {a}",
+             "unidad_medida": "kg", "precio_unitario": 1.0, "cant_maxima": 10**9, "cant_consumida": 0,
+             "clasificacion": "GRANOS"}
+            for a in range(1, articulos + 1)
+        ])
+        conn.execute(insert(ProgramacionMensual), [
+            {"usuario_id": 1, "articulo_contrato_id": a, "mes_anho": _MES,
+             "cantidades_por_dia": {str(d): aleatorio.randint(0, 20) for d in range(1, 32)}}
+            for a in range(1, articulos + 1)
+        ])
+        conn.execute(insert(SalidaRequerimiento), [
+            {"qr_id": _qr(n), "usuario_solicitante_id": 1, "estado": "PREVIA"}
+            for n in range(requerimientos)
+        ])
+
+
+def _uno_por_uno(servicio: AlmacenService, qr_ids) -> int:
+    despachados = 0
+    for qr_id in qr_ids:
+        try:
+            servicio.despachar_requerimiento(qr_id)
+        except ValueError:
+            continue
+        despachados += 1
+        servicio.obtener_estado_stock()
+    return despachados
+
+
+def _lote(servicio: AlmacenService, qr_ids) -> int:
+    resultados = servicio.despachar_requerimientos(qr_ids)
+    despachados = sum(1 for r in resultados if r.despachado)
+    if despachados:
+        servicio.obtener_estado_stock()
+    return despachados
+
+
+def _consumido(engine) -> dict:
+    with engine.connect() as conn:
+        return dict(conn.execute(select(ArticuloContrato.id, ArticuloContrato.cant_consumida)).all())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articulos", type=int, default=500)
+    parser.add_argument("--escaneos", type=int, default=50)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    variantes = {"uno por uno + recarga por despacho": _uno_por_uno, "lote + una recarga": _lote}
+    with temp_engine() as engine:
+        _sembrar(engine, args.articulos, len(variantes) * args.repeticiones * args.escaneos)
+        servicio = AlmacenService(SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False)))
+
+        siguiente = iter(range(len(variantes) * args.repeticiones * args.escaneos))
+        tiempos = {nombre: [] for nombre in variantes}
+        incrementos = {}
+        for nombre, despachar in variantes.items():
+            antes = _consumido(engine)
+            for _ in range(args.repeticiones):
+                sesion = [_qr(next(siguiente)) for _ in range(args.escaneos)]
+                # Una lectura repetida y un QR que no existe, como en una sesión real.
+                sesion += [sesion[0], "REQ-INEXISTENTE"]
+                with cronometro(tiempos[nombre]):
+                    despachados = despachar(servicio, sesion)
+                assert despachados == args.escaneos
+            despues = _consumido(engine)
+            incrementos[nombre] = {a: despues[a] - antes[a] for a in despues}
+        referencia = next(iter(incrementos.values()))
+        assert all(inc == referencia for inc in incrementos.values())
+
+        print(f"Sesión de {args.escaneos} escaneos (+1 duplicado, +1 inexistente), "
+              f"{args.articulos} artículos programados:")
+        for nombre, valores in tiempos.items():
+            print(f"  {nombre:<36} {resumen_ms(valores)}")
+        print("  mismos totales consumidos en ambas variantes: OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Microbenchmark de la conversión de entidades del ORM a DTOs, por tipo de DTO y tamaño
+del conjunto de resultados.
+
+Compara:
+  - from_orm por fila: `[XDTO.from_orm(e) for e in entidades]`, como hacían los servicios,
+  - model_validate por fila: `[XDTO.model_validate(e, from_attributes=True) for e in ...]`,
+  - to_dtos: una sola llamada a TypeAdapter(List[XDTO]) en caché (dto_conversion.to_dtos).
+Las entidades son instancias transitorias del ORM (sin sesión), así que solo se mide la
+conversión, no la consulta.
+
+Uso:
+    python -m benchmarks.bench_dto_conversion [--tamanos 1000 10000 100000] [--repeticiones 3]
+"""
+import argparse
+import datetime
+import gc
+import time
+import warnings
+
+from sigvcf.core.domain.models import (
+    ArticuloContrato, Contrato, EntradaBodega, OrdenDeCompra, ProgramacionMensual, Proveedor,
+    RegistroContable, ReporteIncumplimiento, SalidaRequerimiento,
+)
+from sigvcf.infrastructure.dto_conversion import to_dtos
+from sigvcf.modules.administrativo.dto import ContratoDTO, OrdenCompraDTO
+from sigvcf.modules.almacen.dto import EntradaBodegaDTO
+from sigvcf.modules.financiero.dto import RegistroContableDTO
+from sigvcf.modules.juridico.dto import ReporteIncumplimientoDTO
+from sigvcf.modules.nutricion.dto import ProgramacionMensualDTO, SalidaRequerimientoDTO
+from sigvcf.modules.proveedores.dto import ProveedorDTO
+
+_FECHA = datetime.date(2025, 1, 1)
+_MOMENTO = datetime.datetime(2025, 1, 1, 8, 30)
+
+
+def _articulo(i: int, a: int) -> ArticuloContrato:
+    return ArticuloContrato(
+        id=i * 3 + a, clave_articulo=f"A-{i}-{a}", descripcion=f"Artículo {a}", unidad_medida="kg",
+        precio_unitario=10.5, cant_maxima=1000, clasificacion="GRANOS",
+    )
+
+
+# DTO -> fábrica de la entidad i-ésima.
+_CASOS = {
+    OrdenCompraDTO: lambda i: OrdenDeCompra(id=i, contrato_id=1, fecha_entrega_programada=_FECHA, estado="BORRADOR"),
+    ProveedorDTO: lambda i: Proveedor(id=i, razon_social=f"Proveedor {i}", rfc=f"RFC{i:09d}", email_contacto=None),
+    RegistroContableDTO: lambda i: RegistroContable(
+        id=i, entrada_bodega_id=i, asiento_contable="POLIZA", fecha_contabilizacion=_MOMENTO, contador_id=1,
+    ),
+    ReporteIncumplimientoDTO: lambda i: ReporteIncumplimiento(
+        id=i, contrato_id=1, tipo="ATRASO", estado="PENDIENTE", descripcion=f"Reporte {i}",
+    ),
+    ProgramacionMensualDTO: lambda i: ProgramacionMensual(
+        id=i, usuario_id=1, articulo_contrato_id=i, mes_anho=_FECHA, cantidades_por_dia={1: 10, 15: 20},
+    ),
+    SalidaRequerimientoDTO: lambda i: SalidaRequerimiento(
+        id=i, qr_id=f"QR-{i}", usuario_solicitante_id=1, fecha_generacion=_MOMENTO, estado="GENERADO",
+    ),
+    EntradaBodegaDTO: lambda i: EntradaBodega(
+        id=i, folio_rb=f"RB-{i:08d}", orden_compra_id=i, fecha_recepcion=_MOMENTO,
+        factura_xml_path="/f.xml", recepcionista_id=1,
+    ),
+    ContratoDTO: lambda i: Contrato(
+        id=i, codigo_licitacion=f"LPL-{i}", fecha_inicio=_FECHA, fecha_fin=_FECHA, proveedor_id=1,
+        articulos=[_articulo(i, a) for a in range(3)],
+    ),
+}
+
+
+def _mejor(funcion, repeticiones: int) -> float:
+    # Como timeit: sin el recolector cíclico, que con listas grandes mete pausas arbitrarias.
+    tiempos = []
+    for _ in range(repeticiones):
+        gc.collect()
+        gc.disable()
+        try:
+            inicio = time.perf_counter()
+            funcion()
+            tiempos.append(time.perf_counter() - inicio)
+        finally:
+            gc.enable()
+    return min(tiempos)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+    # La variante de referencia usa from_orm tal como lo hacían los servicios.
+    warnings.filterwarnings("ignore", message=".*from_orm.*")
+
+    print(f"{'DTO':<26}{'filas':>8}{'from_orm':>12}{'model_validate':>16}{'to_dtos':>11}{'aceleración':>13}")
+    for dto_class, fabrica in _CASOS.items():
+        for tamano in args.tamanos:
+            entidades = [fabrica(i) for i in range(1, tamano + 1)]
+            esperado = [dto_class.model_validate(e, from_attributes=True) for e in entidades[:50]]
+            assert to_dtos(dto_class, entidades[:50]) == esperado
+
+            por_fila = _mejor(lambda: [dto_class.from_orm(e) for e in entidades], args.repeticiones)
+            validate = _mejor(
+                lambda: [dto_class.model_validate(e, from_attributes=True) for e in entidades], args.repeticiones
+            )
+            lote = _mejor(lambda: to_dtos(dto_class, entidades), args.repeticiones)
+            print(f"{dto_class.__name__:<26}{tamano:>8}{por_fila * 1000:>10.1f}ms{validate * 1000:>14.1f}ms"
+                  f"{lote * 1000:>9.1f}ms{por_fila / lote:>12.2f}x")
+            del entidades
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compara los perfiles de motor SQLite bajo carga concurrente.
+
+Varios hilos escritores registran requerimientos (una transacción por registro, como
+lo hace la aplicación) mientras varios hilos lectores consultan el stock. Se reporta
+el throughput de escritura y la latencia de lectura de cada perfil.
+
+Uso:
+    python -m benchmarks.bench_engine_profiles [--segundos 5] [--escritores 2] [--lectores 4]
+"""
+import argparse
+import datetime
+import threading
+import time
+import uuid
+from typing import List
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import cronometro, resumen_ms, temp_engine
+from sigvcf.core.domain.models import ArticuloContrato, Contrato, Proveedor, SalidaRequerimiento
+from sigvcf.infrastructure.persistence.engine import ENGINE_PROFILES
+
+
+def _sembrar(Session, articulos: int) -> None:
+    with Session() as session:
+        proveedor = Proveedor(razon_social="Proveedor Bench", rfc="BENCH000000")
+        contrato = Contrato(
+            codigo_licitacion="BENCH-01",
+            fecha_inicio=datetime.date(2025, 1, 1),
+            fecha_fin=datetime.date(2025, 12, 31),
+            proveedor=proveedor,
+        )
+        contrato.articulos = [
+            ArticuloContrato(
+                clave_articulo=f"A-{i:05d}", descripcion=f"Artículo {i}", unidad_medida="kg",
+                precio_unitario=10.0, cant_maxima=1000, cant_consumida=0, clasificacion="GRANOS",
+            )
+            for i in range(articulos)
+        ]
+        session.add(contrato)
+        session.commit()
+
+
+def _correr_perfil(perfil: str, segundos: float, escritores: int, lectores: int, articulos: int) -> None:
+    with temp_engine(perfil) as engine:
+        # Un perfil sin busy_timeout fallaría de inmediato ante el primer bloqueo;
+        # el driver sqlite3 espera 5 s por defecto, que es lo que vería la app.
+        Session = sessionmaker(bind=engine, autoflush=False)
+        _sembrar(Session, articulos)
+
+        fin = time.perf_counter() + segundos
+        escrituras: List[float] = []
+        lecturas: List[float] = []
+        errores = {"escritura": 0, "lectura": 0}
+        candado = threading.Lock()
+
+        def escritor():
+            locales: List[float] = []
+            fallos = 0
+            while time.perf_counter() < fin:
+                try:
+                    with cronometro(locales):
+                        with Session() as session:
+                            session.add(SalidaRequerimiento(
+                                qr_id=f"REQ-202501-{uuid.uuid4().hex[:12]}", estado="PREVIA"
+                            ))
+                            session.commit()
+                except OperationalError:
+                    fallos += 1
+            with candado:
+                escrituras.extend(locales)
+                errores["escritura"] += fallos
+
+        def lector():
+            locales: List[float] = []
+            fallos = 0
+            stmt = select(func.sum(ArticuloContrato.cant_maxima - ArticuloContrato.cant_consumida))
+            while time.perf_counter() < fin:
+                try:
+                    with cronometro(locales):
+                        with Session() as session:
+                            session.execute(stmt).scalar_one()
+                            session.execute(select(func.count(SalidaRequerimiento.id))).scalar_one()
+                except OperationalError:
+                    fallos += 1
+            with candado:
+                lecturas.extend(locales)
+                errores["lectura"] += fallos
+
+        hilos = [threading.Thread(target=escritor) for _ in range(escritores)]
+        hilos += [threading.Thread(target=lector) for _ in range(lectores)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        print(f"[{perfil}] PRAGMAs: {ENGINE_PROFILES[perfil] or 'por defecto de SQLite'}")
+        print(f"  escrituras: {len(escrituras) / segundos:8.1f} tx/s   {resumen_ms(escrituras)}   errores={errores['escritura']}")
+        print(f"  lecturas:   {len(lecturas) / segundos:8.1f} q/s    {resumen_ms(lecturas)}   errores={errores['lectura']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--escritores", type=int, default=2)
+    parser.add_argument("--lectores", type=int, default=4)
+    parser.add_argument("--articulos", type=int, default=5000)
+    parser.add_argument("--perfiles", nargs="*", default=list(ENGINE_PROFILES))
+    args = parser.parse_args()
+
+    for perfil in args.perfiles:
+        _correr_perfil(perfil, args.segundos, args.escritores, args.lectores, args.articulos)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Recepción masiva de órdenes de compra con folios del contador diario (secuencia_folio).
+
+Compara:
+  - una por una: AlmacenService.registrar_entrada_bodega por orden, una transacción y una
+    reserva de folio por entrada,
+  - lote: AlmacenService.registrar_entradas_bodega con todas las órdenes, un bloque de N
+    folios reservado en una sola sentencia y un executemany para entradas y movimientos.
+Después varios hilos (recepcionistas) reciben lotes al mismo tiempo y se comprueba que
+todos los folios son únicos y consecutivos, sin reintentos por la restricción única.
+
+Uso:
+    python -m benchmarks.bench_folios [--ordenes 500] [--lote 50] [--hilos 8]
+"""
+import argparse
+import datetime
+import threading
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import cronometro, resumen_ms, temp_engine
+from sigvcf.core.domain.models import (
+    ArticuloContrato, Contrato, EntradaBodega, OrdenDeCompra, Proveedor, Rol, Usuario,
+)
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.modules.almacen.dto import ArticuloRecibidoDTO, EntradaBodegaCreateDTO
+from sigvcf.modules.almacen.services import AlmacenService
+
+_ARTICULOS_POR_ENTRADA = 3
+
+
+def _sembrar(engine, ordenes: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(Rol), [{"id": 1, "nombre_rol": "Admin", "permisos": {}}])
+        conn.execute(insert(Usuario), [{"id": 1, "nombre": "bench", "password_hash": "x", "rol_id": 1}])
+        conn.execute(insert(Proveedor), [{"id": 1, "razon_social": "Proveedor", "rfc": "RFC000000001"}])
+        conn.execute(insert(Contrato), [{
+            "id": 1, "codigo_licitacion": "LPL-1", "proveedor_id": 1,
+            "fecha_inicio": datetime.date(2025, 1, 1), "fecha_fin": datetime.date(2025, 12, 31),
+        }])
+        conn.execute(insert(ArticuloContrato), [
+            {"id": a, "contrato_id": 1, "clave_articulo": f"A-{a}", "descripcion": f"Artículo {a}",
+             "unidad_medida": "kg", "precio_unitario": 1.0, "cant_maxima": 10**9, "clasificacion": "GRANOS"}
+            for a in range(1, _ARTICULOS_POR_ENTRADA + 1)
+        ])
+        conn.execute(insert(OrdenDeCompra), [
+            {"id": o, "contrato_id": 1, "fecha_entrega_programada": datetime.date(2025, 3, 1), "estado": "APROBADA"}
+            for o in range(1, ordenes + 1)
+        ])
+
+
+def _entrada(orden_id: int) -> EntradaBodegaCreateDTO:
+    return EntradaBodegaCreateDTO(
+        orden_compra_id=orden_id, factura_xml_path=f"/facturas/{orden_id}.xml", recepcionista_id=1,
+        articulos=[ArticuloRecibidoDTO(articulo_contrato_id=a, cantidad=10)
+                   for a in range(1, _ARTICULOS_POR_ENTRADA + 1)],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ordenes", type=int, default=500)
+    parser.add_argument("--lote", type=int, default=50)
+    parser.add_argument("--hilos", type=int, default=8)
+    args = parser.parse_args()
+
+    # Órdenes: la primera mitad para la comparación secuencial, la segunda para los hilos.
+    with temp_engine() as engine:
+        _sembrar(engine, 2 * args.ordenes)
+        fabrica = sessionmaker(bind=engine, autoflush=False)
+        servicio = AlmacenService(SqlAlchemyUnitOfWork(fabrica))
+        mitad = args.ordenes // 2
+        lotes = [list(range(inicio, min(inicio + args.lote, args.ordenes + 1)))
+                 for inicio in range(mitad + 1, args.ordenes + 1, args.lote)]
+
+        una_por_una, por_lote = [], []
+        with cronometro(una_por_una):
+            for orden_id in range(1, mitad + 1):
+                servicio.registrar_entrada_bodega(_entrada(orden_id))
+        with cronometro(por_lote):
+            for lote in lotes:
+                servicio.registrar_entradas_bodega([_entrada(o) for o in lote])
+
+        print(f"Recepción de {mitad} órdenes ({_ARTICULOS_POR_ENTRADA} artículos cada una):")
+        print(f"  {'una por una':<28} {una_por_una[0] * 1000:9.1f} ms  "
+              f"({una_por_una[0] / mitad * 1000:.2f} ms/entrada)")
+        print(f"  {f'lotes de {args.lote}':<28} {por_lote[0] * 1000:9.1f} ms  "
+              f"({por_lote[0] / (args.ordenes - mitad) * 1000:.2f} ms/entrada)")
+
+        # Recepcionistas simultáneos: cada hilo recibe sus órdenes en lotes.
+        tiempos, errores = [], []
+        pendientes = list(range(args.ordenes + 1, 2 * args.ordenes + 1))
+        reparto = [pendientes[h::args.hilos] for h in range(args.hilos)]
+
+        def recepcionista(ordenes):
+            propio = AlmacenService(SqlAlchemyUnitOfWork(fabrica))
+            try:
+                for inicio in range(0, len(ordenes), args.lote):
+                    with cronometro(tiempos):
+                        propio.registrar_entradas_bodega([_entrada(o) for o in ordenes[inicio:inicio + args.lote]])
+            except Exception as e:
+                errores.append(e)
+
+        hilos = [threading.Thread(target=recepcionista, args=(ordenes,)) for ordenes in reparto]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        assert not errores, errores
+
+        with engine.connect() as conn:
+            folios = conn.execute(select(EntradaBodega.folio_rb)).scalars().all()
+        numeros = sorted(int(folio.rsplit("-", 1)[1]) for folio in folios)
+        assert len(set(folios)) == len(folios) == 2 * args.ordenes
+        assert numeros == list(range(1, len(folios) + 1))
+        print(f"{args.hilos} recepcionistas simultáneos, lotes de {args.lote}: {resumen_ms(tiempos)} por lote")
+        print(f"  {len(folios)} folios únicos y consecutivos, sin reintentos: OK")
+
+
+if __name__ == "__main__":
+    main()
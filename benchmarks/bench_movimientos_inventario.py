@@ -0,0 +1,137 @@
+"""
+Existencia de inventario en una fecha calculada sobre el libro de movimientos, con N
+artículos y millones de movimientos repartidos en D días.
+
+Compara:
+  - recorrido del libro: SUM de todos los movimientos de cada artículo hasta la fecha,
+  - corte + movimientos acotados: AlmacenService.obtener_existencias, que parte del último
+    corte diario y solo suma los movimientos posteriores a él.
+También mide la generación de los cortes: la inicial sobre todo el libro y la incremental
+de un día más de movimientos.
+
+Uso:
+    python -m benchmarks.bench_movimientos_inventario [--movimientos 2000000] [--articulos 200] [--dias 365]
+"""
+import argparse
+import datetime
+import random
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import cronometro, resumen_ms, temp_engine
+from sigvcf.core.domain.models import ArticuloContrato, Contrato, MovimientoInventario, Proveedor
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.modules.almacen.services import AlmacenService
+
+_INICIO = datetime.datetime(2024, 1, 1)
+_LOTE = 50_000
+
+
+def _movimientos(aleatorio: random.Random, articulos: int, desde: datetime.datetime, dias: int, total: int):
+    """Movimientos en orden cronológico: entradas grandes y salidas pequeñas, como en la bodega."""
+    paso = dias * 86_400 / total
+    for n in range(total):
+        entrada = aleatorio.random() < 0.1
+        yield {
+            "articulo_contrato_id": aleatorio.randint(1, articulos),
+            "fecha": desde + datetime.timedelta(seconds=n * paso),
+            "tipo": 'ENTRADA' if entrada else 'SALIDA',
+            "cantidad": aleatorio.randint(50, 500) if entrada else -aleatorio.randint(1, 50),
+            "referencia": f"BENCH-{n}",
+        }
+
+
+def _insertar(uow: SqlAlchemyUnitOfWork, filas) -> None:
+    lote = []
+    with uow:
+        for fila in filas:
+            lote.append(fila)
+            if len(lote) == _LOTE:
+                uow.movimientos_inventario.add_many(lote)
+                lote = []
+        uow.movimientos_inventario.add_many(lote)
+        uow.commit()
+
+
+def _poblar(uow: SqlAlchemyUnitOfWork, articulos: int, dias: int, movimientos: int) -> float:
+    with uow:
+        uow.proveedores.add(Proveedor(id=1, razon_social="Proveedor Bench", rfc="BENCH000000"))
+        uow.contratos.add(Contrato(
+            id=1, codigo_licitacion="LIC-BENCH", proveedor_id=1,
+            fecha_inicio=_INICIO.date(), fecha_fin=(_INICIO + datetime.timedelta(days=dias)).date(),
+        ))
+        uow.articulos_contrato.add_many([
+            {"id": i + 1, "contrato_id": 1, "clave_articulo": f"A-{i:05d}", "descripcion": f"Artículo {i}",
+             "unidad_medida": "kg", "precio_unitario": 1.0, "cant_maxima": 10**9, "clasificacion": "GRANOS"}
+            for i in range(articulos)
+        ])
+        uow.commit()
+    inicio = time.perf_counter()
+    _insertar(uow, _movimientos(random.Random(5), articulos, _INICIO, dias, movimientos))
+    return time.perf_counter() - inicio
+
+
+def _recorrido_completo(uow: SqlAlchemyUnitOfWork, fecha: datetime.datetime) -> dict:
+    with uow.readonly():
+        return dict(uow.session.execute(
+            select(MovimientoInventario.articulo_contrato_id, func.sum(MovimientoInventario.cantidad))
+            .where(MovimientoInventario.fecha <= fecha)
+            .group_by(MovimientoInventario.articulo_contrato_id)
+        ).all())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--movimientos", type=int, default=2_000_000)
+    parser.add_argument("--articulos", type=int, default=200)
+    parser.add_argument("--dias", type=int, default=365)
+    parser.add_argument("--consultas", type=int, default=20)
+    args = parser.parse_args()
+
+    with temp_engine() as engine:
+        uow = SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False))
+        servicio = AlmacenService(uow)
+        alta = _poblar(uow, args.articulos, args.dias, args.movimientos)
+        print(f"{args.movimientos} movimientos de {args.articulos} artículos en {args.dias} días "
+              f"(alta {alta:.1f} s)")
+
+        fin = _INICIO + datetime.timedelta(days=args.dias)
+        inicial = []
+        with cronometro(inicial):
+            cortes = servicio.generar_cortes_inventario(hasta=fin.date())
+        print(f"  cortes iniciales: {cortes} en {inicial[0] * 1000:.0f} ms")
+
+        _insertar(uow, _movimientos(random.Random(6), args.articulos, fin, 1, args.movimientos // args.dias))
+        incremental = []
+        with cronometro(incremental):
+            cortes = servicio.generar_cortes_inventario(hasta=(fin + datetime.timedelta(days=1)).date())
+        print(f"  cortes de un día más: {cortes} en {incremental[0] * 1000:.0f} ms")
+
+        aleatorio = random.Random(9)
+        fechas = [_INICIO + datetime.timedelta(seconds=aleatorio.randint(0, (args.dias + 1) * 86_400))
+                  for _ in range(args.consultas)]
+        completo, acotado, un_articulo = [], [], []
+        for fecha in fechas:
+            with cronometro(completo):
+                esperado = _recorrido_completo(uow, fecha)
+            with cronometro(acotado):
+                existencias = servicio.obtener_existencias(fecha)
+            obtenido = {e.articulo_contrato_id: e.existencia for e in existencias}
+            assert all(obtenido[a] == esperado.get(a, 0) for a in obtenido), fecha
+            articulo_id = aleatorio.randint(1, args.articulos)
+            with cronometro(un_articulo):
+                (existencia,) = servicio.obtener_existencias(fecha, articulo_ids=[articulo_id])
+            assert existencia.existencia == esperado.get(articulo_id, 0), (fecha, articulo_id)
+
+        print(f"Existencia de todos los artículos en una fecha ({args.consultas} fechas al azar):")
+        print(f"  recorrido del libro:            {resumen_ms(completo)}")
+        print(f"  corte + movimientos acotados:   {resumen_ms(acotado)}")
+        print(f"Existencia de un artículo en una fecha:")
+        print(f"  corte + movimientos acotados:   {resumen_ms(un_articulo)}")
+        print("  resultados idénticos al recorrido completo: OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Listados por páginas (paginación por clave) frente al listado completo.
+
+Mide, sobre N artículos de contrato:
+  - la carga inicial de las pantallas de inventario y de programación: el listado completo
+    (obtener_estado_stock, obtener_articulos_disponibles) frente a su primera página
+    (obtener_estado_stock_pagina, obtener_articulos_disponibles_pagina);
+  - el costo de una página al inicio y al final de la tabla, que con WHERE id > :clave
+    debe ser el mismo (con OFFSET crece con la posición);
+  - el recorrido completo con project_rows_page, list_page (por id y por clave_articulo)
+    e iter_batches, frente a list(): mismas filas, con el pico de memoria de cada uno.
+El tiempo se mide sin tracemalloc; la memoria es el pico de una segunda corrida.
+
+Uso:
+    python -m benchmarks.bench_paginacion [--filas 200000] [--pagina 200] [--lote 1000]
+"""
+import argparse
+import datetime
+import gc
+import tracemalloc
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import cronometro, resumen_ms, temp_engine
+from sigvcf.core.domain.models import ArticuloContrato, Contrato, Proveedor
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.modules.almacen.dto import StockStatusDTO
+from sigvcf.modules.almacen.services import AlmacenService
+from sigvcf.modules.nutricion.services import NutricionService
+
+_REPETICIONES = 20
+
+
+def _sembrar(engine, filas: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(Proveedor), [{"id": 1, "razon_social": "Proveedor", "rfc": "RFC000000001"}])
+        conn.execute(insert(Contrato), [{
+            "id": 1, "codigo_licitacion": "LPL-0000001", "proveedor_id": 1,
+            "fecha_inicio": datetime.date(2025, 1, 1), "fecha_fin": datetime.date(2025, 12, 31),
+        }])
+        conn.execute(insert(ArticuloContrato), [
+            # Claves en orden distinto al de los ids, para que ordenar por clave_articulo sea otra cosa.
+            {"contrato_id": 1, "clave_articulo": f"A-{(i * 7919) % filas:07d}", "descripcion": f"Artículo {i}",
+             "unidad_medida": "kg", "precio_unitario": 1.0, "cant_maxima": 1000,
+             "cant_consumida": i % 1000, "clasificacion": "GRANOS"}
+            for i in range(filas)
+        ])
+
+
+def _medir(etiqueta: str, funcion) -> object:
+    """Imprime tiempo y pico de memoria de `funcion` y devuelve su resultado."""
+    gc.collect()
+    tiempos = []
+    with cronometro(tiempos):
+        resultado = funcion()
+    del resultado
+
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {etiqueta:<48} {tiempos[0] * 1000:8.1f} ms   pico {pico / 2**20:7.2f} MiB")
+    return resultado
+
+
+def _recorrer_paginas(uow, pagina: int) -> list:
+    claves, clave = [], None
+    while True:
+        with uow.readonly():
+            filas, clave = uow.articulos_contrato.project_rows_page(
+                StockStatusDTO, after_key=clave, limit=pagina,
+                columns={"cant_consumida": func.coalesce(ArticuloContrato.cant_consumida, 0)},
+            )
+        claves.extend(fila.clave_articulo for fila in filas)
+        if clave is None:
+            return claves
+
+
+def _recorrer_list_page(uow, pagina: int, order_by: str) -> list:
+    ids, clave = [], None
+    while True:
+        with uow.readonly():
+            repositorio = uow.articulos_contrato
+            entidades = repositorio.list_page(after_key=clave, limit=pagina, order_by=order_by)
+            if not entidades:
+                return ids
+            ids.extend(entidad.id for entidad in entidades)
+            clave = repositorio.page_key(entidades[-1], order_by)
+
+
+def _recorrer_lotes(uow, lote: int) -> list:
+    ids = []
+    with uow.readonly():
+        for entidades in uow.articulos_contrato.iter_batches(batch_size=lote):
+            ids.extend(entidad.id for entidad in entidades)
+    return ids
+
+
+def _listar(uow) -> list:
+    with uow.readonly():
+        return [entidad.id for entidad in uow.articulos_contrato.list()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=200_000)
+    parser.add_argument("--pagina", type=int, default=200)
+    parser.add_argument("--lote", type=int, default=1000)
+    args = parser.parse_args()
+
+    with temp_engine() as engine:
+        _sembrar(engine, args.filas)
+        uow = SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False))
+        almacen, nutricion = AlmacenService(uow), NutricionService(uow)
+
+        print(f"Carga inicial de las pantallas ({args.filas} artículos, páginas de {args.pagina}):")
+        completo = _medir("obtener_estado_stock (completo)", almacen.obtener_estado_stock)
+        primera, siguiente = _medir("obtener_estado_stock_pagina (primera)",
+                                    lambda: almacen.obtener_estado_stock_pagina(limite=args.pagina))
+        assert [f.clave_articulo for f in primera] == [f.clave_articulo for f in completo[:args.pagina]]
+        assert siguiente is not None
+        del completo
+        _medir("obtener_articulos_disponibles (completo)", nutricion.obtener_articulos_disponibles)
+        articulos, _ = _medir("obtener_articulos_disponibles_pagina (primera)",
+                              lambda: nutricion.obtener_articulos_disponibles_pagina(limite=args.pagina))
+        assert [a.id for a in articulos] == list(range(1, args.pagina + 1))
+
+        print("Costo de una página según su posición:")
+        for etiqueta, clave in (("inicio", None), ("final", args.filas - args.pagina - 1)):
+            tiempos = []
+            for _ in range(_REPETICIONES):
+                with cronometro(tiempos):
+                    filas, siguiente = almacen.obtener_estado_stock_pagina(clave, args.pagina)
+            print(f"  {etiqueta:<8} {resumen_ms(tiempos)}")
+        assert len(filas) == args.pagina and siguiente == args.filas - 1
+        ultima, siguiente = almacen.obtener_estado_stock_pagina(args.filas - 1, args.pagina)
+        assert len(ultima) == 1 and siguiente is None
+
+        print(f"Recorrido completo ({args.filas} artículos):")
+        claves = _medir(f"project_rows_page (páginas de {args.pagina})", lambda: _recorrer_paginas(uow, args.pagina))
+        assert len(claves) == len(set(claves)) == args.filas
+        referencia = _medir("list() (entidades, todo en memoria)", lambda: _listar(uow))
+        por_id = _medir(f"list_page por id (páginas de {args.pagina})",
+                        lambda: _recorrer_list_page(uow, args.pagina, "id"))
+        por_clave = _medir(f"list_page por clave_articulo (páginas de {args.pagina})",
+                           lambda: _recorrer_list_page(uow, args.pagina, "clave_articulo"))
+        lotes = _medir(f"iter_batches (lotes de {args.lote})", lambda: _recorrer_lotes(uow, args.lote))
+        assert por_id == referencia and lotes == referencia
+        assert sorted(por_clave) == referencia and por_clave != referencia
+        print("  mismas filas en todos los recorridos: OK")
+
+
+if __name__ == "__main__":
+    main()
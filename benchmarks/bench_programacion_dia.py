@@ -0,0 +1,133 @@
+"""
+Compara los totales de programación calculados sobre el JSON cantidades_por_dia (traer y
+sumar los diccionarios en Python) contra SUM en SQL sobre la tabla normalizada
+programacion_dia, con N artículos x M meses de programación.
+
+Casos:
+  - total programado de un artículo (validar_disponibilidad_articulo), para una muestra; también
+    contra la lectura del total mantenido en articulo_contrato.cant_programada,
+  - totales por artículo de un mes (despacho de un requerimiento),
+  - alta de las programaciones, con el costo de los triggers que mantienen programacion_dia y
+    cant_programada.
+
+Uso:
+    python -m benchmarks.bench_programacion_dia [--articulos 1000] [--meses 36] [--muestra 200]
+"""
+import argparse
+import datetime
+import os
+import random
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import cronometro, resumen_ms, temp_engine
+from sigvcf.core.domain.models import ArticuloContrato, Contrato, ProgramacionDia, ProgramacionMensual, Proveedor
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+
+_INICIO = datetime.date(2023, 1, 1)
+
+
+def _mes(n: int) -> datetime.date:
+    return datetime.date(_INICIO.year + (_INICIO.month - 1 + n) // 12, (_INICIO.month - 1 + n) % 12 + 1, 1)
+
+
+def _poblar(uow: SqlAlchemyUnitOfWork, articulos: int, meses: int) -> float:
+    aleatorio = random.Random(7)
+    with uow:
+        uow.proveedores.add(Proveedor(id=1, razon_social="Proveedor Bench", rfc="BENCH000000"))
+        uow.contratos.add(Contrato(
+            id=1, codigo_licitacion="LIC-BENCH", proveedor_id=1,
+            fecha_inicio=_INICIO, fecha_fin=_mes(meses),
+        ))
+        uow.articulos_contrato.add_many([
+            {"id": i + 1, "contrato_id": 1, "clave_articulo": f"A-{i:05d}", "descripcion": f"Artículo {i}",
+             "unidad_medida": "kg", "precio_unitario": 1.0, "cant_maxima": 10**9, "clasificacion": "GRANOS"}
+            for i in range(articulos)
+        ])
+        uow.commit()
+
+    inicio = time.perf_counter()
+    with uow:
+        for m in range(meses):
+            uow.programaciones_mensuales.add_many([
+                {"usuario_id": None, "articulo_contrato_id": i + 1, "mes_anho": _mes(m),
+                 "cantidades_por_dia": {dia: aleatorio.randint(0, 50) for dia in range(1, 31)}}
+                for i in range(articulos)
+            ])
+        uow.commit()
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articulos", type=int, default=1000)
+    parser.add_argument("--meses", type=int, default=36)
+    parser.add_argument("--muestra", type=int, default=200)
+    args = parser.parse_args()
+
+    with temp_engine() as engine:
+        uow = SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False))
+        alta = _poblar(uow, args.articulos, args.meses)
+        with uow.readonly():
+            filas_dia = uow.session.execute(select(func.count()).select_from(ProgramacionDia)).scalar_one()
+        tamano = os.path.getsize(engine.url.database) / 1024 / 1024
+        print(f"{args.articulos} artículos x {args.meses} meses: {args.articulos * args.meses} programaciones, "
+              f"{filas_dia} filas en programacion_dia ({tamano:.1f} MB)")
+        print(f"  alta de las programaciones (con triggers): {alta * 1000:.0f} ms")
+
+        muestra = random.Random(11).sample(range(1, args.articulos + 1), min(args.muestra, args.articulos))
+        json_articulo, sql_articulo, mantenido_articulo = [], [], []
+        with uow.readonly():
+            for articulo_id in muestra:
+                with cronometro(json_articulo):
+                    cantidades = uow.session.execute(
+                        select(ProgramacionMensual.cantidades_por_dia)
+                        .where(ProgramacionMensual.articulo_contrato_id == articulo_id)
+                    ).scalars().all()
+                    total_json = sum(sum(c.values()) for c in cantidades if c)
+                with cronometro(sql_articulo):
+                    total_sql = uow.session.execute(
+                        select(func.coalesce(func.sum(ProgramacionDia.cantidad), 0))
+                        .join(ProgramacionMensual, ProgramacionMensual.id == ProgramacionDia.programacion_id)
+                        .where(ProgramacionMensual.articulo_contrato_id == articulo_id)
+                    ).scalar_one()
+                with cronometro(mantenido_articulo):
+                    total_mantenido = uow.session.execute(
+                        select(ArticuloContrato.cant_programada).where(ArticuloContrato.id == articulo_id)
+                    ).scalar_one()
+                assert total_json == total_sql == total_mantenido, (articulo_id, total_json, total_sql, total_mantenido)
+        print(f"Total de un artículo ({len(muestra)} artículos, {args.meses} meses cada uno):")
+        print(f"  JSON + suma en Python: {resumen_ms(json_articulo)}")
+        print(f"  SUM en programacion_dia: {resumen_ms(sql_articulo)}")
+        print(f"  cant_programada mantenida: {resumen_ms(mantenido_articulo)}")
+
+        json_mes, sql_mes = [], []
+        with uow.readonly():
+            for m in range(args.meses):
+                with cronometro(json_mes):
+                    por_articulo_json = {
+                        articulo_id: sum(cantidades.values())
+                        for articulo_id, cantidades in uow.session.execute(
+                            select(ProgramacionMensual.articulo_contrato_id, ProgramacionMensual.cantidades_por_dia)
+                            .where(ProgramacionMensual.mes_anho == _mes(m))
+                        )
+                    }
+                with cronometro(sql_mes):
+                    por_articulo_sql = dict(uow.session.execute(
+                        select(ProgramacionMensual.articulo_contrato_id, func.sum(ProgramacionDia.cantidad))
+                        .join(ProgramacionDia, ProgramacionDia.programacion_id == ProgramacionMensual.id)
+                        .where(ProgramacionMensual.mes_anho == _mes(m))
+                        # Hay una programación por artículo y mes: agrupar por su id equivale a agrupar por
+                        # artículo y sigue el orden del índice por mes, sin ordenar en un B-tree temporal.
+                        .group_by(ProgramacionMensual.id)
+                    ).all())
+                assert por_articulo_json == por_articulo_sql, m
+        print(f"Totales por artículo de un mes ({args.articulos} artículos, {args.meses} meses):")
+        print(f"  JSON + suma en Python: {resumen_ms(json_mes)}")
+        print(f"  SUM ... GROUP BY en programacion_dia: {resumen_ms(sql_mes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Compara la lectura de listados con entidades ORM + DTO.from_orm contra la proyección
+de columnas del repositorio (SQLAlchemyRepository.project).
+
+Uso:
+    python -m benchmarks.bench_projection [--filas 100000]
+"""
+import argparse
+import datetime
+import gc
+import time
+import tracemalloc
+import warnings
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import temp_engine
+from sigvcf.core.domain.models import (
+    ArticuloContrato, Contrato, EntradaBodega, OrdenDeCompra, Proveedor, ReporteIncumplimiento,
+)
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.modules.almacen.dto import StockStatusDTO
+from sigvcf.modules.almacen.services import AlmacenService
+from sigvcf.modules.financiero.services import FinancieroService
+from sigvcf.modules.juridico.dto import ReporteIncumplimientoDTO
+from sigvcf.modules.juridico.services import JuridicoService
+
+
+def _sembrar(engine, filas: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(Proveedor), [{"id": 1, "razon_social": "Proveedor", "rfc": "RFC000000001"}])
+        conn.execute(insert(Contrato), [{
+            "id": 1, "codigo_licitacion": "LPL-1", "proveedor_id": 1,
+            "fecha_inicio": datetime.date(2025, 1, 1), "fecha_fin": datetime.date(2025, 12, 31),
+        }])
+        conn.execute(insert(ArticuloContrato), [
+            {
+                "contrato_id": 1, "clave_articulo": f"A-{i}", "descripcion": f"Artículo {i}",
+                "unidad_medida": "kg", "precio_unitario": 1.0, "cant_maxima": 1000,
+                "cant_consumida": i % 1000, "clasificacion": "GRANOS",
+            }
+            for i in range(filas)
+        ])
+        conn.execute(insert(ReporteIncumplimiento), [
+            {"contrato_id": 1, "tipo": "ATRASO", "estado": "PENDIENTE", "descripcion": f"Reporte {i}"}
+            for i in range(filas)
+        ])
+        conn.execute(insert(OrdenDeCompra), [
+            {"id": i, "contrato_id": 1, "fecha_entrega_programada": datetime.date(2025, 1, 1), "estado": "RECIBIDA"}
+            for i in range(1, filas + 1)
+        ])
+        conn.execute(insert(EntradaBodega), [
+            {
+                "folio_rb": f"RB-{i}", "orden_compra_id": i, "fecha_recepcion": datetime.datetime(2025, 1, 2),
+                "factura_xml_path": "/f.xml", "recepcionista_id": 1,
+            }
+            for i in range(1, filas + 1)
+        ])
+
+
+def _medir(etiqueta: str, funcion) -> None:
+    # El tiempo se mide sin tracemalloc, que multiplica el costo de cada asignación.
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    duracion = time.perf_counter() - inicio
+    del resultado
+
+    gc.collect()
+    tracemalloc.start()
+    filas = len(funcion())
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {etiqueta:<44} {duracion * 1000:9.1f} ms   pico {pico / 2**20:7.1f} MiB   ({filas} filas)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=100_000)
+    args = parser.parse_args()
+    # La variante "antes" usa from_orm tal como lo hacían los servicios.
+    warnings.filterwarnings("ignore", message=".*from_orm.*")
+
+    with temp_engine() as engine:
+        _sembrar(engine, args.filas)
+        uow = SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False))
+
+        def stock_orm():
+            with uow:
+                return [StockStatusDTO.from_orm(a) for a in uow.articulos_contrato.list()]
+
+        def reportes_orm():
+            with uow:
+                reportes = uow.session.query(ReporteIncumplimiento).filter(
+                    ReporteIncumplimiento.estado != 'RESUELTO'
+                ).all()
+                return [ReporteIncumplimientoDTO.from_orm(r) for r in reportes]
+
+        print(f"Estado de stock ({args.filas} artículos):")
+        _medir("antes: list() + StockStatusDTO.from_orm", stock_orm)
+        _medir("después: obtener_estado_stock (project_rows)", AlmacenService(uow).obtener_estado_stock)
+
+        print(f"Incumplimientos pendientes ({args.filas} reportes):")
+        _medir("antes: query().all() + from_orm", reportes_orm)
+        _medir("después: listar_incumplimientos_pendientes", JuridicoService(uow).listar_incumplimientos_pendientes)
+
+        # Antes de la proyección este caso de uso no podía construir el DTO desde la entidad.
+        print(f"Expedientes pendientes ({args.filas} entradas, 3 JOINs):")
+        _medir("después: obtener_expedientes_pendientes", FinancieroService(uow).obtener_expedientes_pendientes)
+
+
+if __name__ == "__main__":
+    main()
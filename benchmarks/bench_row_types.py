@@ -0,0 +1,112 @@
+"""
+Costo de construir N filas de listado como modelos de Pydantic frente a las filas ligeras
+con __slots__ (rows.DTORow) que devuelve SQLAlchemyRepository.project_rows.
+
+Primero mide solo la construcción, a partir de las mismas tuplas en memoria:
+  - model_validate: validación completa de Pydantic (lo que haría el constructor),
+  - model_construct: sin validación (lo que hacía project),
+  - DTORow: dataclass con __slots__ construida por posición.
+Después mide el listado completo (consulta + construcción) de obtener_estado_stock y
+listar_contratos con project y con project_rows. La memoria es la que queda retenida por
+la lista de filas, medida con tracemalloc.
+
+Uso:
+    python -m benchmarks.bench_row_types [--filas 100000]
+"""
+import argparse
+import datetime
+import gc
+import time
+import tracemalloc
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import temp_engine
+from sigvcf.core.domain.models import ArticuloContrato, Contrato, Proveedor
+from sigvcf.infrastructure.persistence.rows import build_rows
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.modules.administrativo.dto import ContratoDTO
+from sigvcf.modules.almacen.dto import StockStatusDTO
+
+_CAMPOS_STOCK = ("clave_articulo", "descripcion", "cant_maxima", "cant_consumida")
+
+
+def _medir(etiqueta: str, funcion) -> None:
+    # El tiempo se mide sin tracemalloc, que multiplica el costo de cada asignación.
+    gc.collect()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    duracion = time.perf_counter() - inicio
+    del resultado
+
+    gc.collect()
+    tracemalloc.start()
+    resultado = funcion()
+    retenida, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    filas = len(resultado)
+    print(f"  {etiqueta:<40} {duracion * 1000:8.1f} ms   {retenida / 2**20:6.1f} MiB "
+          f"({retenida / filas:5.0f} B/fila, {filas} filas)")
+
+
+def _sembrar(engine, filas: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(Proveedor), [{"id": 1, "razon_social": "Proveedor", "rfc": "RFC000000001"}])
+        conn.execute(insert(Contrato), [
+            {"id": i, "codigo_licitacion": f"LPL-{i:07d}", "proveedor_id": 1,
+             "fecha_inicio": datetime.date(2025, 1, 1), "fecha_fin": datetime.date(2025, 12, 31)}
+            for i in range(1, filas + 1)
+        ])
+        conn.execute(insert(ArticuloContrato), [
+            {"contrato_id": 1, "clave_articulo": f"A-{i}", "descripcion": f"Artículo {i}",
+             "unidad_medida": "kg", "precio_unitario": 1.0, "cant_maxima": 1000,
+             "cant_consumida": i % 1000, "clasificacion": "GRANOS"}
+            for i in range(filas)
+        ])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=100_000)
+    args = parser.parse_args()
+
+    tuplas = [(f"A-{i}", f"Artículo {i}", 1000, i % 1000) for i in range(args.filas)]
+    print(f"Construcción de {args.filas} StockStatusDTO desde tuplas en memoria:")
+    _medir("model_validate", lambda: [
+        StockStatusDTO.model_validate(dict(zip(_CAMPOS_STOCK, t))) for t in tuplas
+    ])
+    _medir("model_construct", lambda: [
+        StockStatusDTO.model_construct(**dict(zip(_CAMPOS_STOCK, t))) for t in tuplas
+    ])
+    _medir("DTORow (__slots__)", lambda: build_rows(StockStatusDTO, _CAMPOS_STOCK, tuplas))
+
+    filas = build_rows(StockStatusDTO, _CAMPOS_STOCK, tuplas)
+    modelos = [StockStatusDTO.model_construct(**dict(zip(_CAMPOS_STOCK, t))) for t in tuplas]
+    assert [f.stock_disponible for f in filas] == [m.stock_disponible for m in modelos]
+    assert filas[0].to_dto() == StockStatusDTO.model_validate(modelos[0].model_dump(exclude={"stock_disponible"}))
+    del filas, modelos
+
+    with temp_engine() as engine:
+        _sembrar(engine, args.filas)
+        uow = SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False))
+        columnas = {"cant_consumida": func.coalesce(ArticuloContrato.cant_consumida, 0)}
+
+        def listado(metodo, dto_class, **kwargs):
+            def consultar():
+                with uow.readonly():
+                    return getattr(uow.articulos_contrato if dto_class is StockStatusDTO else uow.contratos, metodo)(
+                        dto_class, **kwargs
+                    )
+            return consultar
+
+        print(f"Estado de stock ({args.filas} artículos, consulta + construcción):")
+        _medir("project (model_construct)", listado("project", StockStatusDTO, columns=columnas))
+        _medir("project_rows (DTORow)", listado("project_rows", StockStatusDTO, columns=columnas))
+        print(f"Listado de contratos ({args.filas} contratos, consulta + construcción):")
+        _medir("project (model_construct)", listado("project", ContratoDTO))
+        _medir("project_rows (DTORow)", listado("project_rows", ContratoDTO))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Mide el guardado de programaciones mensuales con y sin la cola de escrituras diferidas.
+
+Simula a un capturista que guarda N artículos seguidos (con algunas correcciones sobre
+artículos ya guardados) mediante NutricionService.guardar_programacion_mensual:
+  - directo: una transacción (y un fsync) por guardado,
+  - diferido: cada guardado se encola y se anota en el diario; una sola transacción al final.
+En ambos, cada guardado va seguido de validar_disponibilidad_articulo, como en la captura;
+con la cola la validación no debe vaciarla.
+Después comprueba la recuperación: encola, abandona la cola sin vaciarla y verifica que
+una cola nueva sobre el mismo diario escribe todas las filas al arrancar.
+
+Uso:
+    python -m benchmarks.bench_write_behind [--articulos 200] [--perfil durable]
+"""
+import argparse
+import datetime
+import os
+import tempfile
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import cronometro, resumen_ms, temp_engine
+from sigvcf.core.domain.models import Contrato, ProgramacionMensual, Proveedor
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.infrastructure.persistence.write_behind import WriteBehindQueue
+from sigvcf.modules.nutricion.dto import ProgramacionMensualDTO
+from sigvcf.modules.nutricion.services import NutricionService
+
+_MES = datetime.date(2025, 3, 1)
+
+
+def _preparar(engine, articulos: int) -> SqlAlchemyUnitOfWork:
+    uow = SqlAlchemyUnitOfWork(sessionmaker(bind=engine, autoflush=False))
+    with uow:
+        uow.proveedores.add(Proveedor(id=1, razon_social="Proveedor Bench", rfc="BENCH000000"))
+        uow.contratos.add(Contrato(
+            id=1, codigo_licitacion="LIC-BENCH", proveedor_id=1,
+            fecha_inicio=_MES, fecha_fin=_MES + datetime.timedelta(days=365),
+        ))
+        uow.articulos_contrato.add_many([
+            {"id": i + 1, "contrato_id": 1, "clave_articulo": f"A-{i:05d}", "descripcion": f"Artículo {i}",
+             "unidad_medida": "kg", "precio_unitario": 1.0, "cant_maxima": 10_000, "clasificacion": "GRANOS"}
+            for i in range(articulos)
+        ])
+        uow.commit()
+    return uow
+
+
+def _guardados(articulos: int):
+    """Un guardado por artículo y, cada diez, una corrección sobre un artículo anterior."""
+    for i in range(articulos):
+        yield i + 1, i
+        if i % 10 == 9:
+            yield i - 4, i + 100
+
+
+def _dto(articulo_id: int, cantidad: int) -> ProgramacionMensualDTO:
+    return ProgramacionMensualDTO(
+        usuario_id=1, articulo_contrato_id=articulo_id, mes_anho=_MES,
+        cantidades_por_dia={dia: cantidad for dia in range(1, 31)},
+    )
+
+
+def _contar(uow) -> int:
+    with uow.readonly():
+        return uow.session.execute(select(func.count()).select_from(ProgramacionMensual)).scalar_one()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articulos", type=int, default=200)
+    parser.add_argument("--perfil", default="durable")
+    args = parser.parse_args()
+    guardados = list(_guardados(args.articulos))
+    diario = os.path.join(tempfile.mkdtemp(prefix="sigvcf_bench_"), "write_behind.journal")
+
+    print(f"{len(guardados)} guardados sobre {args.articulos} artículos (perfil '{args.perfil}'):")
+    with temp_engine(args.perfil) as engine:
+        uow = _preparar(engine, args.articulos)
+        servicio = NutricionService(uow)
+        tiempos = []
+        with cronometro(tiempos):
+            for articulo_id, cantidad in guardados:
+                servicio.guardar_programacion_mensual(_dto(articulo_id, cantidad))
+                servicio.validar_disponibilidad_articulo(articulo_id % args.articulos + 1, cantidad)
+        print(f"  directo:   total {sum(tiempos) * 1000:9.1f} ms   filas={_contar(uow)}")
+
+    with temp_engine(args.perfil) as engine:
+        uow = _preparar(engine, args.articulos)
+        cola = WriteBehindQueue(lambda: uow, journal_path=diario, enabled=True, max_pending=10**9)
+        servicio = NutricionService(uow, write_queue=cola)
+        por_guardado, vaciado = [], []
+        for articulo_id, cantidad in guardados:
+            with cronometro(por_guardado):
+                servicio.guardar_programacion_mensual(_dto(articulo_id, cantidad))
+                servicio.validar_disponibilidad_articulo(articulo_id % args.articulos + 1, cantidad)
+        # Las validaciones leyeron lo encolado sin confirmarlo.
+        assert cola.pending == args.articulos, cola.pending
+        with cronometro(vaciado):
+            cola.flush()
+        print(
+            f"  diferido:  total {(sum(por_guardado) + sum(vaciado)) * 1000:9.1f} ms   filas={_contar(uow)}   "
+            f"(guardado y validación {resumen_ms(por_guardado)}; vaciado {vaciado[0] * 1000:.1f} ms)"
+        )
+
+    print("Recuperación del diario tras una caída:")
+    with temp_engine(args.perfil) as engine:
+        uow = _preparar(engine, args.articulos)
+        cola = WriteBehindQueue(lambda: uow, journal_path=diario, enabled=True, max_pending=10**9)
+        for articulo_id, cantidad in guardados:
+            cola.put("programaciones_mensuales", NutricionService._CLAVES_PROGRAMACION,
+                     _dto(articulo_id, cantidad).model_dump(exclude={"id"}))
+        # Se abandona la cola sin stop(): equivale a que el proceso termine de golpe.
+        nueva = WriteBehindQueue(lambda: uow, journal_path=diario, enabled=True)
+        nueva.start()
+        nueva.stop()
+        filas = _contar(uow)
+        print(f"  filas recuperadas={filas} de {args.articulos}  {'OK' if filas == args.articulos else 'ERROR'}")
+        if filas != args.articulos:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
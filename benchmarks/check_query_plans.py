@@ -0,0 +1,335 @@
+"""
+Verifica que ninguna consulta filtrada de los servicios haga un recorrido completo de tabla.
+
+Sobre un conjunto de datos sintético grande se ejecuta cada caso de uso de
+sigvcf/modules/*/services.py (y AuthService), se capturan todas las sentencias SQL que
+emite y se obtiene su EXPLAIN QUERY PLAN. Cualquier 'SCAN <tabla>' sin índice en una
+sentencia con WHERE se reporta como violación y el script termina con código 1.
+
+Los listados completos sin WHERE (p. ej. listar_contratos) recorren la tabla por diseño
+y se reportan aparte.
+
+Los casos de uso corren con carga estricta (raiseload('*')): recorrer una relación que no
+está en el @loader_plan del método también es una violación.
+
+Con --estadisticas se imprime además el resumen de SqlInstrumentation por método de
+servicio y los patrones N+1 detectados.
+
+Uso:
+    python -m benchmarks.check_query_plans [--contratos 2000] [--verbose] [--estadisticas]
+"""
+import argparse
+import bcrypt
+import datetime
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Callable, List, Tuple
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.common import temp_engine
+from sigvcf.core.domain.models import (
+    ArticuloContrato, Contrato, EntradaBodega, MovimientoInventario, OrdenDeCompra, ProgramacionMensual,
+    Proveedor, RegistroContable, ReporteIncumplimiento, Rol, SalidaRequerimiento, Usuario,
+)
+from sigvcf.infrastructure.persistence.instrumentation import SqlInstrumentation
+from sigvcf.infrastructure.persistence.loading import STRICT_LOADING
+from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.auth.services import AuthService
+from sigvcf.modules.administrativo.services import AdministrativoService
+from sigvcf.modules.almacen.services import AlmacenService
+from sigvcf.modules.financiero.services import FinancieroService
+from sigvcf.modules.juridico.services import JuridicoService
+from sigvcf.modules.nutricion.services import NutricionService
+from sigvcf.modules.proveedores.services import ProveedorService
+from sigvcf.modules.busqueda.services import SearchService
+from sigvcf.modules.almacen.dto import ArticuloRecibidoDTO, EntradaBodegaCreateDTO, OrdenCompraCreateDTO
+from sigvcf.modules.juridico.dto import ReporteIncumplimientoCreateDTO
+from sigvcf.modules.nutricion.dto import ProgramacionMensualDTO
+
+# 'SCAN tabla' sin 'USING [COVERING] INDEX' es un recorrido completo de la tabla.
+_SCAN_COMPLETO = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+_WHERE = re.compile(r"\bWHERE\b", re.IGNORECASE)
+# Recorridos completos intencionales en sentencias con WHERE: la tabla recorrida solo guía
+# búsquedas por índice en otra (p. ej. cada artículo busca sus movimientos desde su corte).
+_RECORRIDOS_POR_DISENO = {
+    ("AlmacenService.generar_cortes_inventario", "SCAN articulo_contrato"),
+}
+_ESTADOS_ORDEN = ['BORRADOR', 'APROBADA', 'FACTURA_CARGADA', 'RECIBIDA', 'VERIFICADO', 'PAGO_EN_TRAMITE']
+_MES = datetime.date(2025, 3, 1)
+_HASH_BENCH = bcrypt.hashpw(b"bench", bcrypt.gensalt(rounds=4)).decode("utf-8")
+
+
+@dataclass
+class SentenciaCapturada:
+    metodo: str
+    sql: str
+    parametros: tuple
+    plan: List[str] = field(default_factory=list)
+
+    @property
+    def tiene_where(self) -> bool:
+        return _WHERE.search(self.sql) is not None
+
+    @property
+    def scans_completos(self) -> List[str]:
+        # Recorrer una subconsulta materializada (p. ej. un agregado ya filtrado) no es
+        # recorrer una tabla: su costo está en las líneas que la construyen.
+        materializadas = {linea.split()[-1] for linea in self.plan if linea.startswith("MATERIALIZE ")}
+        return [
+            linea for linea in self.plan
+            if (m := _SCAN_COMPLETO.match(linea)) and m.group(1) not in materializadas
+        ]
+
+    @property
+    def por_diseno(self) -> bool:
+        return all((self.metodo, linea) in _RECORRIDOS_POR_DISENO for linea in self.scans_completos)
+
+
+def _sembrar(engine, contratos: int, articulos_por_contrato: int) -> None:
+    """Inserta el conjunto sintético con sentencias executemany de Core."""
+    proveedores = max(1, contratos // 10)
+    with engine.begin() as conn:
+        conn.execute(insert(Rol), [{"id": 1, "nombre_rol": "Admin", "permisos": {}}])
+        conn.execute(insert(Usuario), [{"id": 1, "nombre": "bench", "password_hash": _HASH_BENCH, "rol_id": 1}])
+        conn.execute(insert(Proveedor), [
+            {"id": p, "razon_social": f"Proveedor {p}", "rfc": f"RFC{p:09d}"} for p in range(1, proveedores + 1)
+        ])
+        conn.execute(insert(Contrato), [
+            {
+                "id": c, "codigo_licitacion": f"LPL-{c:06d}", "proveedor_id": (c % proveedores) + 1,
+                "fecha_inicio": datetime.date(2025, 1, 1), "fecha_fin": datetime.date(2025, 12, 31),
+            }
+            for c in range(1, contratos + 1)
+        ])
+        articulos = [
+            {
+                "id": (c - 1) * articulos_por_contrato + a + 1, "contrato_id": c,
+                "clave_articulo": f"A-{c}-{a}", "descripcion": f"Artículo {a} del contrato {c}",
+                "unidad_medida": "kg", "precio_unitario": 10.0, "cant_maxima": 100000,
+                "cant_consumida": 0, "clasificacion": "GRANOS",
+            }
+            for c in range(1, contratos + 1) for a in range(articulos_por_contrato)
+        ]
+        conn.execute(insert(ArticuloContrato), articulos)
+        conn.execute(insert(ProgramacionMensual), [
+            {
+                "usuario_id": 1, "articulo_contrato_id": art["id"],
+                "mes_anho": datetime.date(2025, mes, 1), "cantidades_por_dia": {"1": 1, "15": 2},
+            }
+            for art in articulos[: len(articulos) // 4] for mes in range(1, 13)
+        ])
+        ordenes = [
+            {
+                "id": o, "contrato_id": (o % contratos) + 1,
+                "fecha_entrega_programada": datetime.date(2025, 1 + o % 12, 1),
+                "estado": _ESTADOS_ORDEN[o % len(_ESTADOS_ORDEN)],
+            }
+            for o in range(1, contratos * 5 + 1)
+        ]
+        conn.execute(insert(OrdenDeCompra), ordenes)
+        recibidas = [o for o in ordenes if o["estado"] in ('RECIBIDA', 'VERIFICADO', 'PAGO_EN_TRAMITE')]
+        conn.execute(insert(EntradaBodega), [
+            {
+                "id": o["id"], "folio_rb": f"RB-{o['id']:08d}", "orden_compra_id": o["id"],
+                "fecha_recepcion": datetime.datetime(2025, 6, 1), "factura_xml_path": "/f.xml",
+                "recepcionista_id": 1,
+            }
+            for o in recibidas
+        ])
+        conn.execute(insert(MovimientoInventario), [
+            {
+                "articulo_contrato_id": art["id"], "fecha": datetime.datetime(2025, 1 + m % 12, 1 + m),
+                "tipo": "ENTRADA" if m == 0 else "SALIDA", "cantidad": 100 if m == 0 else -5,
+                "referencia": f"RB-{art['id']:08d}" if m == 0 else f"REQ-{art['id']:08d}-{m}",
+            }
+            for art in articulos[: len(articulos) // 4] for m in range(4)
+        ])
+        conn.execute(insert(RegistroContable), [
+            {"entrada_bodega_id": o["id"], "asiento_contable": "POLIZA", "contador_id": 1}
+            for o in recibidas if o["estado"] == 'PAGO_EN_TRAMITE'
+        ])
+        conn.execute(insert(ReporteIncumplimiento), [
+            {
+                "contrato_id": (r % contratos) + 1, "tipo": "ATRASO",
+                "estado": "RESUELTO" if r % 10 else "PENDIENTE", "descripcion": f"Reporte {r}",
+            }
+            for r in range(1, contratos * 3 + 1)
+        ])
+        conn.execute(insert(SalidaRequerimiento), [
+            {"qr_id": f"REQ-{_MES.strftime('%Y%m')}-{s:08X}", "usuario_solicitante_id": 1, "estado": "PREVIA"}
+            for s in range(1, 200)
+        ])
+
+
+def _valor(engine, stmt):
+    with engine.connect() as conn:
+        return conn.execute(stmt.limit(1)).scalar_one()
+
+
+def _casos_de_uso(engine, uow) -> List[Tuple[str, Callable[[], object]]]:
+    administrativo = AdministrativoService(uow)
+    almacen = AlmacenService(uow)
+    financiero = FinancieroService(uow)
+    juridico = JuridicoService(uow)
+    nutricion = NutricionService(uow)
+    proveedores = ProveedorService(uow)
+    auth = AuthService(uow)
+    busqueda = SearchService(uow)
+
+    def orden_en(estado, posicion=0):
+        stmt = select(OrdenDeCompra.id).where(OrdenDeCompra.estado == estado).order_by(OrdenDeCompra.id)
+        return _valor(engine, stmt.offset(posicion))
+
+    def proveedor_de(orden_id):
+        return _valor(engine, select(Contrato.proveedor_id).join(OrdenDeCompra).where(OrdenDeCompra.id == orden_id))
+
+    def articulo_de(orden_id):
+        return _valor(engine, select(ArticuloContrato.id).join(OrdenDeCompra, OrdenDeCompra.contrato_id == ArticuloContrato.contrato_id)
+                      .where(OrdenDeCompra.id == orden_id))
+
+    borrador, recibida, verificado = orden_en('BORRADOR'), orden_en('RECIBIDA'), orden_en('VERIFICADO')
+    # Dos órdenes aprobadas distintas: registrar_entrada_bodega consume la primera.
+    aprobada, aprobada_factura = orden_en('APROBADA'), orden_en('APROBADA', 1)
+    articulo_recibido = articulo_de(aprobada)
+
+    return [
+        ("AuthService.autenticar_usuario", lambda: auth.autenticar_usuario("bench", "bench")),
+        ("AdministrativoService.listar_contratos", administrativo.listar_contratos),
+        ("AdministrativoService.obtener_contrato_por_id", lambda: administrativo.obtener_contrato_por_id(1)),
+        ("AdministrativoService.listar_proveedores", administrativo.listar_proveedores),
+        ("AdministrativoService.listar_ordenes_pendientes_aprobacion", administrativo.listar_ordenes_pendientes_aprobacion),
+        ("AdministrativoService.aprobar_orden_de_compra", lambda: administrativo.aprobar_orden_de_compra(borrador)),
+        ("AdministrativoService.crear_o_actualizar_contrato", lambda: administrativo.crear_o_actualizar_contrato(
+            administrativo.obtener_contrato_por_id(2))),
+        ("AlmacenService.obtener_estado_stock", almacen.obtener_estado_stock),
+        ("AlmacenService.obtener_estado_stock_pagina", lambda: almacen.obtener_estado_stock_pagina(10, 50)),
+        ("AlmacenService.calcular_propuestas_aprovisionamiento", lambda: almacen.calcular_propuestas_aprovisionamiento(
+            _MES, datetime.date(2025, 12, 31))),
+        ("AlmacenService.generar_propuesta_aprovisionamiento", lambda: almacen.generar_propuesta_aprovisionamiento(
+            [OrdenCompraCreateDTO(contrato_id=1, fecha_entrega_programada=_MES)])),
+        ("AlmacenService.obtener_articulos_orden", lambda: almacen.obtener_articulos_orden(aprobada)),
+        ("AlmacenService.registrar_entrada_bodega", lambda: almacen.registrar_entrada_bodega(
+            EntradaBodegaCreateDTO(orden_compra_id=aprobada, factura_xml_path="/f.xml", recepcionista_id=1,
+                                   articulos=[ArticuloRecibidoDTO(articulo_contrato_id=articulo_recibido, cantidad=10)]))),
+        ("AlmacenService.despachar_requerimiento", lambda: almacen.despachar_requerimiento(
+            f"REQ-{_MES.strftime('%Y%m')}-{1:08X}")),
+        ("AlmacenService.generar_cortes_inventario", almacen.generar_cortes_inventario),
+        ("AlmacenService.obtener_existencias", lambda: almacen.obtener_existencias(
+            datetime.datetime(2025, 3, 15), articulo_ids=[1, 2])),
+        ("AlmacenService.obtener_movimientos", lambda: almacen.obtener_movimientos(f"RB-{1:08d}")),
+        ("FinancieroService.obtener_expedientes_pendientes", financiero.obtener_expedientes_pendientes),
+        ("FinancieroService.obtener_polizas_pendientes", financiero.obtener_polizas_pendientes),
+        ("FinancieroService.verificar_expediente", lambda: financiero.verificar_expediente(recibida)),
+        ("FinancieroService.generar_poliza_contable", lambda: financiero.generar_poliza_contable(verificado, 1)),
+        ("FinancieroService.aprobar_poliza", lambda: financiero.aprobar_poliza(1)),
+        ("JuridicoService.listar_incumplimientos_pendientes", juridico.listar_incumplimientos_pendientes),
+        ("JuridicoService.calcular_penalizacion_por_atraso", lambda: juridico.calcular_penalizacion_por_atraso(recibida)),
+        ("JuridicoService.registrar_incumplimiento", lambda: juridico.registrar_incumplimiento(
+            ReporteIncumplimientoCreateDTO(contrato_id=1, tipo="CALIDAD", estado="PENDIENTE", descripcion="x"))),
+        ("NutricionService.obtener_articulos_disponibles", nutricion.obtener_articulos_disponibles),
+        ("NutricionService.obtener_articulos_disponibles_pagina",
+         lambda: nutricion.obtener_articulos_disponibles_pagina(10, 50)),
+        ("NutricionService.validar_disponibilidad_articulo", lambda: nutricion.validar_disponibilidad_articulo(1, 10)),
+        ("NutricionService.guardar_programacion_mensual", lambda: nutricion.guardar_programacion_mensual(
+            ProgramacionMensualDTO(usuario_id=1, articulo_contrato_id=1, mes_anho=_MES, cantidades_por_dia={1: 5}))),
+        ("NutricionService.generar_requerimiento_consolidado", lambda: nutricion.generar_requerimiento_consolidado(_MES, 1)),
+        ("ProveedorService.consultar_ordenes_pendientes", lambda: proveedores.consultar_ordenes_pendientes(
+            proveedor_de(aprobada_factura))),
+        ("ProveedorService.cargar_factura_xml", lambda: proveedores.cargar_factura_xml(
+            aprobada_factura, proveedor_de(aprobada_factura), "<xml/>")),
+        ("ProveedorService.consultar_estado_entrega", lambda: proveedores.consultar_estado_entrega(
+            f"RB-{recibida:08d}", proveedor_de(recibida))),
+        ("SearchService.buscar", lambda: busqueda.buscar("art")),
+        ("SearchService.buscar_contratos", lambda: busqueda.buscar_contratos("art 1")),
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contratos", type=int, default=2000)
+    parser.add_argument("--articulos-por-contrato", type=int, default=20)
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--estadisticas", action="store_true")
+    args = parser.parse_args()
+
+    with temp_engine() as engine:
+        _sembrar(engine, args.contratos, args.articulos_por_contrato)
+        instrumentacion = SqlInstrumentation(engine, enabled=args.estadisticas)
+        session_factory = sessionmaker(bind=engine, autoflush=False, info={STRICT_LOADING: True})
+        uow = SqlAlchemyUnitOfWork(session_factory, instrumentation=instrumentacion)
+
+        capturadas: List[SentenciaCapturada] = []
+        metodo_actual = {"nombre": None}
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def _capturar(conn, cursor, statement, parameters, context, executemany):
+            verbo = statement.lstrip().split(None, 1)[0].upper()
+            if metodo_actual["nombre"] and verbo in ("SELECT", "UPDATE", "DELETE") and not executemany:
+                capturadas.append(SentenciaCapturada(metodo_actual["nombre"], statement, tuple(parameters or ())))
+
+        errores = []
+        for nombre, caso in _casos_de_uso(engine, uow):
+            metodo_actual["nombre"] = nombre
+            try:
+                caso()
+            except Exception as e:  # El objetivo es el plan de consultas, no la regla de negocio.
+                errores.append((nombre, e))
+            finally:
+                metodo_actual["nombre"] = None
+
+        event.remove(engine, "before_cursor_execute", _capturar)
+        instrumentacion.uninstall()
+        # Las sentencias repetidas (p. ej. un get() por programación) comparten plan.
+        unicas = {}
+        for sentencia in capturadas:
+            unicas.setdefault((sentencia.metodo, sentencia.sql), sentencia)
+        capturadas = list(unicas.values())
+        with engine.connect() as conn:
+            for sentencia in capturadas:
+                filas = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + sentencia.sql, sentencia.parametros).fetchall()
+                sentencia.plan = [fila[-1] for fila in filas]
+
+    violaciones = [s for s in capturadas if s.tiene_where and s.scans_completos and not s.por_diseno]
+    cargas_no_planificadas = [
+        (nombre, error) for nombre, error in errores
+        if isinstance(error, InvalidRequestError) and "lazy='raise'" in str(error)
+    ]
+    errores = [(nombre, error) for nombre, error in errores if (nombre, error) not in cargas_no_planificadas]
+    listados = [s for s in capturadas if s.scans_completos and (not s.tiene_where or s.por_diseno)]
+
+    for sentencia in capturadas if args.verbose else []:
+        print(f"--- {sentencia.metodo}\n{sentencia.sql}\n    " + "\n    ".join(sentencia.plan))
+
+    print(f"Sentencias distintas analizadas: {len(capturadas)} en {len({s.metodo for s in capturadas})} casos de uso.")
+    for nombre, error in errores:
+        print(f"AVISO: {nombre} no terminó ({type(error).__name__}: {str(error).splitlines()[0]})")
+    for sentencia in listados:
+        etiqueta = "por diseño" if sentencia.tiene_where else "sin WHERE"
+        print(f"Listado completo ({etiqueta}): {sentencia.metodo}: {', '.join(sentencia.scans_completos)}")
+    for sentencia in violaciones:
+        print(f"VIOLACIÓN: {sentencia.metodo}: {', '.join(sentencia.scans_completos)}\n    {sentencia.sql}")
+    for nombre, error in cargas_no_planificadas:
+        print(f"CARGA NO PLANIFICADA: {nombre}: {error}")
+
+    if args.estadisticas:
+        print("Estadísticas SQL por método de servicio:\n  " + instrumentacion.summary().replace("\n", "\n  "))
+        for reporte in instrumentacion.n_plus_one_findings():
+            for sql, veces in reporte.n_plus_one.items():
+                print(f"N+1: {reporte.label}: {veces}x {' '.join(sql.split())[:150]}")
+
+    if violaciones or cargas_no_planificadas:
+        print(
+            f"{len(violaciones)} sentencias filtradas recorren tablas completas; "
+            f"{len(cargas_no_planificadas)} casos de uso recorren relaciones fuera de su plan de carga."
+        )
+        return 1
+    print("OK: ninguna sentencia filtrada hace un recorrido completo de tabla ni hay cargas no planificadas.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Utilidades compartidas por los benchmarks de persistencia.
+
+Los benchmarks se ejecutan desde la raíz del proyecto, por ejemplo:
+    python -m benchmarks.bench_engine_profiles
+Nunca tocan 'sigvcf_data.db': cada corrida trabaja sobre un archivo temporal.
+"""
+import contextlib
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Iterator, List
+
+from sqlalchemy.engine import Engine
+
+from sigvcf.core.domain.models import Base
+from sigvcf.infrastructure.persistence.engine import create_sqlite_engine
+
+
+@contextlib.contextmanager
+def temp_engine(profile: str = "concurrent", **kwargs) -> Iterator[Engine]:
+    """Crea un motor sobre una base SQLite temporal con el esquema completo."""
+    directorio = tempfile.mkdtemp(prefix="sigvcf_bench_")
+    ruta = os.path.join(directorio, "bench.db")
+    engine = create_sqlite_engine(f"sqlite:///{ruta}", profile=profile, **kwargs)
+    Base.metadata.create_all(engine)
+    try:
+        yield engine
+    finally:
+        engine.dispose()
+        shutil.rmtree(directorio, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def cronometro(resultados: List[float]) -> Iterator[None]:
+    """Agrega a `resultados` la duración en segundos del bloque."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        resultados.append(time.perf_counter() - inicio)
+
+
+def percentil(valores: List[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))
+    return ordenados[indice]
+
+
+def resumen_ms(valores: List[float]) -> str:
+    if not valores:
+        return "sin muestras"
+    return (
+        f"p50={percentil(valores, 50) * 1000:.2f} ms  "
+        f"p95={percentil(valores, 95) * 1000:.2f} ms  "
+        f"media={statistics.fmean(valores) * 1000:.2f} ms"
+    )
+
@@ -1,9 +1,18 @@
 from dependency_injector import containers, providers
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.orm import sessionmaker
 
 # Service Imports
+from sigvcf.infrastructure.async_runner import AsyncRunner
+from sigvcf.infrastructure.persistence.archive import ArchiveService
+from sigvcf.infrastructure.persistence.async_unit_of_work import SqlAlchemyAsyncUnitOfWork
+from sigvcf.infrastructure.persistence.engine import create_async_sqlite_engine, create_sqlite_engine
+from sigvcf.infrastructure.persistence.instrumentation import SqlInstrumentation
+from sigvcf.infrastructure.persistence.loading import STRICT_LOADING
+from sigvcf.infrastructure.persistence.slow_query_log import SlowQueryLog
+from sigvcf.infrastructure.persistence.snapshot import SnapshotService
 from sigvcf.infrastructure.persistence.unit_of_work import SqlAlchemyUnitOfWork
+from sigvcf.infrastructure.persistence.write_behind import WriteBehindQueue
 from sigvcf.auth.services import AuthService
 from sigvcf.modules.almacen.services import AlmacenService
 from sigvcf.modules.nutricion.services import NutricionService
@@ -11,6 +20,7 @@ from sigvcf.modules.juridico.services import JuridicoService
 from sigvcf.modules.administrativo.services import AdministrativoService
 from sigvcf.modules.financiero.services import FinancieroService
 from sigvcf.modules.proveedores.services import ProveedorService
+from sigvcf.modules.busqueda.services import SearchService
 
 # ViewModel Imports
 from sigvcf.auth.viewmodels import LoginViewModel
@@ -29,26 +39,176 @@ class Container(containers.DeclarativeContainer):
     # --- 1. Configuración ---
     config = providers.Configuration()
     config.db.url.from_value("sqlite:///sigvcf_data.db")
+    # Perfil de PRAGMAs SQLite: 'legacy', 'concurrent' (WAL) o 'durable'.
+    config.db.profile.from_value("concurrent")
+    config.db.pragma_overrides.from_value({})
+    # Instrumentación SQL (conteo/tiempos por servicio y detector de N+1), desactivada por defecto.
+    config.db.instrumentation.enabled.from_value(False)
+    config.db.instrumentation.n_plus_one_threshold.from_value(5)
+    config.db.instrumentation.log_summary.from_value(False)
+    # Carga estricta: una relación fuera del plan de carga (@loader_plan) del método de
+    # servicio lanza error en lugar de hacer un lazy load. Recomendado en desarrollo.
+    config.db.strict_loading.from_value(False)
+    # Registro de consultas lentas (SQL, parámetros, servicio y EXPLAIN QUERY PLAN) en un log rotativo.
+    config.db.slow_query_log.enabled.from_value(False)
+    config.db.slow_query_log.threshold_ms.from_value(200)
+    config.db.slow_query_log.path.from_value("slow_queries.log")
+    config.db.slow_query_log.max_bytes.from_value(5 * 1024 * 1024)
+    config.db.slow_query_log.backup_count.from_value(3)
+    # Copia de solo lectura para las bandejas y listados de reporte. Se refresca cada
+    # `refresh_interval` s; si tiene más de `max_staleness` s, se lee de la base principal.
+    config.db.snapshot.enabled.from_value(False)
+    config.db.snapshot.path.from_value("sigvcf_snapshot.db")
+    config.db.snapshot.refresh_interval.from_value(30)
+    config.db.snapshot.max_staleness.from_value(60)
+    # Cola de escrituras diferidas para los guardados de programación mensual: agrupa los
+    # upserts y los confirma en una transacción cada `flush_interval` s o al llegar a `max_pending`.
+    # Con `fsync_journal` el diario sobrevive a una caída del equipo; sin él, solo a la del proceso.
+    config.db.write_behind.enabled.from_value(False)
+    config.db.write_behind.journal_path.from_value("sigvcf_write_behind.journal")
+    config.db.write_behind.flush_interval.from_value(2.0)
+    config.db.write_behind.max_pending.from_value(50)
+    config.db.write_behind.fsync_journal.from_value(True)
+    # Archivo histórico: los contratos cerrados hace más de `retention_days` días se mueven
+    # a otro archivo SQLite con archivar_contratos.py y se consultan desde ahí bajo demanda.
+    config.db.archive.enabled.from_value(False)
+    config.db.archive.path.from_value("sigvcf_archivo.db")
+    config.db.archive.retention_days.from_value(365)
 
     # --- 2. Infraestructura ---
-    db_engine = providers.Singleton(create_engine, url=config.db.url, echo=False)
-    session_factory = providers.Singleton(sessionmaker, bind=db_engine, autoflush=False, autocommit=False)
-    uow = providers.Factory(SqlAlchemyUnitOfWork, session_factory=session_factory)
+    db_engine = providers.Singleton(
+        create_sqlite_engine,
+        url=config.db.url,
+        profile=config.db.profile,
+        echo=False,
+        pragma_overrides=config.db.pragma_overrides,
+    )
+    session_factory = providers.Singleton(
+        sessionmaker,
+        bind=db_engine,
+        autoflush=False,
+        autocommit=False,
+        info=providers.Dict({STRICT_LOADING: config.db.strict_loading}),
+    )
+    sql_instrumentation = providers.Singleton(
+        SqlInstrumentation,
+        engine=db_engine,
+        enabled=config.db.instrumentation.enabled,
+        n_plus_one_threshold=config.db.instrumentation.n_plus_one_threshold,
+        log_summary=config.db.instrumentation.log_summary,
+    )
+    slow_query_log = providers.Singleton(
+        SlowQueryLog,
+        engine=db_engine,
+        enabled=config.db.slow_query_log.enabled,
+        threshold_ms=config.db.slow_query_log.threshold_ms,
+        path=config.db.slow_query_log.path,
+        max_bytes=config.db.slow_query_log.max_bytes,
+        backup_count=config.db.slow_query_log.backup_count,
+    )
+    snapshot_service = providers.Singleton(
+        SnapshotService,
+        source_url=config.db.url,
+        path=config.db.snapshot.path,
+        enabled=config.db.snapshot.enabled,
+        refresh_interval=config.db.snapshot.refresh_interval,
+        max_staleness=config.db.snapshot.max_staleness,
+        profile=config.db.profile,
+    )
+    report_session_factory = providers.Singleton(
+        sessionmaker,
+        bind=snapshot_service.provided.engine,
+        autoflush=False,
+        autocommit=False,
+        info=providers.Dict({STRICT_LOADING: config.db.strict_loading}),
+    )
+    archive_service = providers.Singleton(
+        ArchiveService,
+        source_engine=db_engine,
+        path=config.db.archive.path,
+        enabled=config.db.archive.enabled,
+        retention_days=config.db.archive.retention_days,
+        profile=config.db.profile,
+    )
+    archive_session_factory = providers.Singleton(
+        sessionmaker,
+        bind=archive_service.provided.engine,
+        autoflush=False,
+        autocommit=False,
+        info=providers.Dict({STRICT_LOADING: config.db.strict_loading}),
+    )
+    async_report_session_factory = providers.Singleton(
+        async_sessionmaker,
+        bind=snapshot_service.provided.async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        info=providers.Dict({STRICT_LOADING: config.db.strict_loading}),
+    )
+    # Ruta asíncrona (AsyncSession + aiosqlite) para consultas que los ViewModels esperan con
+    # await desde el bucle de AsyncRunner. La misma UoW sirve a tareas concurrentes.
+    async_db_engine = providers.Singleton(
+        create_async_sqlite_engine,
+        url=config.db.url,
+        profile=config.db.profile,
+        echo=False,
+        pragma_overrides=config.db.pragma_overrides,
+    )
+    async_session_factory = providers.Singleton(
+        async_sessionmaker,
+        bind=async_db_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        info=providers.Dict({STRICT_LOADING: config.db.strict_loading}),
+    )
+    async_uow = providers.Singleton(
+        SqlAlchemyAsyncUnitOfWork,
+        session_factory=async_session_factory,
+        instrumentation=sql_instrumentation,
+        snapshot=snapshot_service,
+        report_session_factory=async_report_session_factory,
+    )
+    async_runner = providers.Singleton(AsyncRunner)
+    # Una Unidad de Trabajo por hilo, compartida por todos los servicios: al ser reentrante,
+    # las llamadas anidadas entre servicios y los uow.batch() reutilizan la misma sesión.
+    uow = providers.ThreadLocalSingleton(
+        SqlAlchemyUnitOfWork,
+        session_factory=session_factory,
+        instrumentation=sql_instrumentation,
+        snapshot=snapshot_service,
+        report_session_factory=report_session_factory,
+        archive=archive_service,
+        archive_session_factory=archive_session_factory,
+    )
+    # El hilo de la cola obtiene su propia Unidad de Trabajo a través del proveedor.
+    write_behind_queue = providers.Singleton(
+        WriteBehindQueue,
+        uow_factory=uow.provider,
+        journal_path=config.db.write_behind.journal_path,
+        enabled=config.db.write_behind.enabled,
+        flush_interval=config.db.write_behind.flush_interval,
+        max_pending=config.db.write_behind.max_pending,
+        fsync_journal=config.db.write_behind.fsync_journal,
+    )
 
     # --- 3. Servicios de Aplicación ---
     auth_service = providers.Factory(AuthService, uow=uow)
-    almacen_service = providers.Factory(AlmacenService, uow=uow)
-    nutricion_service = providers.Factory(NutricionService, uow=uow)
+    almacen_service = providers.Factory(AlmacenService, uow=uow, write_queue=write_behind_queue)
+    nutricion_service = providers.Factory(NutricionService, uow=uow, write_queue=write_behind_queue)
     juridico_service = providers.Factory(JuridicoService, uow=uow)
     administrativo_service = providers.Factory(AdministrativoService, uow=uow)
-    financiero_service = providers.Factory(FinancieroService, uow=uow)
+    financiero_service = providers.Factory(FinancieroService, uow=uow, async_uow=async_uow)
     proveedor_service = providers.Factory(ProveedorService, uow=uow)
+    search_service = providers.Factory(SearchService, uow=uow)
 
     # --- 4. ViewModels (Capa de Presentación) ---
     login_view_model = providers.Factory(LoginViewModel, auth_service=auth_service)
     almacen_view_model = providers.Factory(AlmacenViewModel, almacen_service=almacen_service)
     nutricion_view_model = providers.Factory(NutricionViewModel, nutricion_service=nutricion_service)
     juridico_view_model = providers.Factory(JuridicoViewModel, juridico_service=juridico_service)
-    contrato_view_model = providers.Factory(ContratoViewModel, administrativo_service=administrativo_service)
-    financiero_view_model = providers.Factory(FinancieroViewModel, financiero_service=financiero_service)
+    contrato_view_model = providers.Factory(
+        ContratoViewModel, administrativo_service=administrativo_service, search_service=search_service
+    )
+    financiero_view_model = providers.Factory(
+        FinancieroViewModel, financiero_service=financiero_service, async_runner=async_runner
+    )
     proveedor_view_model = providers.Factory(ProveedorViewModel, proveedor_service=proveedor_service)
@@ -3,6 +3,8 @@ import datetime
 import os
 import bcrypt
 
+from alembic import command
+from alembic.config import Config
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -36,6 +38,13 @@ def create_database(db_engine):
     Base.metadata.create_all(db_engine)
     print("Tablas creadas con éxito.")
 
+    # create_all() ya genera el esquema más reciente (índices incluidos), así que
+    # se marca la base como migrada hasta 'head' para que Alembic no reaplique nada.
+    alembic_cfg = Config("alembic.ini")
+    alembic_cfg.set_main_option("sqlalchemy.url", str(db_engine.url))
+    command.stamp(alembic_cfg, "head")
+    print("Versión de esquema marcada en Alembic (head).")
+
 def seed_data(session):
     """
     Puebla la base de datos con un conjunto inicial de datos de prueba.
@@ -153,6 +153,17 @@ def main() -> None:
         logging.warning("No se encontró el archivo 'styles.qss'. Se usará el estilo por defecto.")
 
     container = Container()
+    # Activa el registro de consultas lentas si config.db.slow_query_log.enabled lo indica.
+    container.slow_query_log()
+    # Arranca el refresco de la copia de reportes si config.db.snapshot.enabled lo indica.
+    container.snapshot_service().start()
+    # Reproduce el diario de escrituras diferidas pendiente y arranca su vaciado periódico.
+    container.write_behind_queue().start()
+    # Acumula en cortes diarios los movimientos de inventario registrados desde el último arranque.
+    try:
+        container.almacen_service().generar_cortes_inventario()
+    except Exception as e:
+        logging.warning(f"No se pudieron generar los cortes de inventario: {e}")
     container.wire(
         modules=[
             sys.modules[__name__], 
@@ -166,6 +177,17 @@ def main() -> None:
         ]
     )
 
+    # Al salir se detiene el bucle asíncrono y se cierran, dentro de él, las conexiones aiosqlite.
+    async def _cerrar_motores_async():
+        await container.async_db_engine().dispose()
+        await container.snapshot_service().aclose()
+
+    app.aboutToQuit.connect(lambda: container.async_runner().shutdown(_cerrar_motores_async))
+    app.aboutToQuit.connect(lambda: container.snapshot_service().stop())
+    app.aboutToQuit.connect(lambda: container.archive_service().stop())
+    # Vacía la cola de escrituras diferidas antes de salir.
+    app.aboutToQuit.connect(lambda: container.write_behind_queue().stop())
+
     app_manager = Application(container)
     if app_manager.run():
         sys.exit(app.exec())
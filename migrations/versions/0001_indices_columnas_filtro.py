@@ -0,0 +1,55 @@
+"""Índices para las columnas de filtro y claves foráneas más consultadas
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+
+El esquema base lo crea init_db.py con Base.metadata.create_all(); esta migración
+lleva las bases de datos existentes al conjunto de índices declarado en los modelos.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+_INDICES = [
+    ('ix_contrato_proveedor_id', 'contrato', ['proveedor_id']),
+    ('ix_articulo_contrato_contrato_id', 'articulo_contrato', ['contrato_id']),
+    ('ix_programacion_mensual_mes_anho', 'programacion_mensual', ['mes_anho']),
+    ('ix_orden_de_compra_estado', 'orden_de_compra', ['estado']),
+    ('ix_orden_de_compra_contrato_id', 'orden_de_compra', ['contrato_id']),
+    ('ix_entrada_bodega_orden_compra_id', 'entrada_bodega', ['orden_compra_id']),
+    ('ix_reporte_incumplimiento_estado', 'reporte_incumplimiento', ['estado']),
+    ('ix_registro_contable_entrada_bodega_id', 'registro_contable', ['entrada_bodega_id']),
+]
+
+
+def upgrade() -> None:
+    for nombre, tabla, columnas in _INDICES:
+        op.create_index(nombre, tabla, columnas, if_not_exists=True)
+
+    op.create_index(
+        'ix_reporte_incumplimiento_pendientes', 'reporte_incumplimiento', ['contrato_id'],
+        sqlite_where=sa.text("estado != 'RESUELTO'"), if_not_exists=True,
+    )
+
+    # Antes del índice único se eliminan programaciones duplicadas (mismo artículo y mes),
+    # conservando la más reciente, que es la que guardar_programacion_mensual habría actualizado.
+    op.execute(
+        "DELETE FROM programacion_mensual WHERE id NOT IN ("
+        "SELECT MAX(id) FROM programacion_mensual GROUP BY articulo_contrato_id, mes_anho)"
+    )
+    op.create_index(
+        'uq_programacion_mensual_articulo_mes', 'programacion_mensual',
+        ['articulo_contrato_id', 'mes_anho'], unique=True, if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_programacion_mensual_articulo_mes', table_name='programacion_mensual', if_exists=True)
+    op.drop_index('ix_reporte_incumplimiento_pendientes', table_name='reporte_incumplimiento', if_exists=True)
+    for nombre, tabla, _ in reversed(_INDICES):
+        op.drop_index(nombre, table_name=tabla, if_exists=True)
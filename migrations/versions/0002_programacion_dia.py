@@ -0,0 +1,56 @@
+"""Tabla programacion_dia con las cantidades diarias normalizadas
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+Crea la tabla, los triggers que la mantienen a partir de programacion_mensual.cantidades_por_dia
+y la puebla con las programaciones existentes desglosando su JSON con json_each.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+_DESGLOSE = (
+    "INSERT INTO programacion_dia (programacion_id, dia, cantidad) "
+    "SELECT NEW.id, CAST(key AS INTEGER), CAST(value AS INTEGER) FROM json_each(NEW.cantidades_por_dia);"
+)
+_TRIGGERS = {
+    'trg_programacion_dia_insert':
+        f"AFTER INSERT ON programacion_mensual BEGIN {_DESGLOSE} END",
+    'trg_programacion_dia_update':
+        "AFTER UPDATE OF cantidades_por_dia ON programacion_mensual BEGIN "
+        f"DELETE FROM programacion_dia WHERE programacion_id = OLD.id; {_DESGLOSE} END",
+    'trg_programacion_dia_delete':
+        "AFTER DELETE ON programacion_mensual BEGIN "
+        "DELETE FROM programacion_dia WHERE programacion_id = OLD.id; END",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'programacion_dia',
+        sa.Column('programacion_id', sa.Integer, sa.ForeignKey('programacion_mensual.id'), primary_key=True),
+        sa.Column('dia', sa.Integer, primary_key=True),
+        sa.Column('cantidad', sa.Integer, nullable=False),
+        sqlite_with_rowid=False,
+        if_not_exists=True,
+    )
+    op.execute("DELETE FROM programacion_dia")
+    op.execute(
+        "INSERT INTO programacion_dia (programacion_id, dia, cantidad) "
+        "SELECT pm.id, CAST(j.key AS INTEGER), CAST(j.value AS INTEGER) "
+        "FROM programacion_mensual AS pm, json_each(pm.cantidades_por_dia) AS j"
+    )
+    for nombre, cuerpo in _TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER IF NOT EXISTS {nombre} {cuerpo}")
+
+
+def downgrade() -> None:
+    for nombre in reversed(list(_TRIGGERS)):
+        op.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+    op.drop_table('programacion_dia', if_exists=True)
@@ -0,0 +1,77 @@
+"""Total programado mantenido en articulo_contrato.cant_programada
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+Agrega la columna, reemplaza los triggers de programacion_mensual por versiones que además
+ajustan cant_programada por la diferencia y la calcula para los artículos existentes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+_DESGLOSE = (
+    "INSERT INTO programacion_dia (programacion_id, dia, cantidad) "
+    "SELECT NEW.id, CAST(key AS INTEGER), CAST(value AS INTEGER) FROM json_each(NEW.cantidades_por_dia);"
+)
+_TOTAL = "(SELECT COALESCE(SUM(cantidad), 0) FROM programacion_dia WHERE programacion_id = {fila}.id)"
+_SUMAR = (
+    f"UPDATE articulo_contrato SET cant_programada = cant_programada + {_TOTAL.format(fila='NEW')} "
+    "WHERE id = NEW.articulo_contrato_id;"
+)
+_RESTAR = (
+    f"UPDATE articulo_contrato SET cant_programada = cant_programada - {_TOTAL.format(fila='OLD')} "
+    "WHERE id = OLD.articulo_contrato_id;"
+)
+_TRIGGERS = {
+    'trg_programacion_dia_insert':
+        f"AFTER INSERT ON programacion_mensual BEGIN {_DESGLOSE} {_SUMAR} END",
+    'trg_programacion_dia_update':
+        "AFTER UPDATE OF cantidades_por_dia, articulo_contrato_id ON programacion_mensual BEGIN "
+        f"{_RESTAR} DELETE FROM programacion_dia WHERE programacion_id = OLD.id; {_DESGLOSE} {_SUMAR} END",
+    'trg_programacion_dia_delete':
+        "AFTER DELETE ON programacion_mensual BEGIN "
+        f"{_RESTAR} DELETE FROM programacion_dia WHERE programacion_id = OLD.id; END",
+}
+# Triggers de la revisión 0002, para el downgrade.
+_TRIGGERS_0002 = {
+    'trg_programacion_dia_insert':
+        f"AFTER INSERT ON programacion_mensual BEGIN {_DESGLOSE} END",
+    'trg_programacion_dia_update':
+        "AFTER UPDATE OF cantidades_por_dia ON programacion_mensual BEGIN "
+        f"DELETE FROM programacion_dia WHERE programacion_id = OLD.id; {_DESGLOSE} END",
+    'trg_programacion_dia_delete':
+        "AFTER DELETE ON programacion_mensual BEGIN "
+        "DELETE FROM programacion_dia WHERE programacion_id = OLD.id; END",
+}
+
+
+def _reemplazar_triggers(triggers) -> None:
+    for nombre, cuerpo in triggers.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+        op.execute(f"CREATE TRIGGER {nombre} {cuerpo}")
+
+
+def upgrade() -> None:
+    op.add_column(
+        'articulo_contrato',
+        sa.Column('cant_programada', sa.Integer, nullable=False, server_default=sa.text("0")),
+    )
+    _reemplazar_triggers(_TRIGGERS)
+    op.execute(
+        "UPDATE articulo_contrato SET cant_programada = COALESCE(("
+        "SELECT SUM(pd.cantidad) FROM programacion_mensual AS pm "
+        "JOIN programacion_dia AS pd ON pd.programacion_id = pm.id "
+        "WHERE pm.articulo_contrato_id = articulo_contrato.id), 0)"
+    )
+
+
+def downgrade() -> None:
+    _reemplazar_triggers(_TRIGGERS_0002)
+    with op.batch_alter_table('articulo_contrato') as batch_op:
+        batch_op.drop_column('cant_programada')
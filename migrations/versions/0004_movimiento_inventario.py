@@ -0,0 +1,60 @@
+"""Libro de movimientos de inventario y cortes de existencia
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+
+Crea movimiento_inventario (de solo anexado, protegido por triggers) y corte_inventario.
+El libro empieza vacío: las entradas y despachos anteriores no guardaban cantidades por
+artículo ni fechas de movimiento, así que no hay historial que reconstruir.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+_TRIGGERS = {
+    'trg_movimiento_inventario_sin_update':
+        "BEFORE UPDATE ON movimiento_inventario "
+        "BEGIN SELECT RAISE(ABORT, 'movimiento_inventario es de solo anexado'); END",
+    'trg_movimiento_inventario_sin_delete':
+        "BEFORE DELETE ON movimiento_inventario "
+        "BEGIN SELECT RAISE(ABORT, 'movimiento_inventario es de solo anexado'); END",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'movimiento_inventario',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('articulo_contrato_id', sa.Integer, sa.ForeignKey('articulo_contrato.id'), nullable=False),
+        sa.Column('fecha', sa.DateTime, nullable=False),
+        sa.Column('tipo', sa.String, nullable=False),
+        sa.Column('cantidad', sa.Integer, nullable=False),
+        sa.Column('referencia', sa.String, nullable=False),
+    )
+    op.create_index('ix_movimiento_inventario_articulo_fecha', 'movimiento_inventario',
+                    ['articulo_contrato_id', 'fecha'])
+    op.create_index('ix_movimiento_inventario_referencia', 'movimiento_inventario', ['referencia'])
+    for nombre, cuerpo in _TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {nombre} {cuerpo}")
+
+    op.create_table(
+        'corte_inventario',
+        sa.Column('articulo_contrato_id', sa.Integer, sa.ForeignKey('articulo_contrato.id'), primary_key=True),
+        sa.Column('fecha_corte', sa.DateTime, primary_key=True),
+        sa.Column('existencia', sa.Integer, nullable=False),
+        sqlite_with_rowid=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('corte_inventario')
+    for nombre in _TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {nombre}")
+    op.drop_index('ix_movimiento_inventario_referencia', table_name='movimiento_inventario')
+    op.drop_index('ix_movimiento_inventario_articulo_fecha', table_name='movimiento_inventario')
+    op.drop_table('movimiento_inventario')
@@ -0,0 +1,51 @@
+"""Índices de búsqueda de texto completo (FTS5)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+Crea las tablas virtuales FTS5 de contenido externo sobre contratos, artículos, proveedores
+y reportes de incumplimiento, con los triggers que las mantienen sincronizadas, y las
+puebla con 'rebuild' a partir de las filas existentes.
+"""
+from alembic import op
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+_TOKENIZADOR = "unicode61 remove_diacritics 2"
+# indice -> (tabla de origen, columnas indexadas)
+_INDICES = {
+    'busqueda_contrato': ('contrato', ('codigo_licitacion',)),
+    'busqueda_articulo': ('articulo_contrato', ('clave_articulo', 'descripcion')),
+    'busqueda_proveedor': ('proveedor', ('razon_social', 'rfc')),
+    'busqueda_reporte': ('reporte_incumplimiento', ('tipo', 'descripcion')),
+}
+
+
+def upgrade() -> None:
+    for nombre, (tabla, columnas) in _INDICES.items():
+        lista = ", ".join(columnas)
+        nuevas = ", ".join(f"NEW.{c}" for c in columnas)
+        viejas = ", ".join(f"OLD.{c}" for c in columnas)
+        borrar = f"INSERT INTO {nombre} ({nombre}, rowid, {lista}) VALUES ('delete', OLD.id, {viejas});"
+        insertar = f"INSERT INTO {nombre} (rowid, {lista}) VALUES (NEW.id, {nuevas});"
+        op.execute(
+            f"CREATE VIRTUAL TABLE {nombre} USING fts5({lista}, content='{tabla}', "
+            f"content_rowid='id', tokenize='{_TOKENIZADOR}', prefix='2 3')"
+        )
+        op.execute(f"CREATE TRIGGER trg_{nombre}_insert AFTER INSERT ON {tabla} BEGIN {insertar} END")
+        op.execute(f"CREATE TRIGGER trg_{nombre}_delete AFTER DELETE ON {tabla} BEGIN {borrar} END")
+        op.execute(
+            f"CREATE TRIGGER trg_{nombre}_update AFTER UPDATE OF {lista} ON {tabla} BEGIN {borrar} {insertar} END"
+        )
+        op.execute(f"INSERT INTO {nombre} ({nombre}) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    for nombre in _INDICES:
+        for evento in ('insert', 'delete', 'update'):
+            op.execute(f"DROP TRIGGER IF EXISTS trg_{nombre}_{evento}")
+        op.execute(f"DROP TABLE IF EXISTS {nombre}")
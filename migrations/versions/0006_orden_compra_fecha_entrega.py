@@ -0,0 +1,26 @@
+"""Índice de órdenes de compra por fecha de entrega
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+
+El motor de aprovisionamiento lee las órdenes ya programadas en el periodo que planea;
+el índice por fecha de entrega (que cubre contrato_id) evita recorrer todo el historial.
+"""
+from alembic import op
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_orden_de_compra_fecha_entrega', 'orden_de_compra', ['fecha_entrega_programada', 'contrato_id'],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orden_de_compra_fecha_entrega', table_name='orden_de_compra', if_exists=True)
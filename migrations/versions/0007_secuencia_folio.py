@@ -0,0 +1,32 @@
+"""Contador diario de folios
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+
+Crea la tabla secuencia_folio, de la que se reservan los Folios R.B. de las entradas de
+bodega y los QR ID de los requerimientos. Los folios ya emitidos con el formato anterior
+(marca de tiempo u hexadecimal aleatorio) no chocan con los nuevos, que llevan la fecha y
+un consecutivo de cinco dígitos.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'secuencia_folio',
+        sa.Column('serie', sa.String, primary_key=True),
+        sa.Column('fecha', sa.Date, primary_key=True),
+        sa.Column('ultimo', sa.Integer, nullable=False),
+        sqlite_with_rowid=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('secuencia_folio')
@@ -0,0 +1,66 @@
+"""Ids sin reutilizar en las tablas del archivo histórico
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17
+
+Reconstruye con AUTOINCREMENT las tablas cuyas filas ArchiveService mueve al archivo y
+elimina de la base principal. Sin AUTOINCREMENT SQLite entrega de nuevo el id más alto una
+vez eliminado, y la siguiente corrida del archivo reemplazaba la fila archivada con ese id.
+
+SQLite no permite agregar AUTOINCREMENT con ALTER TABLE: cada tabla se copia a una nueva,
+se elimina la anterior y la nueva toma su nombre. Los índices y triggers de la tabla se
+vuelven a crear con el SQL exacto que tenían en sqlite_master (incluidos los índices
+parciales, los de búsqueda FTS5 y los de programacion_dia). Al copiar las filas con su id,
+sqlite_sequence arranca en el id más alto de cada tabla.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+_TABLAS = [
+    'contrato', 'articulo_contrato', 'programacion_mensual', 'movimiento_inventario',
+    'orden_de_compra', 'entrada_bodega', 'registro_contable', 'reporte_incumplimiento',
+]
+
+
+def _reconstruir(autoincrement: bool) -> None:
+    conn = op.get_bind()
+    metadata = sa.MetaData()
+    metadata.reflect(conn, only=_TABLAS)
+    # Con el modo moderno, renombrar valida todos los triggers y falla en los que mencionan
+    # la tabla recién eliminada (p. ej. los de programacion_mensual sobre articulo_contrato).
+    conn.exec_driver_sql("PRAGMA legacy_alter_table=ON")
+    try:
+        for nombre in _TABLAS:
+            # Índices y triggers de la tabla; los autoíndices de UNIQUE no tienen SQL propio.
+            dependientes = conn.exec_driver_sql(
+                "SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') "
+                "AND sql IS NOT NULL", (nombre,)
+            ).scalars().all()
+            temporal = f"_tmp_{nombre}"
+            nueva = metadata.tables[nombre].to_metadata(metadata, name=temporal)
+            nueva.indexes.clear()
+            nueva.dialect_options['sqlite']['autoincrement'] = autoincrement
+            nueva.create(conn)
+            columnas = ", ".join(c.name for c in nueva.columns)
+            conn.exec_driver_sql(f"INSERT INTO {temporal} ({columnas}) SELECT {columnas} FROM {nombre}")
+            conn.exec_driver_sql(f"DROP TABLE {nombre}")
+            conn.exec_driver_sql(f"ALTER TABLE {temporal} RENAME TO {nombre}")
+            metadata.remove(nueva)
+            for sql in dependientes:
+                conn.exec_driver_sql(sql)
+    finally:
+        conn.exec_driver_sql("PRAGMA legacy_alter_table=OFF")
+
+
+def upgrade() -> None:
+    _reconstruir(autoincrement=True)
+
+
+def downgrade() -> None:
+    _reconstruir(autoincrement=False)
@@ -0,0 +1,48 @@
+"""
+Reconstruye el total programado que se mantiene en cada artículo de contrato
+(articulo_contrato.cant_programada) a partir de sus programaciones mensuales e informa
+las desviaciones encontradas.
+
+Uso:
+    python reconciliar_programado.py [--url sqlite:///sigvcf_data.db] [--solo-reportar]
+
+Termina con código 1 si hubo desviaciones, para poder usarse en tareas programadas.
+"""
+import argparse
+import sys
+
+from containers import Container
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="URL de la base de datos (por defecto, la de la aplicación).")
+    parser.add_argument("--solo-reportar", action="store_true", help="Informa las desviaciones sin corregirlas.")
+    args = parser.parse_args()
+
+    container = Container()
+    if args.url:
+        container.config.db.url.from_value(args.url)
+
+    # Las programaciones que quedaron en el diario de escrituras diferidas se escriben antes de recalcular.
+    cola = container.write_behind_queue()
+    cola.start()
+    try:
+        desviaciones = container.nutricion_service().reconciliar_cant_programada(corregir=not args.solo_reportar)
+    finally:
+        cola.stop()
+
+    if not desviaciones:
+        print("Sin desviaciones: cant_programada coincide con las programaciones mensuales.")
+        return 0
+
+    accion = "se informan sin corregir" if args.solo_reportar else "corregidas"
+    print(f"{len(desviaciones)} artículos con desviación ({accion}):")
+    for d in desviaciones:
+        print(f"  {d.clave_articulo:<15} id={d.articulo_contrato_id:<6} "
+              f"mantenido={d.cant_programada:<10} recalculado={d.cant_recalculada:<10} diferencia={d.diferencia:+}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
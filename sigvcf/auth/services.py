@@ -1,5 +1,6 @@
 import bcrypt
 from sqlalchemy.orm import joinedload
+from sigvcf.infrastructure.persistence.loading import loader_plan
 from sigvcf.infrastructure.persistence.unit_of_work import IUnitOfWork
 from sigvcf.core.domain.models import Usuario
 
@@ -10,6 +11,7 @@ class AuthService:
     def __init__(self, uow: IUnitOfWork):
         self.uow = uow
 
+    @loader_plan(joinedload(Usuario.rol))
     def autenticar_usuario(self, nombre_usuario: str, contrasena: str) -> dict | None:
         """
         Verifica las credenciales de un usuario contra la base de datos.
@@ -21,7 +23,7 @@ class AuthService:
         Returns:
             El objeto Usuario si la autenticación es exitosa, de lo contrario None.
         """
-        with self.uow:
+        with self.uow.readonly():
             # Buscar usuario por nombre usando el repositorio
             usuario = self.uow.usuarios.find_one_by(nombre=nombre_usuario)
             if not usuario:
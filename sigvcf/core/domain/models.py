@@ -3,7 +3,9 @@
 import datetime
 from sqlalchemy import (
     create_engine,
+    event,
     Column,
+    DDL,
     Integer,
     String,
     Date,
@@ -11,7 +13,9 @@ from sqlalchemy import (
     Float,
     Text,
     ForeignKey,
-    JSON
+    Index,
+    JSON,
+    text
 )
 from sqlalchemy.orm import relationship, declarative_base
 
@@ -44,6 +48,11 @@ class Proveedor(Base):
     email_contacto = Column(String)
     contratos = relationship("Contrato", back_populates="proveedor")
 
+# Tablas cuyas filas se mueven al archivo histórico (ver ArchiveService): con AUTOINCREMENT
+# SQLite no vuelve a entregar el id de una fila eliminada, así que un id archivado nunca se
+# reutiliza en la base principal ni choca con otra fila en la siguiente corrida del archivo.
+_IDS_SIN_REUTILIZAR = {'sqlite_autoincrement': True}
+
 class Contrato(Base):
     __tablename__ = 'contrato'
     id = Column(Integer, primary_key=True)
@@ -57,6 +66,11 @@ class Contrato(Base):
     ordenes_de_compra = relationship("OrdenDeCompra", back_populates="contrato")
     reportes_incumplimiento = relationship("ReporteIncumplimiento", back_populates="contrato")
 
+    __table_args__ = (
+        Index('ix_contrato_proveedor_id', 'proveedor_id'),
+        _IDS_SIN_REUTILIZAR,
+    )
+
 class ArticuloContrato(Base):
     __tablename__ = 'articulo_contrato'
     id = Column(Integer, primary_key=True)
@@ -67,10 +81,18 @@ class ArticuloContrato(Base):
     precio_unitario = Column(Float, nullable=False)
     cant_maxima = Column(Integer, nullable=False)
     cant_consumida = Column(Integer, default=0)
+    # Total programado en todas las programaciones mensuales del artículo; lo mantienen por
+    # diferencias los triggers de programacion_mensual (ver ProgramacionDia).
+    cant_programada = Column(Integer, nullable=False, default=0, server_default=text("0"))
     clasificacion = Column(String)
     contrato = relationship("Contrato", back_populates="articulos")
     programaciones_mensuales = relationship("ProgramacionMensual", back_populates="articulo_contrato")
 
+    __table_args__ = (
+        Index('ix_articulo_contrato_contrato_id', 'contrato_id'),
+        _IDS_SIN_REUTILIZAR,
+    )
+
 class ProgramacionMensual(Base):
     __tablename__ = 'programacion_mensual'
     id = Column(Integer, primary_key=True)
@@ -81,6 +103,54 @@ class ProgramacionMensual(Base):
     usuario = relationship("Usuario", back_populates="programaciones_mensuales")
     articulo_contrato = relationship("ArticuloContrato", back_populates="programaciones_mensuales")
 
+    __table_args__ = (
+        # Una sola programación por artículo y mes; también sirve las búsquedas por artículo.
+        Index('uq_programacion_mensual_articulo_mes', 'articulo_contrato_id', 'mes_anho', unique=True),
+        Index('ix_programacion_mensual_mes_anho', 'mes_anho'),
+        _IDS_SIN_REUTILIZAR,
+    )
+
+class ProgramacionDia(Base):
+    """
+    Forma normalizada de ProgramacionMensual.cantidades_por_dia: una fila por día, para que
+    los totales se calculen con SUM en SQL. La mantienen los triggers de SQLite declarados
+    abajo a partir de la columna JSON, que sigue siendo la que escribe la aplicación.
+    """
+    __tablename__ = 'programacion_dia'
+    programacion_id = Column(Integer, ForeignKey('programacion_mensual.id'), primary_key=True)
+    dia = Column(Integer, primary_key=True)
+    cantidad = Column(Integer, nullable=False)
+
+    # Agrupada por programación: las sumas de una programación leen páginas contiguas.
+    __table_args__ = {'sqlite_with_rowid': False}
+
+_DESGLOSE_PROGRAMACION = (
+    "INSERT INTO programacion_dia (programacion_id, dia, cantidad) "
+    "SELECT NEW.id, CAST(key AS INTEGER), CAST(value AS INTEGER) FROM json_each(NEW.cantidades_por_dia);"
+)
+# Los triggers ajustan ArticuloContrato.cant_programada por la diferencia: restan el total
+# anterior de la programación y suman el nuevo, en la misma transacción que la escritura.
+_TOTAL_PROGRAMACION = "(SELECT COALESCE(SUM(cantidad), 0) FROM programacion_dia WHERE programacion_id = {fila}.id)"
+_SUMAR_PROGRAMADO = (
+    f"UPDATE articulo_contrato SET cant_programada = cant_programada + {_TOTAL_PROGRAMACION.format(fila='NEW')} "
+    "WHERE id = NEW.articulo_contrato_id;"
+)
+_RESTAR_PROGRAMADO = (
+    f"UPDATE articulo_contrato SET cant_programada = cant_programada - {_TOTAL_PROGRAMACION.format(fila='OLD')} "
+    "WHERE id = OLD.articulo_contrato_id;"
+)
+for _ddl in (
+    "CREATE TRIGGER IF NOT EXISTS trg_programacion_dia_insert AFTER INSERT ON programacion_mensual "
+    f"BEGIN {_DESGLOSE_PROGRAMACION} {_SUMAR_PROGRAMADO} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_programacion_dia_update "
+    "AFTER UPDATE OF cantidades_por_dia, articulo_contrato_id ON programacion_mensual "
+    f"BEGIN {_RESTAR_PROGRAMADO} DELETE FROM programacion_dia WHERE programacion_id = OLD.id; "
+    f"{_DESGLOSE_PROGRAMACION} {_SUMAR_PROGRAMADO} END",
+    "CREATE TRIGGER IF NOT EXISTS trg_programacion_dia_delete AFTER DELETE ON programacion_mensual "
+    f"BEGIN {_RESTAR_PROGRAMADO} DELETE FROM programacion_dia WHERE programacion_id = OLD.id; END",
+):
+    event.listen(ProgramacionDia.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+
 class SalidaRequerimiento(Base):
     __tablename__ = 'salida_requerimiento'
     id = Column(Integer, primary_key=True)
@@ -99,6 +169,14 @@ class OrdenDeCompra(Base):
     contrato = relationship("Contrato", back_populates="ordenes_de_compra")
     entrada_bodega = relationship("EntradaBodega", back_populates="orden_de_compra", uselist=False)
 
+    __table_args__ = (
+        Index('ix_orden_de_compra_estado', 'estado'),
+        Index('ix_orden_de_compra_contrato_id', 'contrato_id'),
+        # Órdenes de un periodo de entrega (el motor de aprovisionamiento); cubre contrato_id.
+        Index('ix_orden_de_compra_fecha_entrega', 'fecha_entrega_programada', 'contrato_id'),
+        _IDS_SIN_REUTILIZAR,
+    )
+
 class EntradaBodega(Base):
     __tablename__ = 'entrada_bodega'
     id = Column(Integer, primary_key=True)
@@ -111,6 +189,74 @@ class EntradaBodega(Base):
     recepcionista = relationship("Usuario", back_populates="entradas_bodega_recepcionadas", foreign_keys=[recepcionista_id])
     registro_contable = relationship("RegistroContable", back_populates="entrada_bodega", uselist=False)
 
+    __table_args__ = (
+        Index('ix_entrada_bodega_orden_compra_id', 'orden_compra_id'),
+        _IDS_SIN_REUTILIZAR,
+    )
+
+class SecuenciaFolio(Base):
+    """
+    Contador de folios por serie ('RB' para entradas de bodega, 'REQ' para requerimientos)
+    y día: `ultimo` es el último número entregado ese día. Lo avanza
+    SecuenciaFolioRepository.reservar por bloques, en la transacción que usa los folios.
+    """
+    __tablename__ = 'secuencia_folio'
+    serie = Column(String, primary_key=True)
+    fecha = Column(Date, primary_key=True)
+    ultimo = Column(Integer, nullable=False)
+
+    __table_args__ = {'sqlite_with_rowid': False}
+
+class MovimientoInventario(Base):
+    """
+    Libro de movimientos de inventario, de solo anexado: cada entrada de bodega suma y cada
+    despacho de requerimiento resta (cantidad con signo). La existencia de un artículo en
+    cualquier fecha es la suma de sus movimientos hasta esa fecha. Los triggers de abajo
+    rechazan UPDATE y DELETE: una corrección se registra como un movimiento nuevo.
+    """
+    __tablename__ = 'movimiento_inventario'
+    id = Column(Integer, primary_key=True)
+    articulo_contrato_id = Column(Integer, ForeignKey('articulo_contrato.id'), nullable=False)
+    fecha = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+    tipo = Column(String, nullable=False)  # 'ENTRADA' | 'SALIDA'
+    cantidad = Column(Integer, nullable=False)
+    # Folio R.B. de la entrada o QR ID del requerimiento que originó el movimiento.
+    referencia = Column(String, nullable=False)
+
+    __table_args__ = (
+        # Sirve la suma acotada de movimientos posteriores a un corte (ver CorteInventario).
+        Index('ix_movimiento_inventario_articulo_fecha', 'articulo_contrato_id', 'fecha'),
+        Index('ix_movimiento_inventario_referencia', 'referencia'),
+        _IDS_SIN_REUTILIZAR,
+    )
+
+# El archivo histórico lo quita y lo vuelve a crear dentro de la transacción que elimina
+# los movimientos ya copiados al archivo (ver ArchiveService.archivar).
+TRIGGER_MOVIMIENTOS_SIN_DELETE = "trg_movimiento_inventario_sin_delete"
+DDL_MOVIMIENTOS_SIN_DELETE = (
+    f"CREATE TRIGGER IF NOT EXISTS {TRIGGER_MOVIMIENTOS_SIN_DELETE} BEFORE DELETE ON movimiento_inventario "
+    "BEGIN SELECT RAISE(ABORT, 'movimiento_inventario es de solo anexado'); END"
+)
+for _ddl in (
+    "CREATE TRIGGER IF NOT EXISTS trg_movimiento_inventario_sin_update BEFORE UPDATE ON movimiento_inventario "
+    "BEGIN SELECT RAISE(ABORT, 'movimiento_inventario es de solo anexado'); END",
+    DDL_MOVIMIENTOS_SIN_DELETE,
+):
+    event.listen(MovimientoInventario.__table__, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+
+class CorteInventario(Base):
+    """
+    Existencia acumulada de un artículo al inicio de `fecha_corte` (suma de sus movimientos
+    con fecha anterior). La existencia en una fecha se calcula desde el último corte previo
+    más los movimientos posteriores a él, sin recorrer el libro completo.
+    """
+    __tablename__ = 'corte_inventario'
+    articulo_contrato_id = Column(Integer, ForeignKey('articulo_contrato.id'), primary_key=True)
+    fecha_corte = Column(DateTime, primary_key=True)
+    existencia = Column(Integer, nullable=False)
+
+    __table_args__ = {'sqlite_with_rowid': False}
+
 class ReporteIncumplimiento(Base):
     __tablename__ = 'reporte_incumplimiento'
     id = Column(Integer, primary_key=True)
@@ -120,6 +266,17 @@ class ReporteIncumplimiento(Base):
     descripcion = Column(Text)
     contrato = relationship("Contrato", back_populates="reportes_incumplimiento")
 
+    __table_args__ = (
+        Index('ix_reporte_incumplimiento_estado', 'estado'),
+        # Índice parcial: 'estado != RESUELTO' no puede usar un índice normal, pero SQLite
+        # usa este cuando la consulta repite exactamente la misma condición.
+        Index(
+            'ix_reporte_incumplimiento_pendientes', 'contrato_id',
+            sqlite_where=text("estado != 'RESUELTO'"),
+        ),
+        _IDS_SIN_REUTILIZAR,
+    )
+
 class RegistroContable(Base):
     __tablename__ = 'registro_contable'
     id = Column(Integer, primary_key=True)
@@ -128,4 +285,38 @@ class RegistroContable(Base):
     fecha_contabilizacion = Column(DateTime, default=datetime.datetime.utcnow)
     contador_id = Column(Integer, ForeignKey('usuario.id'))
     entrada_bodega = relationship("EntradaBodega", back_populates="registro_contable")
-    contador = relationship("Usuario", back_populates="registros_contables_creados", foreign_keys=[contador_id])
\ No newline at end of file
+    contador = relationship("Usuario", back_populates="registros_contables_creados", foreign_keys=[contador_id])
+
+    __table_args__ = (
+        Index('ix_registro_contable_entrada_bodega_id', 'entrada_bodega_id'),
+        _IDS_SIN_REUTILIZAR,
+    )
+
+# --- Índices de búsqueda de texto completo (FTS5) ---
+# Tablas virtuales de contenido externo: guardan solo el índice invertido y leen el texto de
+# la tabla de origen (content_rowid = id). Los triggers replican cada alta, baja y cambio de
+# las columnas indexadas. 'remove_diacritics' hace que "atun" encuentre "Atún"; los índices
+# de prefijo de 2 y 3 caracteres resuelven sin recorrer el vocabulario las búsquedas
+# mientras se escribe (p. ej. "ar*").
+_TOKENIZADOR_BUSQUEDA = "unicode61 remove_diacritics 2"
+
+def _indice_busqueda(nombre: str, tabla, columnas) -> None:
+    lista = ", ".join(columnas)
+    nuevas = ", ".join(f"NEW.{c}" for c in columnas)
+    viejas = ", ".join(f"OLD.{c}" for c in columnas)
+    borrar = f"INSERT INTO {nombre} ({nombre}, rowid, {lista}) VALUES ('delete', OLD.id, {viejas});"
+    insertar = f"INSERT INTO {nombre} (rowid, {lista}) VALUES (NEW.id, {nuevas});"
+    for _ddl in (
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {nombre} USING fts5({lista}, content='{tabla.name}', "
+        f"content_rowid='id', tokenize='{_TOKENIZADOR_BUSQUEDA}', prefix='2 3')",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{nombre}_insert AFTER INSERT ON {tabla.name} BEGIN {insertar} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{nombre}_delete AFTER DELETE ON {tabla.name} BEGIN {borrar} END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{nombre}_update AFTER UPDATE OF {lista} ON {tabla.name} "
+        f"BEGIN {borrar} {insertar} END",
+    ):
+        event.listen(tabla, "after_create", DDL(_ddl).execute_if(dialect="sqlite"))
+
+_indice_busqueda("busqueda_contrato", Contrato.__table__, ("codigo_licitacion",))
+_indice_busqueda("busqueda_articulo", ArticuloContrato.__table__, ("clave_articulo", "descripcion"))
+_indice_busqueda("busqueda_proveedor", Proveedor.__table__, ("razon_social", "rfc"))
+_indice_busqueda("busqueda_reporte", ReporteIncumplimiento.__table__, ("tipo", "descripcion"))
@@ -0,0 +1,78 @@
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Awaitable, Callable, Coroutine
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncRunner:
+    """
+    Bucle asyncio compartido por los ViewModels.
+
+    El bucle corre en un hilo dedicado para que las consultas largas no bloqueen el bucle
+    de eventos de Qt. Los ViewModels envían corrutinas con submit() y publican los
+    resultados emitiendo sus señales desde la corrutina: al emitirse desde otro hilo, Qt
+    las entrega encoladas en el hilo de la interfaz, igual que cualquier otra señal.
+    """
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._hilo: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                listo = threading.Event()
+                self._hilo = threading.Thread(target=self._ejecutar, args=(listo,), name="sigvcf-asyncio", daemon=True)
+                self._hilo.start()
+                listo.wait()
+            return self._loop
+
+    def _ejecutar(self, listo: threading.Event) -> None:
+        loop = self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        listo.set()
+        loop.run_forever()
+        loop.close()
+
+    def submit(self, coro: Coroutine) -> concurrent.futures.Future:
+        """Programa la corrutina en el bucle; los errores no capturados se registran en el log."""
+        futuro = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        futuro.add_done_callback(self._registrar_error)
+        return futuro
+
+    @staticmethod
+    def _registrar_error(futuro: concurrent.futures.Future) -> None:
+        if not futuro.cancelled() and futuro.exception() is not None:
+            logger.error("Error no controlado en una tarea asíncrona.", exc_info=futuro.exception())
+
+    def shutdown(self, cleanup: Callable[[], Awaitable] | None = None, timeout: float = 5.0) -> None:
+        """
+        Cancela las tareas pendientes, ejecuta `cleanup` dentro del bucle (p. ej. el dispose()
+        del motor asíncrono, cuyas conexiones pertenecen a este bucle) y detiene el hilo.
+        """
+        with self._lock:
+            loop, hilo = self._loop, self._hilo
+            self._loop = self._hilo = None
+        if loop is None:
+            return
+
+        async def _cerrar():
+            actual = asyncio.current_task()
+            pendientes = [tarea for tarea in asyncio.all_tasks() if tarea is not actual]
+            for tarea in pendientes:
+                tarea.cancel()
+            await asyncio.gather(*pendientes, return_exceptions=True)
+            if cleanup is not None:
+                await cleanup()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_cerrar(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"El bucle asíncrono no se cerró limpiamente: {e}")
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            hilo.join(timeout)
@@ -0,0 +1,31 @@
+import functools
+from typing import Any, Iterable, List, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+D = TypeVar("D", bound=BaseModel)
+
+
+@functools.lru_cache(maxsize=None)
+def _adaptador_lista(dto_class: Type[D]) -> TypeAdapter:
+    # Construir un TypeAdapter compila su esquema: se hace una sola vez por DTO.
+    return TypeAdapter(List[dto_class])
+
+
+def to_dto(dto_class: Type[D], obj: Any) -> D:
+    """
+    Convierte una entidad del ORM (o cualquier objeto con atributos) en `dto_class`.
+    Sustituye a `from_orm()`, obsoleto en Pydantic v2.
+    """
+    return dto_class.model_validate(obj, from_attributes=True)
+
+
+def to_dtos(dto_class: Type[D], objs: Iterable[Any]) -> List[D]:
+    """
+    Convierte un conjunto de resultados completo en una lista de `dto_class` con una sola
+    llamada al validador de Pydantic (TypeAdapter(List[dto_class]) en caché), en lugar de
+    despachar la validación fila por fila.
+    """
+    if not isinstance(objs, list):
+        objs = list(objs)
+    return _adaptador_lista(dto_class).validate_python(objs, from_attributes=True)
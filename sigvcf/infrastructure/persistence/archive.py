@@ -0,0 +1,262 @@
+import datetime
+import logging
+import os
+import sqlite3
+from typing import Dict, List, Sequence, Tuple
+
+from sqlalchemy import MetaData, Table, and_, create_engine, delete, exists, insert, or_, select, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+from sigvcf.core.domain.models import (
+    DDL_MOVIMIENTOS_SIN_DELETE, TRIGGER_MOVIMIENTOS_SIN_DELETE, ArticuloContrato, Contrato, CorteInventario,
+    EntradaBodega, MovimientoInventario, OrdenDeCompra, ProgramacionMensual, Proveedor, RegistroContable,
+    ReporteIncumplimiento,
+)
+from sigvcf.infrastructure.persistence.engine import ENGINE_PROFILES, DEFAULT_PROFILE, apply_sqlite_pragmas
+
+logger = logging.getLogger(__name__)
+
+_ESQUEMA = "archivo"
+# PRAGMAs del perfil que tienen sentido en una conexión de solo lectura.
+_PRAGMAS_LECTURA = ("cache_size", "mmap_size", "temp_store", "busy_timeout")
+# Estados finales: un contrato solo se archiva si todas sus órdenes y reportes ya terminaron.
+_ORDEN_TERMINADA = 'PAGO_EN_TRAMITE'
+_REPORTE_TERMINADO = 'RESUELTO'
+# Contratos por lote: acota el tamaño de cada transacción y el número de parámetros IN.
+_LOTE = 200
+
+
+class ArchiveService:
+    """
+    Archivo histórico de contratos cerrados en un archivo SQLite aparte.
+
+    `archivar()` mueve el grafo de cada contrato cerrado: sus artículos, programaciones,
+    movimientos y cortes de inventario, órdenes de compra, entradas de bodega, registros
+    contables y reportes de incumplimiento.
+    Un contrato está cerrado si su `fecha_fin` tiene más de `retention_days` días, todas sus
+    órdenes están en 'PAGO_EN_TRAMITE' y todos sus reportes están 'RESUELTO'. Los proveedores
+    de esos contratos se copian, pero no se eliminan de la base principal.
+
+    El movimiento se hace con el archivo adjunto (ATTACH) a una conexión de la base
+    principal, en dos transacciones: primero se copia al archivo y se confirma; después se
+    eliminan de la base principal solo las filas que ya están en el archivo. Con la base en
+    WAL una transacción sobre dos archivos no es atómica en conjunto; con este orden una
+    caída a mitad deja filas duplicadas, nunca perdidas, y la siguiente corrida termina el
+    movimiento.
+
+    Las tablas que se eliminan de la base principal tienen AUTOINCREMENT, así que un id
+    archivado no vuelve a entregarse. Cada corrida además lleva sqlite_sequence por encima
+    de los ids ya archivados (bases migradas después de haber archivado) y falla, en lugar
+    de reemplazar, si un id del lote ya está en el archivo con otro contenido.
+
+    Las consultas históricas abren el archivo en modo de solo lectura, bajo demanda, con
+    `engine` (ver SqlAlchemyUnitOfWork.readonly(archive=True)).
+    """
+    def __init__(
+        self,
+        source_engine: Engine,
+        path: str = "sigvcf_archivo.db",
+        enabled: bool = False,
+        retention_days: int = 365,
+        profile: str = DEFAULT_PROFILE,
+    ):
+        self.source_engine = source_engine
+        self.path = path
+        self.enabled = enabled
+        self.retention_days = retention_days
+        self._pragmas = {k: v for k, v in ENGINE_PROFILES[profile].items() if k in _PRAGMAS_LECTURA}
+        self._engine: Engine | None = None
+
+        metadata = MetaData()
+        self._tablas = [
+            modelo.__table__ for modelo in (
+                Proveedor, Contrato, ArticuloContrato, ProgramacionMensual, MovimientoInventario,
+                CorteInventario, OrdenDeCompra, EntradaBodega, RegistroContable, ReporteIncumplimiento,
+            )
+        ]
+        # Las mismas tablas calificadas con el esquema del archivo adjunto.
+        self._en_archivo = {t.name: t.to_metadata(metadata, schema=_ESQUEMA) for t in self._tablas}
+
+    @property
+    def available(self) -> bool:
+        """Hay archivo histórico que consultar."""
+        return self.enabled and os.path.exists(self.path)
+
+    def stop(self) -> None:
+        if self._engine is not None:
+            self._engine.dispose()
+
+    # --- Lectura ---
+
+    @property
+    def engine(self) -> Engine:
+        """Motor de solo lectura sobre el archivo; la primera conexión se abre al consultarlo."""
+        if self._engine is None:
+            uri = f"file:{os.path.abspath(self.path)}?mode=ro"
+            self._engine = create_engine(
+                "sqlite://",
+                creator=lambda: sqlite3.connect(uri, uri=True, check_same_thread=False),
+                poolclass=QueuePool,
+            )
+            apply_sqlite_pragmas(self._engine, self._pragmas)
+        return self._engine
+
+    # --- Movimiento al archivo ---
+
+    def archivar(self, hasta: datetime.date | None = None) -> Dict[str, int]:
+        """
+        Mueve al archivo los contratos cerrados cuya `fecha_fin` es anterior a `hasta`
+        (por defecto, hoy menos `retention_days`). Devuelve las filas movidas por tabla.
+        """
+        if not self.enabled:
+            raise RuntimeError("El archivo histórico no está habilitado (config.db.archive.enabled).")
+        hasta = hasta or datetime.date.today() - datetime.timedelta(days=self.retention_days)
+        self._preparar_archivo()
+
+        movidas: Dict[str, int] = {}
+        with self.source_engine.connect() as conn:
+            dbapi_connection = conn.connection.dbapi_connection
+            # ATTACH no puede ejecutarse dentro de una transacción: va antes del BEGIN.
+            dbapi_connection.execute(f"ATTACH DATABASE ? AS {_ESQUEMA}", (os.path.abspath(self.path),))
+            try:
+                with conn.begin():
+                    self._ajustar_secuencias(conn)
+                    contratos = self._contratos_cerrados(conn, hasta)
+                for inicio in range(0, len(contratos), _LOTE):
+                    lote = contratos[inicio:inicio + _LOTE]
+                    with conn.begin():
+                        self._verificar_conflictos(conn, lote)
+                        for tabla, condicion in self._grafo(lote):
+                            conn.execute(
+                                insert(self._en_archivo[tabla.name])
+                                .prefix_with("OR REPLACE")
+                                .from_select([c.name for c in tabla.c], select(*tabla.c).where(condicion))
+                            )
+                    with conn.begin():
+                        # Hijos antes que padres: las condiciones de los hijos leen a sus padres.
+                        for tabla, condicion in reversed(self._grafo(lote)):
+                            if tabla is Proveedor.__table__:
+                                continue
+                            clave = tuple_(*tabla.primary_key.columns)
+                            archivadas = select(*self._en_archivo[tabla.name].primary_key.columns)
+                            eliminar = delete(tabla).where(condicion, clave.in_(archivadas))
+                            if tabla is MovimientoInventario.__table__:
+                                resultado = self._eliminar_movimientos(conn, eliminar)
+                            else:
+                                resultado = conn.execute(eliminar)
+                            movidas[tabla.name] = movidas.get(tabla.name, 0) + resultado.rowcount
+            finally:
+                dbapi_connection.execute(f"DETACH DATABASE {_ESQUEMA}")
+
+        if movidas:
+            logger.info(f"Archivados {movidas.get('contrato', 0)} contratos cerrados antes de {hasta}: {movidas}")
+        return movidas
+
+    @staticmethod
+    def _eliminar_movimientos(conn, eliminar):
+        """
+        El libro de movimientos rechaza DELETE con un trigger. Los movimientos ya copiados al
+        archivo se eliminan quitándolo y volviéndolo a crear en la misma transacción: en SQLite
+        el DDL es transaccional, así que ninguna otra conexión ve la tabla sin el trigger.
+        """
+        conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {TRIGGER_MOVIMIENTOS_SIN_DELETE}")
+        resultado = conn.execute(eliminar)
+        conn.exec_driver_sql(DDL_MOVIMIENTOS_SIN_DELETE)
+        return resultado
+
+    def _ajustar_secuencias(self, conn) -> None:
+        """
+        Lleva el contador de AUTOINCREMENT de cada tabla al menos al id más alto ya archivado,
+        para que la base principal no entregue un id que el archivo ya tiene.
+        """
+        if not conn.exec_driver_sql("SELECT 1 FROM main.sqlite_master WHERE name = 'sqlite_sequence'").first():
+            return
+        for tabla in self._tablas:
+            if not tabla.dialect_options['sqlite']['autoincrement']:
+                continue
+            archivado = conn.exec_driver_sql(f"SELECT MAX(id) FROM {_ESQUEMA}.{tabla.name}").scalar()
+            if archivado is None:
+                continue
+            actualizado = conn.exec_driver_sql(
+                "UPDATE main.sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (archivado, tabla.name)
+            )
+            if not actualizado.rowcount:
+                conn.exec_driver_sql(
+                    "INSERT INTO main.sqlite_sequence (name, seq) VALUES (?, ?)", (tabla.name, archivado)
+                )
+
+    def _verificar_conflictos(self, conn, contratos: Sequence[int]) -> None:
+        """
+        Falla si una fila del lote ya está en el archivo con el mismo id y otro contenido: es
+        un id reutilizado, y reemplazarla perdería la fila archivada. Una fila idéntica es la
+        copia de una corrida interrumpida y se vuelve a copiar sin problema. Los proveedores
+        no se eliminan de la base principal y su copia se actualiza en cada corrida.
+        """
+        for tabla, condicion in self._grafo(contratos):
+            if tabla is Proveedor.__table__:
+                continue
+            archivada = self._en_archivo[tabla.name].alias("archivada")
+            conflicto = conn.execute(
+                select(*tabla.primary_key.columns)
+                .join(archivada, and_(*(c == archivada.c[c.name] for c in tabla.primary_key.columns)))
+                .where(condicion, or_(*(c.is_distinct_from(archivada.c[c.name]) for c in tabla.c)))
+                .limit(1)
+            ).first()
+            if conflicto:
+                raise RuntimeError(
+                    f"La fila {tuple(conflicto)} de {tabla.name} ya está en el archivo con otro contenido "
+                    f"(id reutilizado); no se archiva para no reemplazarla."
+                )
+
+    def _preparar_archivo(self) -> None:
+        """Crea en el archivo las tablas que faltan, con sus índices, en modo de diario DELETE."""
+        engine = create_engine(f"sqlite:///{self.path}")
+        try:
+            with engine.begin() as conn:
+                # Sin WAL el archivo puede abrirse con mode=ro sin necesitar el -shm.
+                conn.exec_driver_sql("PRAGMA journal_mode=DELETE")
+            # Copias de las tablas: to_metadata() no copia los DDL de after_create, así que el
+            # archivo no recibe los triggers de programacion_dia ni los índices de búsqueda.
+            # Se copia todo el esquema para que resuelvan las claves foráneas (p. ej. a usuario).
+            metadata = MetaData()
+            for tabla in self._tablas[0].metadata.sorted_tables:
+                tabla.to_metadata(metadata)
+            metadata.create_all(engine, tables=[metadata.tables[t.name] for t in self._tablas])
+        finally:
+            engine.dispose()
+
+    @staticmethod
+    def _contratos_cerrados(conn, hasta: datetime.date) -> List[int]:
+        orden_abierta = exists().where(
+            OrdenDeCompra.contrato_id == Contrato.id, OrdenDeCompra.estado != _ORDEN_TERMINADA
+        )
+        reporte_abierto = exists().where(
+            ReporteIncumplimiento.contrato_id == Contrato.id, ReporteIncumplimiento.estado != _REPORTE_TERMINADO
+        )
+        return list(conn.execute(
+            select(Contrato.id)
+            .where(Contrato.fecha_fin < hasta, ~orden_abierta, ~reporte_abierto)
+            .order_by(Contrato.id)
+        ).scalars())
+
+    @staticmethod
+    def _grafo(contratos: Sequence[int]) -> List[Tuple[Table, object]]:
+        """Tablas del grafo de los contratos, de padres a hijos, con la condición de cada una."""
+        articulos = select(ArticuloContrato.id).where(ArticuloContrato.contrato_id.in_(contratos))
+        ordenes = select(OrdenDeCompra.id).where(OrdenDeCompra.contrato_id.in_(contratos))
+        entradas = select(EntradaBodega.id).where(EntradaBodega.orden_compra_id.in_(ordenes))
+        return [
+            (Proveedor.__table__, Proveedor.id.in_(select(Contrato.proveedor_id).where(Contrato.id.in_(contratos)))),
+            (Contrato.__table__, Contrato.id.in_(contratos)),
+            (ArticuloContrato.__table__, ArticuloContrato.contrato_id.in_(contratos)),
+            (ProgramacionMensual.__table__, ProgramacionMensual.articulo_contrato_id.in_(articulos)),
+            # El libro y los cortes viajan con sus artículos: si quedaran en la base principal
+            # apuntarían a ids de artículo que pueden reutilizarse.
+            (MovimientoInventario.__table__, MovimientoInventario.articulo_contrato_id.in_(articulos)),
+            (CorteInventario.__table__, CorteInventario.articulo_contrato_id.in_(articulos)),
+            (OrdenDeCompra.__table__, OrdenDeCompra.contrato_id.in_(contratos)),
+            (EntradaBodega.__table__, EntradaBodega.orden_compra_id.in_(ordenes)),
+            (RegistroContable.__table__, RegistroContable.entrada_bodega_id.in_(entradas)),
+            (ReporteIncumplimiento.__table__, ReporteIncumplimiento.contrato_id.in_(contratos)),
+        ]
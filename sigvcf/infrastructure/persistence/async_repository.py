@@ -0,0 +1,91 @@
+from typing import Any, AsyncIterator, Dict, List, Mapping, Sequence, Tuple, Type
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from sigvcf.infrastructure.persistence.repository import D, RepositoryStatements, T
+from sigvcf.infrastructure.persistence.rows import DTORow, build_rows
+
+
+class AsyncSQLAlchemyRepository(RepositoryStatements[T]):
+    """
+    Versión asíncrona de SQLAlchemyRepository sobre AsyncSession.
+    Comparte la construcción de sentencias con la implementación síncrona; cada método
+    tiene la misma semántica que su homónimo síncrono, pero se espera con `await`.
+    """
+    def __init__(self, session: AsyncSession, model: Type[T]):
+        self.session = session
+        self.model = model
+
+    def add(self, model: T) -> None:
+        # AsyncSession.add no hace E/S: la escritura ocurre en el flush/commit.
+        self.session.add(model)
+
+    async def get(self, id) -> T | None:
+        return await self.session.get(self.model, id)
+
+    async def list(self) -> List[T]:
+        return list((await self.session.execute(select(self.model))).scalars())
+
+    async def find(self, **kwargs) -> List[T]:
+        return list((await self.session.execute(select(self.model).filter_by(**kwargs))).scalars())
+
+    async def find_one_by(self, **kwargs) -> T | None:
+        resultado = await self.session.execute(select(self.model).filter_by(**kwargs))
+        return resultado.scalars().one_or_none()
+
+    async def list_page(self, after_key: Any = None, limit: int = 100, order_by: str = "id", **kwargs) -> List[T]:
+        stmt = self._page_statement(after_key, limit, order_by, **kwargs)
+        return list((await self.session.execute(stmt)).scalars())
+
+    async def iter_batches(self, batch_size: int = 1000, **kwargs) -> AsyncIterator[List[T]]:
+        """Lee el cursor en lotes con stream(); se recorre con `async for`."""
+        resultado = await self.session.stream(self._batches_statement(batch_size, **kwargs))
+        async for lote in resultado.scalars().partitions():
+            yield list(lote)
+
+    async def add_many(self, rows: Sequence[Dict[str, Any]], returning: bool = False) -> List[T] | None:
+        if not rows:
+            return [] if returning else None
+        if returning:
+            return list(await self.session.scalars(insert(self.model).returning(self.model), list(rows)))
+        await self.session.execute(insert(self.model), list(rows))
+        return None
+
+    async def upsert_many(self, rows: Sequence[Dict[str, Any]], conflict_keys: Sequence[str],
+                          update_columns: Sequence[str] | None = None) -> None:
+        if not rows:
+            return
+        dialecto = self.session.get_bind().dialect.name
+        stmt = self._upsert_statement(dialecto, rows, conflict_keys, update_columns)
+        await self.session.execute(stmt, list(rows))
+
+    async def update_many(self, rows: Sequence[Dict[str, Any]]) -> None:
+        if rows:
+            await self.session.execute(update(self.model), list(rows))
+
+    async def project(self, dto_class: Type[D], *criteria, columns: Mapping[str, Any] | None = None,
+                      joins: Sequence[Any] = (), order_by: Any = None) -> List[D]:
+        stmt, nombres = self._projection_statement(dto_class, criteria, columns, joins, order_by)
+        construir = dto_class.model_construct
+        return [construir(**dict(zip(nombres, fila))) for fila in await self.session.execute(stmt)]
+
+    async def project_rows(self, dto_class: Type[D], *criteria, columns: Mapping[str, Any] | None = None,
+                           joins: Sequence[Any] = (), order_by: Any = None) -> List[DTORow[D]]:
+        stmt, nombres = self._projection_statement(dto_class, criteria, columns, joins, order_by)
+        return build_rows(dto_class, nombres, (await self.session.execute(stmt)).tuples())
+
+    async def project_rows_page(self, dto_class: Type[D], *criteria, after_key: Any = None, limit: int = 100,
+                                columns: Mapping[str, Any] | None = None,
+                                joins: Sequence[Any] = ()) -> Tuple[List[DTORow[D]], Any]:
+        stmt, nombres = self._projection_page_statement(dto_class, criteria, columns, joins, after_key, limit)
+        return self._split_page(dto_class, nombres, (await self.session.execute(stmt)).tuples().all(), limit)
+
+    async def transition(self, key: Any, from_state: str | Sequence[str], to_state: str, *criteria,
+                         by: str = "id", column: str = "estado", **values) -> bool:
+        stmt = self._transition_statement(key, from_state, to_state, criteria, by, column, values)
+        return (await self.session.execute(stmt)).rowcount == 1
+
+    async def increment(self, key: Any, *criteria, by: str = "id", **deltas) -> bool:
+        stmt = self._increment_statement(key, criteria, by, deltas)
+        return (await self.session.execute(stmt)).rowcount == 1
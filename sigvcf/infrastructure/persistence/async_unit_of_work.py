@@ -0,0 +1,269 @@
+import abc
+import asyncio
+import contextlib
+import contextvars
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction, async_sessionmaker
+
+from sigvcf.core.domain.models import (
+    ArticuloContrato, Contrato, CorteInventario, EntradaBodega, MovimientoInventario, OrdenDeCompra,
+    ProgramacionMensual, Proveedor, RegistroContable, ReporteIncumplimiento, Rol, SalidaRequerimiento, Usuario,
+)
+from sigvcf.infrastructure.persistence.async_repository import AsyncSQLAlchemyRepository
+from sigvcf.infrastructure.persistence.instrumentation import SqlInstrumentation
+from sigvcf.infrastructure.persistence.snapshot import SnapshotService
+
+_contador_uow = itertools.count()
+
+
+class IAsyncUnitOfWork(abc.ABC):
+    """
+    Interfaz abstracta de la Unidad de Trabajo asíncrona: mismas reglas que IUnitOfWork,
+    pero se usa con `async with` y sus repositorios se esperan con `await`.
+    """
+
+    @property
+    @abc.abstractmethod
+    def session(self) -> AsyncSession:
+        raise NotImplementedError
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, traceback):
+        if exc_type:
+            await self.rollback()
+        else:
+            await self.commit()
+
+    @abc.abstractmethod
+    async def commit(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    async def rollback(self):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def readonly(self, report: bool = False):
+        """Async context manager de solo consulta (ver IUnitOfWork.readonly)."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def repository(self, model: type) -> AsyncSQLAlchemyRepository:
+        raise NotImplementedError
+
+    @property
+    def roles(self) -> AsyncSQLAlchemyRepository[Rol]:
+        return self.repository(Rol)
+
+    @property
+    def usuarios(self) -> AsyncSQLAlchemyRepository[Usuario]:
+        return self.repository(Usuario)
+
+    @property
+    def proveedores(self) -> AsyncSQLAlchemyRepository[Proveedor]:
+        return self.repository(Proveedor)
+
+    @property
+    def contratos(self) -> AsyncSQLAlchemyRepository[Contrato]:
+        return self.repository(Contrato)
+
+    @property
+    def articulos_contrato(self) -> AsyncSQLAlchemyRepository[ArticuloContrato]:
+        return self.repository(ArticuloContrato)
+
+    @property
+    def programaciones_mensuales(self) -> AsyncSQLAlchemyRepository[ProgramacionMensual]:
+        return self.repository(ProgramacionMensual)
+
+    @property
+    def salidas_requerimiento(self) -> AsyncSQLAlchemyRepository[SalidaRequerimiento]:
+        return self.repository(SalidaRequerimiento)
+
+    @property
+    def ordenes_de_compra(self) -> AsyncSQLAlchemyRepository[OrdenDeCompra]:
+        return self.repository(OrdenDeCompra)
+
+    @property
+    def entradas_bodega(self) -> AsyncSQLAlchemyRepository[EntradaBodega]:
+        return self.repository(EntradaBodega)
+
+    @property
+    def reportes_incumplimiento(self) -> AsyncSQLAlchemyRepository[ReporteIncumplimiento]:
+        return self.repository(ReporteIncumplimiento)
+
+    @property
+    def registros_contables(self) -> AsyncSQLAlchemyRepository[RegistroContable]:
+        return self.repository(RegistroContable)
+
+    @property
+    def movimientos_inventario(self) -> AsyncSQLAlchemyRepository[MovimientoInventario]:
+        return self.repository(MovimientoInventario)
+
+    @property
+    def cortes_inventario(self) -> AsyncSQLAlchemyRepository[CorteInventario]:
+        return self.repository(CorteInventario)
+
+
+@dataclass
+class _AmbitoAsync:
+    """Estado de la Unidad de Trabajo para una tarea asyncio."""
+    tarea: asyncio.Task | None
+    session: AsyncSession
+    readonly: bool = False
+    depth: int = 0
+    savepoints: List[AsyncSessionTransaction] = field(default_factory=list)
+    repositories: Dict[type, AsyncSQLAlchemyRepository] = field(default_factory=dict)
+    token: contextvars.Token | None = None
+    instrumentation_token: object = None
+
+
+class SqlAlchemyAsyncUnitOfWork(IAsyncUnitOfWork):
+    """
+    Unidad de Trabajo sobre AsyncSession.
+
+    Una misma instancia sirve a varias tareas asyncio concurrentes: cada tarea que abre un
+    ámbito obtiene su propia AsyncSession (una AsyncSession no admite uso concurrente), de
+    modo que `asyncio.gather()` de dos casos de uso ejecuta dos transacciones en paralelo.
+    Dentro de una misma tarea es reentrante como SqlAlchemyUnitOfWork (SAVEPOINT).
+    """
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        instrumentation: SqlInstrumentation | None = None,
+        snapshot: SnapshotService | None = None,
+        report_session_factory: async_sessionmaker | None = None,
+    ):
+        self.session_factory = session_factory
+        self.instrumentation = instrumentation
+        self.snapshot = snapshot
+        self.report_session_factory = report_session_factory
+        self._ambito: contextvars.ContextVar[_AmbitoAsync | None] = contextvars.ContextVar(
+            f"sigvcf_async_uow_{next(_contador_uow)}", default=None
+        )
+
+    def _ambito_actual(self) -> _AmbitoAsync | None:
+        """
+        Ámbito abierto por la tarea actual. Una tarea hija hereda el contexto de su padre,
+        pero no debe compartir su sesión: para ella el ámbito heredado no cuenta.
+        """
+        ambito = self._ambito.get()
+        if ambito is not None and ambito.tarea is asyncio.current_task():
+            return ambito
+        return None
+
+    @property
+    def session(self) -> AsyncSession:
+        ambito = self._ambito_actual()
+        if ambito is None:
+            raise RuntimeError("La Unidad de Trabajo asíncrona no tiene un ámbito abierto en esta tarea.")
+        return ambito.session
+
+    def _abrir(self, readonly: bool, fabrica: async_sessionmaker | None = None, **session_kwargs) -> _AmbitoAsync:
+        fabrica = fabrica or self.session_factory
+        ambito = _AmbitoAsync(asyncio.current_task(), fabrica(**session_kwargs), readonly=readonly, depth=1)
+        if self.instrumentation is not None:
+            ambito.instrumentation_token = self.instrumentation.begin_scope()
+        ambito.token = self._ambito.set(ambito)
+        return ambito
+
+    async def _cerrar(self, ambito: _AmbitoAsync) -> None:
+        try:
+            await ambito.session.close()
+        finally:
+            self._ambito.reset(ambito.token)
+            if self.instrumentation is not None:
+                self.instrumentation.end_scope(ambito.instrumentation_token)
+
+    async def __aenter__(self):
+        ambito = self._ambito_actual()
+        if ambito is None:
+            self._abrir(readonly=False)
+        else:
+            ambito.savepoints.append(await ambito.session.begin_nested())
+            ambito.depth += 1
+        return await super().__aenter__()
+
+    async def __aexit__(self, exc_type, exc_val, traceback):
+        ambito = self._ambito_actual()
+        anidado = ambito.depth > 1
+        try:
+            await super().__aexit__(exc_type, exc_val, traceback)
+            if anidado and ambito.savepoints[-1].is_active:
+                await ambito.savepoints[-1].commit()
+        except Exception:
+            if anidado and ambito.savepoints[-1].is_active:
+                await ambito.savepoints[-1].rollback()
+            raise
+        finally:
+            if anidado:
+                ambito.savepoints.pop()
+            ambito.depth -= 1
+            if ambito.depth == 0:
+                await self._cerrar(ambito)
+
+    async def commit(self):
+        ambito = self._ambito_actual()
+        if ambito.readonly:
+            raise RuntimeError("No se puede confirmar una Unidad de Trabajo de solo lectura.")
+        if ambito.depth > 1:
+            await ambito.session.flush()
+        else:
+            await ambito.session.commit()
+            if self.snapshot is not None:
+                self.snapshot.mark_written()
+
+    async def rollback(self):
+        ambito = self._ambito_actual()
+        if ambito.depth > 1:
+            if ambito.savepoints[-1].is_active:
+                await ambito.savepoints[-1].rollback()
+        else:
+            await ambito.session.rollback()
+
+    @contextlib.asynccontextmanager
+    async def readonly(self, report: bool = False):
+        """
+        Transacción de lectura sin autoflush con PRAGMA query_only en SQLite, como
+        SqlAlchemyUnitOfWork.readonly(). Dentro de un ámbito abierto se une a él.
+        """
+        if self._ambito_actual() is not None:
+            yield self
+            return
+
+        usar_copia = (
+            report
+            and self.snapshot is not None
+            and self.report_session_factory is not None
+            and self.snapshot.is_fresh()
+        )
+        fabrica = self.report_session_factory if usar_copia else None
+        ambito = self._abrir(readonly=True, fabrica=fabrica, autoflush=False, expire_on_commit=False)
+        session = ambito.session
+        es_sqlite = False
+        try:
+            connection = await session.connection()
+            es_sqlite = connection.dialect.name == "sqlite"
+            if es_sqlite:
+                await connection.exec_driver_sql("PRAGMA query_only = ON")
+            yield self
+        finally:
+            try:
+                if es_sqlite:
+                    # La conexión vuelve al pool: se restablece antes de soltarla.
+                    await connection.exec_driver_sql("PRAGMA query_only = OFF")
+                await session.rollback()
+            finally:
+                await self._cerrar(ambito)
+
+    def repository(self, model: type) -> AsyncSQLAlchemyRepository:
+        ambito = self._ambito_actual()
+        if ambito is None:
+            raise RuntimeError("La Unidad de Trabajo asíncrona no tiene un ámbito abierto en esta tarea.")
+        if model not in ambito.repositories:
+            ambito.repositories[model] = AsyncSQLAlchemyRepository(ambito.session, model)
+        return ambito.repositories[model]
@@ -0,0 +1,140 @@
+import logging
+from typing import Any, Dict
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+logger = logging.getLogger(__name__)
+
+# Perfiles de PRAGMAs aplicados a cada conexión SQLite nueva.
+# - "legacy": comportamiento por defecto de SQLite (rollback journal, synchronous=FULL).
+# - "concurrent": WAL para que los lectores no bloqueen a los escritores; perfil recomendado
+#   cuando varios usuarios de almacén y finanzas trabajan en paralelo.
+# - "durable": WAL conservando synchronous=FULL para instalaciones sin respaldo de energía.
+ENGINE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "legacy": {},
+    "concurrent": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,       # Negativo = KiB (~64 MB de caché de páginas)
+        "mmap_size": 268435456,     # 256 MB mapeados en memoria
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,       # ms de espera ante un bloqueo antes de fallar
+    },
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -32000,
+        "mmap_size": 134217728,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+
+DEFAULT_PROFILE = "concurrent"
+
+# journal_mode debe ir primero: el resto de PRAGMAs no depende de él, pero
+# cambiar el modo de journal requiere que no haya una transacción abierta.
+_PRAGMA_ORDER = ("journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size", "temp_store")
+
+
+def resolve_profile(profile: str, overrides: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """
+    Devuelve los PRAGMAs del perfil indicado, combinados con los valores de `overrides`.
+    Un override con valor None elimina el PRAGMA del perfil.
+    """
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f"Perfil de motor '{profile}' desconocido. Opciones: {', '.join(ENGINE_PROFILES)}.")
+
+    pragmas = dict(ENGINE_PROFILES[profile])
+    for nombre, valor in (overrides or {}).items():
+        if nombre not in _PRAGMA_ORDER:
+            raise ValueError(f"PRAGMA '{nombre}' no soportado por el perfil de motor.")
+        if valor is None:
+            pragmas.pop(nombre, None)
+        else:
+            pragmas[nombre] = valor
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: Engine, pragmas: Dict[str, Any]) -> None:
+    """
+    Registra un listener 'connect' que ejecuta los PRAGMAs en cada conexión DBAPI nueva.
+    """
+    if not pragmas:
+        return
+
+    sentencias = [f"PRAGMA {nombre}={pragmas[nombre]}" for nombre in _PRAGMA_ORDER if nombre in pragmas]
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for sentencia in sentencias:
+                cursor.execute(sentencia)
+        finally:
+            cursor.close()
+
+
+def enable_sqlite_transactions(engine: Engine) -> None:
+    """
+    pysqlite no emite BEGIN hasta la primera escritura, con lo que un SAVEPOINT puede abrir
+    la transacción por su cuenta y su RELEASE confirmaría todo. Se desactiva ese manejo del
+    driver y SQLAlchemy emite BEGIN al iniciar cada transacción (receta de la documentación
+    de SQLAlchemy para SQLite).
+    """
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+def create_sqlite_engine(
+    url: str,
+    profile: str = DEFAULT_PROFILE,
+    echo: bool = False,
+    pragma_overrides: Dict[str, Any] | None = None,
+) -> Engine:
+    """
+    Crea el motor SQLAlchemy de la aplicación aplicando el perfil de rendimiento indicado.
+    Para URLs que no son SQLite se crea un motor estándar sin PRAGMAs.
+    """
+    engine = create_engine(url, echo=echo)
+    if engine.dialect.name != "sqlite":
+        return engine
+
+    pragmas = resolve_profile(profile, pragma_overrides)
+    apply_sqlite_pragmas(engine, pragmas)
+    enable_sqlite_transactions(engine)
+    logger.info(f"Motor SQLite creado con el perfil '{profile}': {pragmas}")
+    return engine
+
+
+def create_async_sqlite_engine(
+    url: str,
+    profile: str = DEFAULT_PROFILE,
+    echo: bool = False,
+    pragma_overrides: Dict[str, Any] | None = None,
+) -> AsyncEngine:
+    """
+    Motor asíncrono para la Unidad de Trabajo async. Una URL 'sqlite:///...' se abre con el
+    driver aiosqlite y recibe el mismo perfil de PRAGMAs y el mismo manejo de transacciones
+    que el motor síncrono (los listeners se registran sobre su sync_engine).
+    """
+    url_async = make_url(url)
+    if url_async.get_backend_name() == "sqlite" and url_async.get_driver_name() != "aiosqlite":
+        url_async = url_async.set(drivername="sqlite+aiosqlite")
+
+    engine = create_async_engine(url_async, echo=echo)
+    if engine.dialect.name != "sqlite":
+        return engine
+
+    pragmas = resolve_profile(profile, pragma_overrides)
+    apply_sqlite_pragmas(engine.sync_engine, pragmas)
+    enable_sqlite_transactions(engine.sync_engine)
+    logger.info(f"Motor SQLite asíncrono creado con el perfil '{profile}': {pragmas}")
+    return engine
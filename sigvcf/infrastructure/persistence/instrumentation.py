@@ -0,0 +1,245 @@
+import contextvars
+import logging
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Pila de ámbitos de Unidad de Trabajo activos en el contexto actual (hilo o tarea asyncio).
+_ambitos_activos: contextvars.ContextVar[tuple] = contextvars.ContextVar("sigvcf_sql_ambitos", default=())
+
+
+def caller_service_method(frame=None) -> str | None:
+    """
+    Devuelve 'Servicio.metodo' del método de servicio (sigvcf.*.services) más cercano en la
+    pila de llamadas. Se prefieren los métodos públicos sobre los auxiliares con '_'.
+    """
+    frame = frame or sys._getframe(1)
+    auxiliar = None
+    while frame is not None:
+        modulo = frame.f_globals.get("__name__", "")
+        if modulo.startswith("sigvcf.") and modulo.endswith(".services"):
+            instancia = frame.f_locals.get("self")
+            clase = type(instancia).__name__ if instancia is not None else modulo
+            etiqueta = f"{clase}.{frame.f_code.co_name}"
+            if not frame.f_code.co_name.startswith("_"):
+                return etiqueta
+            auxiliar = auxiliar or etiqueta
+        frame = frame.f_back
+    return auxiliar
+
+
+@dataclass
+class QueryStats:
+    """Estadísticas acumuladas de las sentencias SQL de un ámbito o método de servicio."""
+    statements: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+    rows: int = 0
+    sql_counts: Counter = field(default_factory=Counter)
+
+    def record(self, sql: str, duracion: float, filas: int) -> None:
+        self.statements += 1
+        self.total_time += duracion
+        self.max_time = max(self.max_time, duracion)
+        self.rows += filas
+        self.sql_counts[sql] += 1
+
+    def repeated(self, threshold: int) -> Dict[str, int]:
+        return {sql: n for sql, n in self.sql_counts.items() if n >= threshold}
+
+    def copy(self) -> "QueryStats":
+        return QueryStats(self.statements, self.total_time, self.max_time, self.rows, Counter(self.sql_counts))
+
+    def __str__(self) -> str:
+        return (
+            f"{self.statements} sentencias, {self.total_time * 1000:.1f} ms total, "
+            f"máx {self.max_time * 1000:.1f} ms, {self.rows} filas"
+        )
+
+
+@dataclass
+class ScopeReport:
+    """Resultado de un ámbito de Unidad de Trabajo terminado."""
+    label: str
+    stats: QueryStats
+    n_plus_one: Dict[str, int]
+
+
+@dataclass
+class _Ambito:
+    label: str
+    stats: QueryStats = field(default_factory=QueryStats)
+
+
+class SqlInstrumentation:
+    """
+    Instrumentación opcional de las sentencias SQL del motor.
+
+    Registra cantidad de sentencias, tiempo total y máximo, y filas (afectadas por DML o
+    leídas del cursor) por ámbito de Unidad de Trabajo y por método de servicio. Las filas
+    leídas se cuentan al extraerlas del cursor, así que incluyen las proyecciones y
+    agregados de Core, no solo las entidades del ORM.
+    Una misma sentencia repetida `n_plus_one_threshold` veces dentro de un ámbito se
+    reporta como patrón N+1.
+    """
+    def __init__(
+        self,
+        engine: Engine | None = None,
+        enabled: bool = True,
+        n_plus_one_threshold: int = 5,
+        log_summary: bool = False,
+        history: int = 200,
+    ):
+        self.enabled = enabled
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.log_summary = log_summary
+        self._lock = threading.Lock()
+        self._por_metodo: Dict[str, QueryStats] = {}
+        self._historial: Deque[ScopeReport] = deque(maxlen=history)
+        self._engines: List[Engine] = []
+        if engine is not None and enabled:
+            self.install(engine)
+
+    # --- Registro en el motor ---
+
+    def install(self, engine: Engine) -> None:
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.append(engine)
+
+    def uninstall(self) -> None:
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.clear()
+
+    # --- Ámbitos (los abre y cierra SqlAlchemyUnitOfWork) ---
+
+    def begin_scope(self, label: str | None = None):
+        """Abre un ámbito de medición; devuelve el token que debe pasarse a end_scope()."""
+        if not self.enabled:
+            return None
+        ambito = _Ambito(label or caller_service_method() or "<sin servicio>")
+        return _ambitos_activos.set(_ambitos_activos.get() + (ambito,))
+
+    def end_scope(self, token) -> ScopeReport | None:
+        if token is None:
+            return None
+        ambito = _ambitos_activos.get()[-1]
+        _ambitos_activos.reset(token)
+
+        reporte = ScopeReport(ambito.label, ambito.stats, ambito.stats.repeated(self.n_plus_one_threshold))
+        with self._lock:
+            self._historial.append(reporte)
+
+        for sql, veces in reporte.n_plus_one.items():
+            logger.warning(f"Posible N+1 en {reporte.label}: sentencia repetida {veces} veces: {sql[:200]}")
+        if self.log_summary:
+            logger.info(f"SQL [{reporte.label}]: {reporte.stats}")
+        return reporte
+
+    # --- Consulta de estadísticas ---
+
+    def stats_by_method(self) -> Dict[str, QueryStats]:
+        with self._lock:
+            return {metodo: stats.copy() for metodo, stats in self._por_metodo.items()}
+
+    def recent_scopes(self) -> List[ScopeReport]:
+        with self._lock:
+            return list(self._historial)
+
+    def n_plus_one_findings(self) -> List[ScopeReport]:
+        return [reporte for reporte in self.recent_scopes() if reporte.n_plus_one]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._por_metodo.clear()
+            self._historial.clear()
+
+    def summary(self) -> str:
+        """Resumen legible por método de servicio, ordenado por tiempo total."""
+        # El marcador N+1 sale de los ámbitos: los acumulados por método suman llamadas distintas.
+        n_plus_one: Dict[str, int] = {}
+        for reporte in self.n_plus_one_findings():
+            n_plus_one[reporte.label] = max(n_plus_one.get(reporte.label, 0), *reporte.n_plus_one.values())
+        lineas = []
+        for metodo, stats in sorted(self.stats_by_method().items(), key=lambda par: -par[1].total_time):
+            marca = f"  [N+1: {n_plus_one[metodo]}x]" if metodo in n_plus_one else ""
+            lineas.append(f"{metodo}: {stats}{marca}")
+        return "\n".join(lineas)
+
+    # --- Listeners ---
+
+    def _registrar(self, sql: str, duracion: float, filas: int) -> List[QueryStats]:
+        """Anota la sentencia y devuelve las estadísticas a las que se suman sus filas leídas."""
+        metodo = caller_service_method() or "<sin servicio>"
+        with self._lock:
+            por_metodo = self._por_metodo.setdefault(metodo, QueryStats())
+            por_metodo.record(sql, duracion, filas)
+        destinos = [por_metodo]
+        for ambito in _ambitos_activos.get():
+            ambito.stats.record(sql, duracion, filas)
+            destinos.append(ambito.stats)
+        return destinos
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sigvcf_inicio_sentencia", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        inicio = conn.info["sigvcf_inicio_sentencia"].pop()
+        # SQLite no informa filas de un SELECT antes de leerlas: las de DML salen de rowcount
+        # y las de lectura se cuentan conforme el resultado las extrae del cursor.
+        filas = cursor.rowcount if cursor.rowcount and cursor.rowcount > 0 else 0
+        destinos = self._registrar(statement, time.perf_counter() - inicio, filas)
+        if context is not None and cursor.description is not None and not context.is_crud:
+            # El resultado (CursorResult) se construye después con context.cursor: lee del contador.
+            context.cursor = _CursorContado(cursor, destinos, self._lock)
+
+
+class _CursorContado:
+    """
+    Envoltorio del cursor DBAPI de una lectura: suma a `destinos` las filas que se extraen.
+    Las filas se atribuyen al método y a los ámbitos en los que se ejecutó la sentencia,
+    aunque el resultado se consuma más tarde (p. ej. un iterador por lotes).
+    """
+    __slots__ = ("_cursor", "_destinos", "_lock")
+
+    def __init__(self, cursor, destinos: List[QueryStats], lock: threading.Lock):
+        self._cursor = cursor
+        self._destinos = destinos
+        self._lock = lock
+
+    def _contar(self, filas: int) -> None:
+        if filas:
+            with self._lock:
+                for stats in self._destinos:
+                    stats.rows += filas
+
+    def fetchone(self):
+        fila = self._cursor.fetchone()
+        if fila is not None:
+            self._contar(1)
+        return fila
+
+    def fetchmany(self, *args, **kwargs):
+        filas = self._cursor.fetchmany(*args, **kwargs)
+        self._contar(len(filas))
+        return filas
+
+    def fetchall(self):
+        filas = self._cursor.fetchall()
+        self._contar(len(filas))
+        return filas
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
@@ -0,0 +1,92 @@
+import contextvars
+import functools
+import inspect as pyinspect
+from typing import Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session, raiseload
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+# Clave de Session.info que activa la carga estricta: toda relación que no esté en el
+# plan del método de servicio en curso se configura con raiseload('*').
+STRICT_LOADING = "strict_loading"
+
+# Plan de carga del método de servicio en ejecución en el contexto actual.
+_plan_activo: contextvars.ContextVar[Tuple[_AbstractLoad, ...]] = contextvars.ContextVar(
+    "sigvcf_loader_plan", default=()
+)
+
+
+def loader_plan(*opciones: _AbstractLoad):
+    """
+    Declara en un solo lugar las relaciones que un método de servicio puede recorrer.
+
+    Mientras el método se ejecuta, cada SELECT ORM de primer nivel recibe las opciones
+    del plan cuya entidad raíz coincide con la consultada (selectinload/joinedload...).
+    Con la carga estricta activa, cualquier otra relación lanza InvalidRequestError en
+    lugar de emitir un lazy load silencioso.
+
+        @loader_plan(joinedload(EntradaBodega.orden_de_compra))
+        def verificar_expediente(self, entrada_id): ...
+    """
+    def decorador(metodo):
+        if pyinspect.iscoroutinefunction(metodo):
+            # En las versiones async el plan debe seguir activo mientras la corrutina corre.
+            @functools.wraps(metodo)
+            async def envoltura(*args, **kwargs):
+                token = _plan_activo.set(opciones)
+                try:
+                    return await metodo(*args, **kwargs)
+                finally:
+                    _plan_activo.reset(token)
+        else:
+            @functools.wraps(metodo)
+            def envoltura(*args, **kwargs):
+                token = _plan_activo.set(opciones)
+                try:
+                    return metodo(*args, **kwargs)
+                finally:
+                    _plan_activo.reset(token)
+
+        envoltura.loader_plan = opciones
+        return envoltura
+    return decorador
+
+
+def current_loader_plan() -> Tuple[_AbstractLoad, ...]:
+    return _plan_activo.get()
+
+
+def _mappers_raiz(orm_execute_state: ORMExecuteState) -> set:
+    """Mappers de las entidades completas seleccionadas (no de columnas sueltas)."""
+    mappers = set()
+    for descripcion in orm_execute_state.statement.column_descriptions:
+        entidad = descripcion.get("entity")
+        if entidad is not None and descripcion.get("expr") is entidad:
+            mappers.add(inspect(entidad).mapper)
+    return mappers
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _aplicar_plan_de_carga(orm_execute_state: ORMExecuteState):
+    # Las cargas de relaciones y de columnas expiradas heredan las opciones de la
+    # consulta que cargó la entidad; solo se actúa sobre los SELECT de primer nivel.
+    if (
+        not orm_execute_state.is_select
+        or orm_execute_state.is_relationship_load
+        or orm_execute_state.is_column_load
+    ):
+        return
+
+    mappers = _mappers_raiz(orm_execute_state)
+    if not mappers:
+        return
+
+    opciones = [
+        opcion for opcion in _plan_activo.get()
+        if opcion.path and opcion.path[0].mapper in mappers
+    ]
+    if orm_execute_state.session.info.get(STRICT_LOADING):
+        opciones.append(raiseload("*"))
+    if opciones:
+        orm_execute_state.statement = orm_execute_state.statement.options(*opciones)
@@ -1,4 +1,6 @@
 
+import datetime
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from sigvcf.infrastructure.persistence.repository import SQLAlchemyRepository
 from sigvcf.core.domain.models import (
@@ -13,6 +15,9 @@ from sigvcf.core.domain.models import (
     ProgramacionMensual,
     SalidaRequerimiento,
     ReporteIncumplimiento,
+    MovimientoInventario,
+    CorteInventario,
+    SecuenciaFolio,
 )
 
 ### FILE: sigvcf/infrastructure/persistence/repositories.py
@@ -30,6 +35,8 @@ from sigvcf.core.domain.models import (
     ProgramacionMensual,
     SalidaRequerimiento,
     ReporteIncumplimiento,
+    MovimientoInventario,
+    CorteInventario,
 )
 
 class RolRepository(SQLAlchemyRepository):
@@ -75,3 +82,42 @@ class SalidaRequerimientoRepository(SQLAlchemyRepository):
 class ReporteIncumplimientoRepository(SQLAlchemyRepository):
     def __init__(self, session: Session):
         super().__init__(session, ReporteIncumplimiento)
+
+class MovimientoInventarioRepository(SQLAlchemyRepository):
+    def __init__(self, session: Session):
+        super().__init__(session, MovimientoInventario)
+
+class CorteInventarioRepository(SQLAlchemyRepository):
+    def __init__(self, session: Session):
+        super().__init__(session, CorteInventario)
+
+class SecuenciaFolioRepository(SQLAlchemyRepository):
+    def __init__(self, session: Session):
+        super().__init__(session, SecuenciaFolio)
+
+    def reservar(self, serie: str, fecha: datetime.date, cantidad: int = 1) -> range:
+        """
+        Reserva `cantidad` números consecutivos de la serie en `fecha` con una sola sentencia
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING: el contador del día se crea en el
+        primer uso y se incrementa del lado de SQL, así que dos sesiones nunca reciben el
+        mismo número. Si la transacción se deshace, los números vuelven a quedar libres.
+        """
+        if cantidad < 1:
+            raise ValueError("Se debe reservar al menos un folio.")
+        dialecto = self.session.get_bind().dialect.name
+        if dialecto == "sqlite":
+            stmt = sqlite.insert(SecuenciaFolio)
+        elif dialecto == "postgresql":
+            stmt = postgresql.insert(SecuenciaFolio)
+        else:
+            raise NotImplementedError(f"reservar no está soportado para el dialecto '{dialecto}'.")
+        stmt = (
+            stmt.values(serie=serie, fecha=fecha, ultimo=cantidad)
+            .on_conflict_do_update(
+                index_elements=["serie", "fecha"],
+                set_={"ultimo": SecuenciaFolio.ultimo + stmt.excluded.ultimo},
+            )
+            .returning(SecuenciaFolio.ultimo)
+        )
+        ultimo = self.session.execute(stmt).scalar_one()
+        return range(ultimo - cantidad + 1, ultimo + 1)
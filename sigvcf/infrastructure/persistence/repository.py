@@ -1,8 +1,13 @@
-from typing import Generic, List, Type, TypeVar
+from typing import Any, Dict, Generic, Iterator, List, Mapping, Sequence, Tuple, Type, TypeVar
+from sqlalchemy import func, insert, inspect, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 import abc
 
+from sigvcf.infrastructure.persistence.rows import DTORow, build_rows
+
 T = TypeVar("T")
+D = TypeVar("D")
 
 class AbstractRepository(abc.ABC, Generic[T]):
     """
@@ -31,16 +36,230 @@ class AbstractRepository(abc.ABC, Generic[T]):
         """
         raise NotImplementedError
 
-class SQLAlchemyRepository(AbstractRepository[T]):
+    @abc.abstractmethod
+    def list_page(self, after_key: Any = None, limit: int = 100, order_by: str = "id", **kwargs) -> List[T]:
+        """
+        Devuelve una página de hasta `limit` registros posteriores a `after_key`
+        (paginación por clave, sin OFFSET).
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def iter_batches(self, batch_size: int = 1000, **kwargs) -> Iterator[List[T]]:
+        """
+        Recorre los registros que coinciden con los criterios en lotes de `batch_size`,
+        sin cargar la tabla completa en memoria.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def add_many(self, rows: Sequence[Dict[str, Any]], returning: bool = False) -> List[T] | None:
+        """
+        Inserta varios registros (como diccionarios de columnas) en una sola sentencia.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def upsert_many(self, rows: Sequence[Dict[str, Any]], conflict_keys: Sequence[str],
+                    update_columns: Sequence[str] | None = None) -> None:
+        """
+        Inserta varios registros; los que violan la unicidad de `conflict_keys` se actualizan.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def update_many(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """
+        Actualiza varios registros por clave primaria; cada diccionario debe incluirla.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def project(self, dto_class: Type[D], *criteria, columns: Mapping[str, Any] | None = None,
+                joins: Sequence[Any] = (), order_by: Any = None) -> List[D]:
+        """
+        Consulta solo las columnas que necesita `dto_class` y construye los DTOs
+        directamente a partir de las filas, sin hidratar entidades del ORM.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def project_rows(self, dto_class: Type[D], *criteria, columns: Mapping[str, Any] | None = None,
+                     joins: Sequence[Any] = (), order_by: Any = None) -> List[DTORow[D]]:
+        """
+        Igual que `project`, pero devuelve filas ligeras con __slots__ (ver rows.DTORow)
+        en lugar de instancias de Pydantic. Para listados de solo lectura.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def project_rows_page(self, dto_class: Type[D], *criteria, after_key: Any = None, limit: int = 100,
+                          columns: Mapping[str, Any] | None = None,
+                          joins: Sequence[Any] = ()) -> Tuple[List[DTORow[D]], Any]:
+        """
+        Una página de `project_rows` ordenada por la clave primaria (paginación por clave).
+        Devuelve las filas y el `after_key` de la página siguiente, o None si era la última.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def transition(self, key: Any, from_state: str | Sequence[str], to_state: str, *criteria,
+                   by: str = "id", column: str = "estado", **values) -> bool:
+        """
+        Cambia el estado del registro cuyo `by` es `key` solo si su estado actual es
+        `from_state`, en una sola sentencia UPDATE condicional. Devuelve False si ninguna
+        fila cumplía la condición (no existe, otro estado o no cumple `criteria`).
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def increment(self, key: Any, *criteria, by: str = "id", **deltas) -> bool:
+        """
+        Suma `deltas` a columnas numéricas del lado de SQL (col = col + delta), sin leer
+        el valor previo. Devuelve False si ninguna fila cumplía la condición.
+        """
+        raise NotImplementedError
+
+class RepositoryStatements(Generic[T]):
+    """
+    Construcción de las sentencias de los repositorios, compartida por la implementación
+    síncrona (Session) y la asíncrona (AsyncSession): cada una solo decide cómo ejecutarlas.
+    """
+    model: Type[T]
+
+    @property
+    def _primary_key(self):
+        return inspect(self.model).primary_key[0]
+
+    def _page_statement(self, after_key: Any, limit: int, order_by: str, **kwargs):
+        return self._keyset(select(self.model).filter_by(**kwargs), after_key, order_by).limit(limit)
+
+    def _keyset(self, stmt, after_key: Any, order_by: str):
+        """Ordena `stmt` por `order_by` (desempatando por la clave primaria) y lo continúa tras `after_key`."""
+        pk = self._primary_key
+        columna = getattr(self.model, order_by)
+
+        if columna.key == pk.key:
+            if after_key is not None:
+                stmt = stmt.where(pk > after_key)
+            stmt = stmt.order_by(pk)
+        else:
+            if after_key is not None:
+                valor, ultimo_id = after_key
+                stmt = stmt.where(tuple_(columna, pk) > tuple_(valor, ultimo_id))
+            stmt = stmt.order_by(columna, pk)
+        return stmt
+
+    def page_key(self, entity: T, order_by: str = "id") -> Any:
+        """Calcula el `after_key` que continúa la paginación a partir de `entity`."""
+        pk_valor = getattr(entity, self._primary_key.key)
+        if order_by == self._primary_key.key:
+            return pk_valor
+        return (getattr(entity, order_by), pk_valor)
+
+    def _batches_statement(self, batch_size: int, **kwargs):
+        return (
+            select(self.model)
+            .filter_by(**kwargs)
+            .order_by(self._primary_key)
+            .execution_options(yield_per=batch_size)
+        )
+
+    def _upsert_statement(self, dialecto: str, rows: Sequence[Dict[str, Any]], conflict_keys: Sequence[str],
+                          update_columns: Sequence[str] | None):
+        if dialecto == "sqlite":
+            stmt = sqlite.insert(self.model)
+        elif dialecto == "postgresql":
+            stmt = postgresql.insert(self.model)
+        else:
+            raise NotImplementedError(f"upsert_many no está soportado para el dialecto '{dialecto}'.")
+
+        columnas = update_columns or [c for c in rows[0] if c not in conflict_keys]
+        if columnas:
+            return stmt.on_conflict_do_update(
+                index_elements=list(conflict_keys),
+                set_={columna: stmt.excluded[columna] for columna in columnas},
+            )
+        return stmt.on_conflict_do_nothing(index_elements=list(conflict_keys))
+
+    def _transition_statement(self, key: Any, from_state: str | Sequence[str], to_state: str, criteria,
+                              by: str, column: str, values: Mapping[str, Any]):
+        columna = getattr(self.model, column)
+        origen = [from_state] if isinstance(from_state, str) else list(from_state)
+        return (
+            update(self.model)
+            .where(getattr(self.model, by) == key, columna.in_(origen), *criteria)
+            .values({column: to_state, **values})
+        )
+
+    def _increment_statement(self, key: Any, criteria, by: str, deltas: Mapping[str, Any]):
+        return (
+            update(self.model)
+            .where(getattr(self.model, by) == key, *criteria)
+            .values({
+                nombre: func.coalesce(getattr(self.model, nombre), 0) + delta
+                for nombre, delta in deltas.items()
+            })
+        )
+
+    def _projection_statement(self, dto_class: type, criteria, columns: Mapping[str, Any] | None,
+                              joins: Sequence[Any], order_by: Any):
+        """Devuelve la sentencia de la proyección y los nombres de campo en el orden de sus columnas."""
+        proyeccion = self._projection_columns(dto_class, columns or {})
+        stmt = select(*[columna.label(nombre) for nombre, columna in proyeccion]).select_from(self.model)
+        for destino in joins:
+            stmt = stmt.join(destino)
+        stmt = stmt.where(*criteria)
+        if order_by is not None:
+            stmt = stmt.order_by(order_by)
+        return stmt, [nombre for nombre, _ in proyeccion]
+
+    def _projection_page_statement(self, dto_class: type, criteria, columns: Mapping[str, Any] | None,
+                                   joins: Sequence[Any], after_key: Any, limit: int):
+        """
+        Proyección paginada por la clave primaria, que se agrega como última columna. Se pide
+        una fila de más para saber, sin otro COUNT, si queda una página siguiente.
+        """
+        stmt, nombres = self._projection_statement(dto_class, criteria, columns, joins, None)
+        pk = self._primary_key
+        stmt = self._keyset(stmt.add_columns(pk.label("_clave_pagina")), after_key, pk.key)
+        return stmt.limit(limit + 1), nombres
+
+    @staticmethod
+    def _split_page(dto_class: type, nombres: Sequence[str], filas, limit: int):
+        siguiente = filas[limit - 1][-1] if len(filas) > limit else None
+        return build_rows(dto_class, nombres, (fila[:-1] for fila in filas[:limit])), siguiente
+
+    def _projection_columns(self, dto_class: type, columns: Mapping[str, Any]) -> List[Tuple[str, Any]]:
+        atributos_columna = inspect(self.model).column_attrs
+        proyeccion = []
+        for nombre, campo in dto_class.model_fields.items():
+            if nombre in columns:
+                proyeccion.append((nombre, columns[nombre]))
+            elif nombre in atributos_columna:
+                proyeccion.append((nombre, getattr(self.model, nombre)))
+            elif campo.is_required():
+                raise ValueError(
+                    f"El campo '{nombre}' de {dto_class.__name__} no corresponde a ninguna columna "
+                    f"de {self.model.__name__}; indíquelo en 'columns'."
+                )
+        return proyeccion
+
+class SQLAlchemyRepository(RepositoryStatements[T], AbstractRepository[T]):
     """
     Implementación concreta del patrón de repositorio usando SQLAlchemy.
     """
     def __init__(self, session: Session, model: Type[T]):
         self.session = session
         self.model = model
+        # En modo bulk (ver SqlAlchemyUnitOfWork.bulk) add() acumula aquí en lugar de usar la sesión.
+        self._bulk_buffer: List[T] | None = None
 
     def add(self, model: T) -> None:
-        self.session.add(model)
+        if self._bulk_buffer is not None:
+            self._bulk_buffer.append(model)
+        else:
+            self.session.add(model)
 
     def get(self, id) -> T | None:
         return self.session.get(self.model, id)
@@ -58,3 +277,112 @@ class SQLAlchemyRepository(AbstractRepository[T]):
         o si se encuentran múltiples registros.
         """
         return self.session.query(self.model).filter_by(**kwargs).one_or_none()
+
+    def list_page(self, after_key: Any = None, limit: int = 100, order_by: str = "id", **kwargs) -> List[T]:
+        """
+        Paginación por clave (keyset). Si se ordena por la clave primaria, `after_key` es
+        el id del último registro de la página anterior. Para otra columna, `after_key` es
+        la tupla (valor, id) que devuelve page_key(), y la clave primaria desempata.
+        """
+        stmt = self._page_statement(after_key, limit, order_by, **kwargs)
+        return list(self.session.execute(stmt).scalars())
+
+    def iter_batches(self, batch_size: int = 1000, **kwargs) -> Iterator[List[T]]:
+        """
+        Usa yield_per para leer el cursor por partes. Cada lote se entrega ya cargado;
+        al descartarlo, sus entidades dejan de estar referenciadas por la sesión.
+        """
+        stmt = self._batches_statement(batch_size, **kwargs)
+        for lote in self.session.execute(stmt).scalars().partitions():
+            yield list(lote)
+
+    def add_many(self, rows: Sequence[Dict[str, Any]], returning: bool = False) -> List[T] | None:
+        """
+        INSERT de tipo executemany. Con `returning=True` devuelve las entidades creadas
+        (con sus ids) usando RETURNING; si no, no se crea ningún objeto ORM.
+        """
+        if not rows:
+            return [] if returning else None
+        if returning:
+            return list(self.session.scalars(insert(self.model).returning(self.model), list(rows)))
+        self.session.execute(insert(self.model), list(rows))
+        return None
+
+    def upsert_many(self, rows: Sequence[Dict[str, Any]], conflict_keys: Sequence[str],
+                    update_columns: Sequence[str] | None = None) -> None:
+        """
+        INSERT ... ON CONFLICT (conflict_keys) DO UPDATE en una sola sentencia executemany.
+        Por defecto se actualizan todas las columnas recibidas que no forman parte del conflicto.
+        """
+        if not rows:
+            return
+
+        dialecto = self.session.get_bind().dialect.name
+        stmt = self._upsert_statement(dialecto, rows, conflict_keys, update_columns)
+        self.session.execute(stmt, list(rows))
+
+    def update_many(self, rows: Sequence[Dict[str, Any]]) -> None:
+        """UPDATE ... WHERE pk = ? ejecutado como executemany (bulk UPDATE por clave primaria)."""
+        if rows:
+            self.session.execute(update(self.model), list(rows))
+
+    def project(self, dto_class: Type[D], *criteria, columns: Mapping[str, Any] | None = None,
+                joins: Sequence[Any] = (), order_by: Any = None) -> List[D]:
+        """
+        Cada campo del DTO se resuelve con `columns` (p. ej. campos de tablas unidas como
+        'proveedor_rfc': Proveedor.rfc) o con la columna homónima del modelo. Los campos sin
+        columna y con valor por defecto (p. ej. listas de DTOs anidados) se omiten.
+        Las filas ya vienen tipadas de la base de datos, así que se usa model_construct()
+        sin volver a validar.
+        """
+        stmt, nombres = self._projection_statement(dto_class, criteria, columns, joins, order_by)
+        construir = dto_class.model_construct
+        return [construir(**dict(zip(nombres, fila))) for fila in self.session.execute(stmt)]
+
+    def project_rows(self, dto_class: Type[D], *criteria, columns: Mapping[str, Any] | None = None,
+                     joins: Sequence[Any] = (), order_by: Any = None) -> List[DTORow[D]]:
+        """Misma consulta que `project`; cada fila del cursor se pasa por posición a la clase de fila."""
+        stmt, nombres = self._projection_statement(dto_class, criteria, columns, joins, order_by)
+        return build_rows(dto_class, nombres, self.session.execute(stmt).tuples())
+
+    def project_rows_page(self, dto_class: Type[D], *criteria, after_key: Any = None, limit: int = 100,
+                          columns: Mapping[str, Any] | None = None,
+                          joins: Sequence[Any] = ()) -> Tuple[List[DTORow[D]], Any]:
+        """
+        WHERE pk > :after_key ORDER BY pk LIMIT :limit + 1: cada página cuesta lo mismo sin
+        importar su posición, a diferencia de OFFSET, y nunca se lee la tabla completa.
+        """
+        stmt, nombres = self._projection_page_statement(dto_class, criteria, columns, joins, after_key, limit)
+        return self._split_page(dto_class, nombres, self.session.execute(stmt).tuples().all(), limit)
+
+    def transition(self, key: Any, from_state: str | Sequence[str], to_state: str, *criteria,
+                   by: str = "id", column: str = "estado", **values) -> bool:
+        """
+        UPDATE ... SET estado = :to WHERE by = :key AND estado IN (:from) AND criteria.
+        Dos sesiones que intentan la misma transición no pueden aplicarla ambas: la segunda
+        espera el bloqueo de escritura y, al ejecutarse, ya no encuentra la fila en `from_state`.
+        Las entidades de esa fila que ya estén en la sesión se sincronizan.
+        """
+        stmt = self._transition_statement(key, from_state, to_state, criteria, by, column, values)
+        return self.session.execute(stmt).rowcount == 1
+
+    def increment(self, key: Any, *criteria, by: str = "id", **deltas) -> bool:
+        """
+        UPDATE ... SET col = COALESCE(col, 0) + :delta: los incrementos concurrentes se
+        acumulan en lugar de pisarse, como ocurre con `entidad.col += delta` tras un SELECT.
+        """
+        stmt = self._increment_statement(key, criteria, by, deltas)
+        return self.session.execute(stmt).rowcount == 1
+
+    def begin_bulk(self) -> None:
+        if self._bulk_buffer is None:
+            self._bulk_buffer = []
+
+    def flush_bulk(self) -> None:
+        """Escribe las entidades acumuladas con bulk_save_objects, sin pasar por el identity map."""
+        if self._bulk_buffer:
+            self.session.bulk_save_objects(self._bulk_buffer)
+            self._bulk_buffer.clear()
+
+    def end_bulk(self) -> None:
+        self._bulk_buffer = None
@@ -0,0 +1,63 @@
+import copy
+import dataclasses
+import functools
+from typing import Any, Generic, List, Sequence, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+D = TypeVar("D", bound=BaseModel)
+
+
+class DTORow(Generic[D]):
+    """
+    Fila de solo lectura con los campos de un DTO de Pydantic, para los listados.
+
+    Las clases concretas se generan con `row_type()`: son dataclasses con __slots__ que
+    exponen los mismos atributos que el DTO (incluidos sus computed_field como
+    propiedades), sin validación ni el estado interno de BaseModel por instancia. Las
+    vistas las usan igual que a los DTOs; cuando una fila vuelve al camino de escritura
+    se convierte con `to_dto()`, que sí valida.
+    """
+    __slots__ = ()
+    __dto__: Type[D]
+
+    def to_dto(self) -> D:
+        return self.__dto__.model_validate(self, from_attributes=True)
+
+
+@functools.lru_cache(maxsize=None)
+def row_type(dto_class: Type[D], fields: Tuple[str, ...] | None = None) -> Type[DTORow[D]]:
+    """
+    Genera (una sola vez por DTO y orden de campos) la clase de fila de `dto_class`.
+
+    `fields` son los campos que se pasan por posición, en el orden de las columnas de la
+    consulta; los demás campos del DTO quedan al final con su valor por defecto. Así una
+    fila se construye con `Fila(*tupla)` directamente desde el cursor.
+    """
+    campos = dto_class.model_fields
+    posicionales = tuple(fields) if fields is not None else tuple(campos)
+    definicion = [(nombre, campos[nombre].annotation) for nombre in posicionales]
+    for nombre, campo in campos.items():
+        if nombre in posicionales:
+            continue
+        if campo.is_required():
+            raise ValueError(f"El campo obligatorio '{nombre}' de {dto_class.__name__} falta en la fila.")
+        por_defecto = campo.get_default(call_default_factory=True)
+        if isinstance(por_defecto, (list, dict, set)):
+            # Valores por defecto mutables (p. ej. listas de DTOs anidados): uno por fila.
+            por_defecto = dataclasses.field(default_factory=functools.partial(copy.copy, por_defecto))
+        definicion.append((nombre, campo.annotation, por_defecto))
+
+    espacio = {"__dto__": dto_class}
+    for nombre, calculado in dto_class.model_computed_fields.items():
+        espacio[nombre] = property(calculado.wrapped_property.fget)
+    return dataclasses.make_dataclass(
+        f"{dto_class.__name__}Row", definicion, bases=(DTORow,), namespace=espacio,
+        slots=True, eq=True, repr=True,
+    )
+
+
+def build_rows(dto_class: Type[D], fields: Sequence[str], rows) -> List[DTORow[D]]:
+    """Construye las filas de `dto_class` a partir de tuplas cuyas columnas siguen `fields`."""
+    fila = row_type(dto_class, tuple(fields))
+    return [fila(*valores) for valores in rows]
@@ -0,0 +1,29 @@
+import datetime
+from typing import List
+
+from sigvcf.infrastructure.persistence.unit_of_work import IUnitOfWork
+
+
+class SequenceService:
+    """
+    Folios únicos con formato '<prefijo>-AAAAMMDD-NNNNN', respaldados por un contador por
+    serie y día (tabla secuencia_folio).
+
+    Un lote de N folios se reserva con una sola sentencia, así que una recepción masiva o
+    dos recepcionistas en el mismo segundo no chocan con la restricción única ni tienen que
+    reintentar. Se usa dentro del ámbito de la Unidad de Trabajo que escribe los folios: el
+    contador avanza en esa misma transacción y, si se deshace, ningún folio queda entregado.
+    """
+    def __init__(self, uow: IUnitOfWork):
+        self.uow = uow
+
+    def reservar(self, serie: str, cantidad: int = 1, prefijo: str | None = None,
+                 fecha: datetime.date | None = None) -> List[str]:
+        """
+        Reserva `cantidad` folios consecutivos de `serie` para `fecha` (por defecto, hoy).
+        `prefijo` sustituye a la serie al inicio del folio (p. ej. 'REQ-202503').
+        """
+        fecha = fecha or datetime.datetime.utcnow().date()
+        numeros = self.uow.secuencias_folio.reservar(serie, fecha, cantidad)
+        prefijo = prefijo or serie
+        return [f"{prefijo}-{fecha:%Y%m%d}-{numero:05d}" for numero in numeros]
@@ -0,0 +1,107 @@
+import logging
+import time
+from logging.handlers import RotatingFileHandler
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from sigvcf.infrastructure.persistence.instrumentation import caller_service_method
+
+logger = logging.getLogger(__name__)
+
+# Sentencias a las que se les puede pedir EXPLAIN QUERY PLAN.
+_VERBOS_CON_PLAN = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+_MAX_PARAMETROS = 1000
+
+
+class SlowQueryLog:
+    """
+    Registro opcional de consultas lentas.
+
+    Cada sentencia que supera `threshold_ms` se escribe en un log rotativo propio con su
+    duración, sus parámetros, el método de servicio que la originó y, en SQLite, la salida
+    de EXPLAIN QUERY PLAN obtenida en la misma conexión justo después de ejecutarla.
+    """
+    def __init__(
+        self,
+        engine: Engine | None = None,
+        enabled: bool = True,
+        threshold_ms: float = 200.0,
+        path: str = "slow_queries.log",
+        max_bytes: int = 5 * 1024 * 1024,
+        backup_count: int = 3,
+    ):
+        self.enabled = enabled
+        self.threshold = threshold_ms / 1000.0
+        self._engines: List[Engine] = []
+        self._registro = logging.getLogger(f"{__name__}.{id(self)}")
+        self._registro.propagate = False
+        self._registro.setLevel(logging.INFO)
+        self._handler = None
+        if enabled:
+            self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            self._handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self._registro.addHandler(self._handler)
+            if engine is not None:
+                self.install(engine)
+
+    def install(self, engine: Engine) -> None:
+        if engine in self._engines:
+            return
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.append(engine)
+        logger.info(f"Registro de consultas lentas activo (umbral {self.threshold * 1000:.0f} ms).")
+
+    def uninstall(self) -> None:
+        for engine in self._engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+            event.remove(engine, "after_cursor_execute", self._after_cursor_execute)
+        self._engines.clear()
+        if self._handler is not None:
+            self._registro.removeHandler(self._handler)
+            self._handler.close()
+            self._handler = None
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sigvcf_inicio_lenta", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        duracion = time.perf_counter() - conn.info["sigvcf_inicio_lenta"].pop()
+        if duracion < self.threshold:
+            return
+
+        # En executemany se explica la sentencia con el primer juego de parámetros.
+        parametros_plan = parameters[0] if executemany and parameters else parameters
+        plan = self._explicar(conn, statement, parametros_plan)
+        parametros = repr(parameters)
+        if len(parametros) > _MAX_PARAMETROS:
+            parametros = parametros[:_MAX_PARAMETROS] + "..."
+
+        lineas = [
+            f"{duracion * 1000:.1f} ms [{caller_service_method() or '<sin servicio>'}]"
+            + (f" executemany de {len(parameters)} juegos" if executemany else ""),
+            f"  SQL: {' '.join(statement.split())}",
+            f"  Parámetros: {parametros}",
+        ]
+        if plan:
+            lineas.append("  Plan:")
+            lineas.extend(f"    {paso}" for paso in plan)
+        self._registro.info("\n".join(lineas))
+
+    def _explicar(self, conn, statement: str, parametros) -> List[str]:
+        if conn.dialect.name != "sqlite":
+            return []
+        verbo = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+        if verbo not in _VERBOS_CON_PLAN:
+            return []
+        # Cursor DBAPI directo: no vuelve a disparar los eventos del motor.
+        cursor = conn.connection.dbapi_connection.cursor()
+        try:
+            cursor.execute("EXPLAIN QUERY PLAN " + statement, parametros or ())
+            return [fila[-1] for fila in cursor.fetchall()]
+        except Exception as e:
+            return [f"<no se pudo obtener el plan: {e}>"]
+        finally:
+            cursor.close()
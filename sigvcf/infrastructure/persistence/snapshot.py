@@ -0,0 +1,178 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from sigvcf.infrastructure.persistence.engine import ENGINE_PROFILES, DEFAULT_PROFILE, apply_sqlite_pragmas
+
+logger = logging.getLogger(__name__)
+
+# PRAGMAs del perfil que tienen sentido en una conexión de solo lectura.
+_PRAGMAS_LECTURA = ("cache_size", "mmap_size", "temp_store", "busy_timeout")
+
+
+class SnapshotService:
+    """
+    Copia de solo lectura de la base de datos para las consultas de tipo reporte.
+
+    Un hilo en segundo plano copia la base principal cada `refresh_interval` segundos con
+    la API de respaldo en línea de sqlite3. Con la base en WAL la copia es una única
+    transacción de lectura, así que no bloquea a los escritores. Se alterna entre dos
+    archivos (.a/.b) para no sobrescribir el que están leyendo los reportes en curso.
+
+    Una lectura de reporte solo usa la copia si está dentro de `max_staleness` segundos y
+    no hubo escrituras confirmadas en este proceso después de tomarla; si no, la Unidad de
+    Trabajo lee de la base principal (ver SqlAlchemyUnitOfWork.readonly(report=True)).
+    """
+    def __init__(
+        self,
+        source_url: str,
+        path: str = "sigvcf_snapshot.db",
+        enabled: bool = False,
+        refresh_interval: float = 30.0,
+        max_staleness: float = 60.0,
+        profile: str = DEFAULT_PROFILE,
+    ):
+        self.enabled = enabled
+        self.refresh_interval = refresh_interval
+        self.max_staleness = max_staleness
+        self._origen = make_url(source_url).database
+        base, extension = os.path.splitext(path)
+        self._archivos = (f"{base}.a{extension}", f"{base}.b{extension}")
+        self._pragmas = {k: v for k, v in ENGINE_PROFILES[profile].items() if k in _PRAGMAS_LECTURA}
+
+        self._lock = threading.Lock()
+        self._actual: str | None = None
+        self._tomada_en: float | None = None      # time.monotonic() al iniciar la copia vigente
+        self._ultima_escritura = float("-inf")
+        self._detener = threading.Event()
+        self._hilo: threading.Thread | None = None
+        self._engine: Engine | None = None
+        self._async_engine: AsyncEngine | None = None
+
+    # --- Ciclo de vida ---
+
+    def start(self) -> None:
+        """Toma la primera copia y arranca el refresco periódico en segundo plano."""
+        if not self.enabled or self._hilo is not None:
+            return
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._refrescar_periodicamente, name="sigvcf-snapshot", daemon=True)
+        self._hilo.start()
+
+    def stop(self) -> None:
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join(timeout=self.refresh_interval)
+            self._hilo = None
+        if self._engine is not None:
+            self._engine.dispose()
+
+    async def aclose(self) -> None:
+        """Cierra las conexiones aiosqlite; debe esperarse en el bucle que las abrió."""
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+
+    def _refrescar_periodicamente(self) -> None:
+        while not self._detener.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                # Si el archivo destino sigue en uso se reintenta en el siguiente ciclo.
+                logger.warning(f"No se pudo refrescar la copia de reportes: {e}")
+            self._detener.wait(self.refresh_interval)
+
+    def refresh(self) -> None:
+        """Copia la base principal al archivo que no está en uso y lo publica como vigente."""
+        with self._lock:
+            destino = self._archivos[1] if self._actual == self._archivos[0] else self._archivos[0]
+
+        inicio = time.monotonic()
+        origen = sqlite3.connect(self._origen)
+        copia = sqlite3.connect(destino)
+        try:
+            origen.backup(copia)
+            # La copia hereda el modo WAL; en modo DELETE puede abrirse con mode=ro sin -shm.
+            copia.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            copia.close()
+            origen.close()
+
+        with self._lock:
+            self._actual = destino
+            self._tomada_en = inicio
+        logger.info(f"Copia de reportes actualizada en {destino} ({(time.monotonic() - inicio) * 1000:.0f} ms).")
+
+    # --- Frescura ---
+
+    def mark_written(self) -> None:
+        """La Unidad de Trabajo lo llama tras cada commit: la copia vigente queda atrasada."""
+        self._ultima_escritura = time.monotonic()
+
+    def is_fresh(self) -> bool:
+        with self._lock:
+            tomada_en = self._tomada_en
+        if not self.enabled or tomada_en is None:
+            return False
+        return tomada_en >= self._ultima_escritura and time.monotonic() - tomada_en <= self.max_staleness
+
+    @property
+    def current_path(self) -> str | None:
+        with self._lock:
+            return self._actual
+
+    # --- Motores sobre la copia ---
+
+    def _uri_actual(self) -> str:
+        ruta = self.current_path
+        if ruta is None:
+            raise RuntimeError("La copia de reportes aún no se ha generado.")
+        return f"file:{os.path.abspath(ruta)}?mode=ro"
+
+    def _configurar(self, engine: Engine) -> None:
+        apply_sqlite_pragmas(engine, self._pragmas)
+
+        @event.listens_for(engine, "connect")
+        def _recordar_archivo(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA database_list")
+            connection_record.info["archivo"] = os.path.abspath(cursor.fetchone()[2])
+            cursor.close()
+
+        @event.listens_for(engine, "checkout")
+        def _descartar_copia_anterior(dbapi_connection, connection_record, connection_proxy):
+            # Una conexión abierta sobre la copia anterior se invalida y el pool abre otra.
+            actual = self.current_path
+            if actual is not None and connection_record.info.get("archivo") != os.path.abspath(actual):
+                raise exc.DisconnectionError("La conexión apunta a una copia de reportes anterior.")
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            self._engine = create_engine(
+                "sqlite://",
+                creator=lambda: sqlite3.connect(self._uri_actual(), uri=True, check_same_thread=False),
+                poolclass=QueuePool,
+            )
+            self._configurar(self._engine)
+        return self._engine
+
+    @property
+    def async_engine(self) -> AsyncEngine:
+        if self._async_engine is None:
+            import aiosqlite
+
+            async def _conectar():
+                return await aiosqlite.connect(self._uri_actual(), uri=True)
+
+            self._async_engine = create_async_engine(
+                "sqlite+aiosqlite://", async_creator=_conectar, poolclass=AsyncAdaptedQueuePool
+            )
+            self._configurar(self._async_engine.sync_engine)
+        return self._async_engine
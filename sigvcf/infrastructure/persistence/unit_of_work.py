@@ -1,6 +1,10 @@
 import abc
+import contextlib
 from sqlalchemy.orm import Session, sessionmaker
 from sigvcf.infrastructure.persistence import repositories
+from sigvcf.infrastructure.persistence.archive import ArchiveService
+from sigvcf.infrastructure.persistence.instrumentation import SqlInstrumentation
+from sigvcf.infrastructure.persistence.snapshot import SnapshotService
 
 class IUnitOfWork(abc.ABC):
     """Interfaz abstracta para la Unidad de Trabajo con repositorios como propiedades."""
@@ -60,6 +64,21 @@ class IUnitOfWork(abc.ABC):
     def registros_contables(self) -> repositories.RegistroContableRepository:
         raise NotImplementedError
 
+    @property
+    @abc.abstractmethod
+    def movimientos_inventario(self) -> repositories.MovimientoInventarioRepository:
+        raise NotImplementedError
+
+    @property
+    @abc.abstractmethod
+    def cortes_inventario(self) -> repositories.CorteInventarioRepository:
+        raise NotImplementedError
+
+    @property
+    @abc.abstractmethod
+    def secuencias_folio(self) -> repositories.SecuenciaFolioRepository:
+        raise NotImplementedError
+
     def __enter__(self):
         return self
 
@@ -77,34 +96,231 @@ class IUnitOfWork(abc.ABC):
     def rollback(self):
         raise NotImplementedError
 
+    @abc.abstractmethod
+    def readonly(self, report: bool = False, archive: bool = False):
+        """
+        Context manager para casos de uso de solo consulta: abre una transacción de
+        lectura y al salir la descarta, sin flush ni commit. Con `report=True` la lectura
+        puede servirse desde la copia de reportes si está dentro de su margen de frescura.
+        Con `archive=True` se lee del archivo histórico de contratos cerrados.
+        """
+        raise NotImplementedError
+
+    @property
+    def archive_available(self) -> bool:
+        """Hay archivo histórico para consultar con readonly(archive=True)."""
+        return False
+
+    @abc.abstractmethod
+    def batch(self, readonly: bool = False):
+        """
+        Context manager que agrupa varias llamadas a servicios en una sola transacción.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def bulk(self):
+        """
+        Context manager de modo masivo: las entidades agregadas con `repo.add()` se
+        escriben juntas al salir del bloque, sin seguimiento individual en la sesión.
+        """
+        raise NotImplementedError
+
 class SqlAlchemyUnitOfWork(IUnitOfWork):
     """
     Implementación de la Unidad de Trabajo con SQLAlchemy y repositorios lazy-loaded.
+
+    Es reentrante: el ámbito más externo crea y cierra la sesión; los ámbitos internos
+    (un servicio llamado desde otro, o varias llamadas dentro de batch()) reutilizan la
+    sesión y se aíslan con un SAVEPOINT.
     """
-    def __init__(self, session_factory: sessionmaker):
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        instrumentation: SqlInstrumentation | None = None,
+        snapshot: SnapshotService | None = None,
+        report_session_factory: sessionmaker | None = None,
+        archive: ArchiveService | None = None,
+        archive_session_factory: sessionmaker | None = None,
+    ):
         self.session_factory = session_factory
+        self.instrumentation = instrumentation
+        self.snapshot = snapshot
+        self.report_session_factory = report_session_factory
+        self.archive = archive
+        self.archive_session_factory = archive_session_factory
+        self._instrumentation_token = None
         self._repositories = {}
+        self._bulk = False
+        self._readonly = False
+        self._depth = 0
+        self._savepoints = []
+
+    @property
+    def _nested(self) -> bool:
+        return self._depth > 1
 
     def __enter__(self):
-        self.session: Session = self.session_factory()
-        # Limpiar el caché de repositorios para esta nueva sesión
-        self._repositories.clear()
+        if self._depth == 0:
+            self._begin_instrumentation()
+            self.session: Session = self.session_factory()
+            # Limpiar el caché de repositorios para esta nueva sesión
+            self._repositories.clear()
+        else:
+            self._savepoints.append(self.session.begin_nested())
+        self._depth += 1
         return super().__enter__()
 
     def __exit__(self, exc_type, exc_val, traceback):
-        super().__exit__(exc_type, exc_val, traceback)
-        self.session.close()
+        try:
+            super().__exit__(exc_type, exc_val, traceback)
+            if self._nested and self._savepoints[-1].is_active:
+                self._savepoints[-1].commit()
+        except Exception:
+            if self._nested and self._savepoints[-1].is_active:
+                self._savepoints[-1].rollback()
+            raise
+        finally:
+            if self._nested:
+                self._savepoints.pop()
+            self._depth -= 1
+            if self._depth == 0:
+                self.session.close()
+                self._end_instrumentation()
+
+    def _begin_instrumentation(self):
+        if self.instrumentation is not None:
+            self._instrumentation_token = self.instrumentation.begin_scope()
+
+    def _end_instrumentation(self):
+        if self.instrumentation is not None:
+            token, self._instrumentation_token = self._instrumentation_token, None
+            self.instrumentation.end_scope(token)
 
     def commit(self):
-        self.session.commit()
+        """
+        En el ámbito externo confirma la transacción. En un ámbito anidado solo hace flush:
+        el SAVEPOINT se libera al salir del ámbito y el commit real lo hace el externo.
+        """
+        if self._readonly:
+            raise RuntimeError("No se puede confirmar una Unidad de Trabajo de solo lectura.")
+        if self._nested:
+            self.session.flush()
+        else:
+            self.session.commit()
+            if self.snapshot is not None:
+                self.snapshot.mark_written()
 
     def rollback(self):
-        self.session.rollback()
+        """En un ámbito anidado revierte solo su SAVEPOINT."""
+        if self._nested:
+            if self._savepoints[-1].is_active:
+                self._savepoints[-1].rollback()
+        else:
+            self.session.rollback()
+
+    def _usar_copia_de_reportes(self, report: bool) -> bool:
+        return (
+            report
+            and self.snapshot is not None
+            and self.report_session_factory is not None
+            and self.snapshot.is_fresh()
+        )
+
+    @property
+    def archive_available(self) -> bool:
+        return self.archive is not None and self.archive_session_factory is not None and self.archive.available
+
+    @contextlib.contextmanager
+    def readonly(self, report: bool = False, archive: bool = False):
+        """
+        Sesión sin autoflush ni expire_on_commit sobre una transacción diferida de lectura.
+        En SQLite se activa PRAGMA query_only en la conexión, de modo que cualquier
+        escritura accidental falla en lugar de tomar el bloqueo de escritura.
+        Dentro de un ámbito ya abierto simplemente se une a su transacción.
+        Con `report=True` se lee de la copia de reportes cuando está vigente, y con
+        `archive=True` del archivo histórico; este siempre abre su propio ámbito.
+        """
+        if archive:
+            if not self.archive_available:
+                raise RuntimeError("No hay archivo histórico disponible.")
+            if self._depth > 0:
+                raise RuntimeError("El archivo histórico no puede leerse dentro de un ámbito abierto.")
+            fabrica = self.archive_session_factory
+        elif self._depth > 0:
+            yield self
+            return
+        else:
+            fabrica = self.report_session_factory if self._usar_copia_de_reportes(report) else self.session_factory
+        self._begin_instrumentation()
+        self.session = fabrica(autoflush=False, expire_on_commit=False)
+        self._repositories.clear()
+        self._readonly = True
+        self._depth = 1
+        es_sqlite = False
+        try:
+            connection = self.session.connection()
+            es_sqlite = connection.dialect.name == "sqlite"
+            dbapi_connection = connection.connection.dbapi_connection
+            if es_sqlite:
+                connection.exec_driver_sql("PRAGMA query_only = ON")
+                if not dbapi_connection.in_transaction:
+                    # Motores sin enable_sqlite_transactions: pysqlite no emite BEGIN antes
+                    # de un SELECT; se abre aquí para que el bloque vea una sola instantánea.
+                    connection.exec_driver_sql("BEGIN DEFERRED")
+            yield self
+        finally:
+            self._readonly = False
+            self._depth = 0
+            try:
+                if es_sqlite:
+                    # La conexión vuelve al pool: se restablece antes de soltarla, directamente
+                    # sobre la conexión DBAPI por si la sesión quedó invalidada por un error.
+                    dbapi_connection.execute("PRAGMA query_only = OFF")
+                self.session.rollback()
+            finally:
+                self.session.close()
+                self._end_instrumentation()
+
+    @contextlib.contextmanager
+    def batch(self, readonly: bool = False):
+        """
+        Abre un ámbito externo para que varias llamadas a servicios (p. ej. el refresco
+        completo de una pantalla) compartan sesión y transacción. Con `readonly=True`
+        el ámbito externo es de solo lectura.
+        """
+        if readonly:
+            with self.readonly():
+                yield self
+        else:
+            with self:
+                yield self
+
+    @contextlib.contextmanager
+    def bulk(self):
+        """
+        Dentro del bloque, `repo.add()` acumula las entidades y al salir se escriben con
+        bulk_save_objects (un executemany por tabla). Las entidades no quedan asociadas
+        a la sesión ni reciben su id, así que no deben usarse después del bloque.
+        """
+        self._bulk = True
+        for repo in self._repositories.values():
+            repo.begin_bulk()
+        try:
+            yield self
+            for repo in self._repositories.values():
+                repo.flush_bulk()
+        finally:
+            self._bulk = False
+            for repo in self._repositories.values():
+                repo.end_bulk()
 
     def _get_repository(self, name: str, repo_class: type) -> any:
         """Función de ayuda genérica para obtener/crear un repositorio."""
         if name not in self._repositories:
             self._repositories[name] = repo_class(self.session)
+            if self._bulk:
+                self._repositories[name].begin_bulk()
         return self._repositories[name]
 
     @property
@@ -152,3 +368,15 @@ class SqlAlchemyUnitOfWork(IUnitOfWork):
     @property
     def registros_contables(self) -> repositories.RegistroContableRepository:
         return self._get_repository("registros_contables", repositories.RegistroContableRepository)
+
+    @property
+    def movimientos_inventario(self) -> repositories.MovimientoInventarioRepository:
+        return self._get_repository("movimientos_inventario", repositories.MovimientoInventarioRepository)
+
+    @property
+    def cortes_inventario(self) -> repositories.CorteInventarioRepository:
+        return self._get_repository("cortes_inventario", repositories.CorteInventarioRepository)
+
+    @property
+    def secuencias_folio(self) -> repositories.SecuenciaFolioRepository:
+        return self._get_repository("secuencias_folio", repositories.SecuenciaFolioRepository)
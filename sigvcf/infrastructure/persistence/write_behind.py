@@ -0,0 +1,288 @@
+import datetime
+import json
+import logging
+import os
+import threading
+from itertools import groupby
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+
+from sigvcf.infrastructure.persistence.unit_of_work import IUnitOfWork
+
+logger = logging.getLogger(__name__)
+
+# (repositorio, claves de conflicto, fila)
+_Entrada = Tuple[str, Tuple[str, ...], Dict[str, Any]]
+
+
+def _a_json(valor):
+    if isinstance(valor, (datetime.date, datetime.datetime)):
+        return valor.isoformat()
+    raise TypeError(f"Valor no serializable en el diario de escrituras: {valor!r}")
+
+
+class WriteBehindQueue:
+    """
+    Cola de escrituras diferidas para guardados pequeños y frecuentes.
+
+    Cada `put()` registra un upsert en memoria y lo anota en un diario en disco; las
+    anotaciones posteriores sobre la misma fila (mismo repositorio y claves de conflicto)
+    la sustituyen. Un hilo en segundo plano escribe todo lo pendiente en una sola
+    transacción cada `flush_interval` segundos, o antes si se acumulan `max_pending` filas;
+    así N confirmaciones (y N fsync de SQLite) se reducen a una.
+
+    El diario es de solo anexado y se descarta tras cada escritura confirmada. Si el
+    proceso termina sin vaciar la cola, `start()` lo reproduce en el siguiente arranque.
+    Con `fsync_journal` (el valor por defecto) cada `put()` sincroniza el diario con el
+    disco y un guardado encolado sobrevive también a una caída del sistema operativo o de
+    la alimentación. Con `fsync_journal=False` solo sobrevive a la caída del proceso: los
+    guardados de los últimos segundos pueden perderse si cae el equipo.
+
+    Las lecturas que deben ver lo encolado sin forzar una escritura combinan lo confirmado
+    con `pending_rows()`.
+    """
+    def __init__(
+        self,
+        uow_factory: Callable[[], IUnitOfWork],
+        journal_path: str = "sigvcf_write_behind.journal",
+        enabled: bool = False,
+        flush_interval: float = 2.0,
+        max_pending: int = 50,
+        fsync_journal: bool = True,
+    ):
+        self.uow_factory = uow_factory
+        self.enabled = enabled
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.fsync_journal = fsync_journal
+        self._ruta_diario = journal_path
+        self._ruta_en_vaciado = f"{journal_path}.flushing"
+
+        self._lock = threading.Lock()
+        # Serializa los vaciados: el del hilo de fondo y los que piden los servicios.
+        self._lock_vaciado = threading.Lock()
+        self._pendientes: Dict[Tuple[str, str], _Entrada] = {}
+        # Lo que un vaciado está escribiendo: sigue visible en pending_rows() hasta confirmarse.
+        self._en_escritura: Dict[Tuple[str, str], _Entrada] = {}
+        self._diario = None
+        self._despertar = threading.Event()
+        self._detener = threading.Event()
+        self._hilo: threading.Thread | None = None
+
+    # --- Ciclo de vida ---
+
+    def start(self) -> None:
+        """Reproduce el diario de una ejecución anterior y arranca el vaciado periódico."""
+        if not self.enabled or self._hilo is not None:
+            return
+        self._recuperar()
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._vaciar_periodicamente, name="sigvcf-write-behind", daemon=True)
+        self._hilo.start()
+
+    def stop(self) -> None:
+        """Detiene el hilo y escribe lo pendiente antes de salir."""
+        self._detener.set()
+        self._despertar.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+        if self.enabled:
+            self.flush()
+        with self._lock:
+            if self._diario is not None:
+                self._diario.close()
+                self._diario = None
+
+    def _vaciar_periodicamente(self) -> None:
+        while not self._detener.is_set():
+            self._despertar.wait(self.flush_interval)
+            self._despertar.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # Las filas siguen en la cola y en el diario; se reintenta en el siguiente ciclo.
+                logger.warning(f"No se pudieron escribir las escrituras diferidas: {e}")
+
+    # --- Encolado ---
+
+    def put(self, repositorio: str, conflict_keys: Sequence[str], fila: Dict[str, Any]) -> None:
+        """
+        Encola un upsert de `fila` en el repositorio `repositorio` de la Unidad de Trabajo
+        (p. ej. "programaciones_mensuales"), identificada por `conflict_keys`.
+        """
+        claves = tuple(conflict_keys)
+        entrada = (repositorio, claves, dict(fila))
+        with self._lock:
+            self._anotar([entrada])
+            self._pendientes[self._clave(entrada)] = entrada
+            lleno = len(self._pendientes) >= self.max_pending
+        if lleno:
+            self._despertar.set()
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pendientes)
+
+    def pending_rows(self, repositorio: str, model: type, **filtro) -> List[Dict[str, Any]]:
+        """
+        Filas encoladas y aún no confirmadas de `repositorio` cuyas columnas coinciden con
+        `filtro`, con las fechas ya restituidas según `model`. No escribe nada: sirve para
+        superponer lo pendiente a una lectura de lo confirmado.
+        """
+        with self._lock:
+            entradas = {**self._en_escritura, **self._pendientes}
+        filas = [self._decodificar(model, fila) for r, _, fila in entradas.values() if r == repositorio]
+        return [fila for fila in filas if all(fila.get(c) == v for c, v in filtro.items())]
+
+    @staticmethod
+    def _clave(entrada: _Entrada) -> Tuple[str, str]:
+        repositorio, claves, fila = entrada
+        return repositorio, json.dumps([fila[c] for c in claves], default=_a_json)
+
+    # --- Vaciado ---
+
+    def flush(self) -> int:
+        """
+        Escribe lo pendiente en una sola transacción y devuelve el número de filas.
+        Los servicios lo llaman antes de leer datos que podrían estar todavía en la cola.
+        Debe invocarse fuera de cualquier ámbito abierto de la Unidad de Trabajo.
+        """
+        with self._lock_vaciado:
+            with self._lock:
+                if not self._pendientes:
+                    return 0
+                self._en_escritura = self._pendientes
+                entradas = list(self._pendientes.values())
+                self._pendientes = {}
+                # Lo que llegue durante la escritura se anota en un diario nuevo.
+                self._cerrar_diario()
+                os.replace(self._ruta_diario, self._ruta_en_vaciado)
+
+            try:
+                self._escribir(entradas)
+            except Exception:
+                with self._lock:
+                    # Se devuelven a la cola sin pisar las versiones más recientes.
+                    for entrada in entradas:
+                        self._pendientes.setdefault(self._clave(entrada), entrada)
+                    self._en_escritura = {}
+                    self._reescribir_diario()
+                os.remove(self._ruta_en_vaciado)
+                raise
+
+            with self._lock:
+                self._en_escritura = {}
+            os.remove(self._ruta_en_vaciado)
+            logger.debug(f"Escrituras diferidas confirmadas: {len(entradas)} filas.")
+            return len(entradas)
+
+    def _escribir(self, entradas: List[_Entrada]) -> None:
+        uow = self.uow_factory()
+        try:
+            with uow:
+                for (repositorio, claves), filas in self._agrupar(entradas):
+                    repo = getattr(uow, repositorio)
+                    repo.upsert_many([self._decodificar(repo.model, f) for f in filas], claves)
+                uow.commit()
+        except IntegrityError:
+            # Una fila inválida (p. ej. un artículo eliminado) no debe bloquear a las demás.
+            self._escribir_por_fila(uow, entradas)
+
+    def _escribir_por_fila(self, uow: IUnitOfWork, entradas: List[_Entrada]) -> None:
+        with uow:
+            for repositorio, claves, fila in entradas:
+                try:
+                    with uow:
+                        repo = getattr(uow, repositorio)
+                        repo.upsert_many([self._decodificar(repo.model, fila)], claves)
+                        uow.commit()
+                except IntegrityError as e:
+                    logger.error(f"Se descarta la escritura diferida en '{repositorio}' {fila}: {e.orig}")
+            uow.commit()
+
+    @staticmethod
+    def _agrupar(entradas: List[_Entrada]):
+        """Agrupa por repositorio y claves, y por columnas, para ejecutar un executemany por grupo."""
+        def orden(entrada):
+            repositorio, claves, fila = entrada
+            return repositorio, claves, tuple(sorted(fila))
+        for (repositorio, claves, _), grupo in groupby(sorted(entradas, key=orden), key=orden):
+            yield (repositorio, claves), [fila for _, _, fila in grupo]
+
+    @staticmethod
+    def _decodificar(model: type, fila: Dict[str, Any]) -> Dict[str, Any]:
+        """Restituye las fechas que el diario guarda como texto ISO."""
+        columnas = inspect(model).columns
+        decodificada = dict(fila)
+        for nombre, valor in fila.items():
+            if not isinstance(valor, str) or nombre not in columnas:
+                continue
+            tipo = columnas[nombre].type.python_type
+            if tipo is datetime.datetime:
+                decodificada[nombre] = datetime.datetime.fromisoformat(valor)
+            elif tipo is datetime.date:
+                decodificada[nombre] = datetime.date.fromisoformat(valor)
+        return decodificada
+
+    # --- Diario ---
+
+    def _anotar(self, entradas: List[_Entrada]) -> None:
+        if self._diario is None:
+            self._diario = open(self._ruta_diario, "a", encoding="utf-8")
+        for repositorio, claves, fila in entradas:
+            self._diario.write(json.dumps({"r": repositorio, "k": claves, "f": fila}, default=_a_json) + "\n")
+        self._diario.flush()
+        if self.fsync_journal:
+            os.fsync(self._diario.fileno())
+
+    def _cerrar_diario(self) -> None:
+        if self._diario is None:
+            # Se crea vacío para que el renombrado posterior siempre tenga origen.
+            open(self._ruta_diario, "a", encoding="utf-8").close()
+        else:
+            self._diario.close()
+            self._diario = None
+
+    def _reescribir_diario(self) -> None:
+        self._cerrar_diario()
+        temporal = f"{self._ruta_diario}.tmp"
+        with open(temporal, "w", encoding="utf-8") as diario:
+            for repositorio, claves, fila in self._pendientes.values():
+                diario.write(json.dumps({"r": repositorio, "k": claves, "f": fila}, default=_a_json) + "\n")
+            diario.flush()
+            os.fsync(diario.fileno())
+        os.replace(temporal, self._ruta_diario)
+
+    def _recuperar(self) -> None:
+        """Carga en la cola lo anotado y no confirmado por una ejecución anterior."""
+        recuperadas = 0
+        with self._lock:
+            # El diario en vaciado es anterior al diario activo: se lee primero.
+            for ruta in (self._ruta_en_vaciado, self._ruta_diario):
+                if not os.path.exists(ruta):
+                    continue
+                with open(ruta, encoding="utf-8") as diario:
+                    for numero, linea in enumerate(diario, start=1):
+                        try:
+                            registro = json.loads(linea)
+                        except json.JSONDecodeError:
+                            # Una línea a medio escribir al caer el proceso.
+                            logger.warning(f"Se ignora la línea {numero} incompleta del diario {ruta}.")
+                            continue
+                        entrada = (registro["r"], tuple(registro["k"]), registro["f"])
+                        self._pendientes[self._clave(entrada)] = entrada
+                        recuperadas += 1
+            if recuperadas:
+                self._reescribir_diario()
+            if os.path.exists(self._ruta_en_vaciado):
+                os.remove(self._ruta_en_vaciado)
+        if recuperadas:
+            logger.info(f"Se recuperaron {recuperadas} escrituras diferidas del diario; se escriben ahora.")
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"No se pudieron escribir las escrituras recuperadas; se reintentará: {e}")
@@ -2,18 +2,31 @@ import os
 import shutil
 import webbrowser
 from typing import List
-from sqlalchemy.orm import joinedload
+from sqlalchemy import delete, select
+from sqlalchemy.orm import selectinload
 
+from sigvcf.infrastructure.dto_conversion import to_dto, to_dtos
+from sigvcf.infrastructure.persistence.loading import loader_plan
+from sigvcf.infrastructure.persistence.rows import DTORow
 from sigvcf.infrastructure.persistence.unit_of_work import IUnitOfWork
 from sigvcf.modules.administrativo.dto import ContratoDTO, OrdenCompraDTO
 from sigvcf.modules.proveedores.dto import ProveedorDTO
-from sigvcf.core.domain.models import Contrato, ArticuloContrato, OrdenDeCompra, Proveedor
+from sigvcf.core.domain.models import (
+    Contrato, ArticuloContrato, CorteInventario, MovimientoInventario, OrdenDeCompra, ProgramacionMensual, Proveedor,
+)
 
 class AdministrativoService:
     """
     Servicio de aplicación para el módulo Administrativo.
     Orquesta los casos de uso relacionados con la gestión de contratos y aprobación de compras.
     """
+    # Filas que apuntan a un artículo de contrato: mientras exista alguna, el artículo no
+    # puede quitarse del contrato (SQLite no hace cumplir las claves foráneas).
+    _REFERENCIAS_ARTICULO = (
+        (ProgramacionMensual.articulo_contrato_id, "programaciones mensuales"),
+        (MovimientoInventario.articulo_contrato_id, "movimientos de inventario"),
+        (CorteInventario.articulo_contrato_id, "cortes de inventario"),
+    )
     def __init__(self, uow: IUnitOfWork):
         self.uow = uow
 
@@ -26,10 +39,45 @@ class AdministrativoService:
         entity.fecha_inicio = dto.fecha_inicio
         entity.fecha_fin = dto.fecha_fin
         entity.proveedor_id = dto.proveedor_id
-        entity.articulos = [
-            ArticuloContrato(**art.model_dump()) for art in dto.articulos
-        ]
 
+    def _guardar_articulos(self, dto: ContratoDTO, contrato_id: int):
+        """
+        Sincroniza los artículos del contrato con los del DTO por id: actualiza los
+        existentes, inserta los nuevos (sin id) y elimina solo los que el DTO ya no trae.
+        Así los artículos conservan su fila, y con ella cant_consumida y cant_programada,
+        que mantienen los despachos y los triggers de programacion_mensual. Un artículo
+        con programaciones o movimientos de inventario no se puede quitar: quedarían huérfanos.
+        """
+        existentes = set(self.uow.session.execute(
+            select(ArticuloContrato.id).where(ArticuloContrato.contrato_id == contrato_id)
+        ).scalars())
+        ajenos = sorted(art.id for art in dto.articulos if art.id is not None and art.id not in existentes)
+        if ajenos:
+            raise ValueError(f"Los artículos {ajenos} no pertenecen al contrato {contrato_id}.")
+
+        eliminados = existentes - {art.id for art in dto.articulos}
+        if eliminados:
+            for referencia, descripcion in self._REFERENCIAS_ARTICULO:
+                referenciados = sorted(self.uow.session.execute(
+                    select(referencia).where(referencia.in_(eliminados)).distinct()
+                ).scalars())
+                if referenciados:
+                    raise ValueError(
+                        f"Los artículos {referenciados} tienen {descripcion} y no pueden "
+                        f"eliminarse del contrato {contrato_id}."
+                    )
+            self.uow.session.execute(
+                delete(ArticuloContrato).where(ArticuloContrato.id.in_(eliminados))
+                .execution_options(synchronize_session=False)
+            )
+        self.uow.articulos_contrato.update_many([
+            {**art.model_dump(), "contrato_id": contrato_id} for art in dto.articulos if art.id is not None
+        ])
+        self.uow.articulos_contrato.add_many([
+            {**art.model_dump(exclude={"id"}), "contrato_id": contrato_id} for art in dto.articulos if art.id is None
+        ])
+
+    @loader_plan(selectinload(Contrato.articulos))
     def crear_o_actualizar_contrato(self, contrato_dto: ContratoDTO) -> ContratoDTO:
         """
         Crea un nuevo contrato o actualiza uno existente junto con sus artículos.
@@ -42,40 +90,53 @@ class AdministrativoService:
                 contrato = self.uow.contratos.get(contrato_dto.id)
                 if not contrato:
                     raise ValueError(f"Contrato con id {contrato_dto.id} no encontrado para actualizar.")
-                
-                self.uow.session.query(ArticuloContrato).filter(
-                    ArticuloContrato.contrato_id == contrato.id
-                ).delete(synchronize_session=False)
             else:
                 contrato = Contrato()
                 self.uow.contratos.add(contrato)
 
             self._map_dto_to_entity(contrato_dto, contrato)
+            self.uow.session.flush()  # Asegura contrato.id para los artículos
+            self._guardar_articulos(contrato_dto, contrato.id)
+            # Los artículos cargados con el contrato quedaron desactualizados por las
+            # sentencias masivas: se recargan al convertir el resultado.
+            self.uow.session.expire(contrato, ["articulos"])
             self.uow.commit()
-            return ContratoDTO.from_orm(contrato)
+            return to_dto(ContratoDTO, contrato)
 
-    def listar_contratos(self) -> List[ContratoDTO]:
-        """Recupera una lista de todos los contratos con sus relaciones básicas."""
-        with self.uow:
-            contratos = self.uow.session.query(Contrato).options(
-                joinedload(Contrato.proveedor)
-            ).all()
-            return [ContratoDTO.from_orm(c) for c in contratos]
+    def listar_contratos(self) -> List[DTORow[ContratoDTO]]:
+        """Recupera una lista de todos los contratos (sin sus artículos)."""
+        with self.uow.readonly():
+            # Proyección de columnas: el listado no necesita los artículos de cada contrato.
+            return self.uow.contratos.project_rows(ContratoDTO)
 
+    @loader_plan(selectinload(Contrato.articulos))
     def obtener_contrato_por_id(self, contrato_id: int) -> ContratoDTO | None:
-        """Obtiene un contrato específico por su ID, precargando sus artículos."""
-        with self.uow:
-            contrato = self.uow.session.query(Contrato).options(
-                joinedload(Contrato.articulos),
-                joinedload(Contrato.proveedor)
-            ).filter(Contrato.id == contrato_id).one_or_none()
-            return ContratoDTO.from_orm(contrato) if contrato else None
+        """
+        Obtiene un contrato específico por su ID, precargando sus artículos.
+        Si ya fue archivado, se busca en el archivo histórico.
+        """
+        with self.uow.readonly():
+            contrato = self.uow.contratos.get(contrato_id)
+            if contrato:
+                return to_dto(ContratoDTO, contrato)
+        if not self.uow.archive_available:
+            return None
+        with self.uow.readonly(archive=True):
+            contrato = self.uow.contratos.get(contrato_id)
+            return to_dto(ContratoDTO, contrato) if contrato else None
+
+    def listar_contratos_archivados(self) -> List[DTORow[ContratoDTO]]:
+        """Contratos cerrados que se movieron al archivo histórico (sin sus artículos)."""
+        if not self.uow.archive_available:
+            return []
+        with self.uow.readonly(archive=True):
+            return self.uow.contratos.project_rows(ContratoDTO)
 
     def listar_proveedores(self) -> List[ProveedorDTO]:
         """Recupera una lista de todos los proveedores."""
-        with self.uow:
+        with self.uow.readonly():
             proveedores = self.uow.proveedores.list()
-            return [ProveedorDTO.from_orm(p) for p in proveedores]
+            return to_dtos(ProveedorDTO, proveedores)
 
     def guardar_archivo_expediente(self, contrato_id: int, ruta_origen: str) -> str:
         """Copia un archivo de expediente a una carpeta gestionada y devuelve la ruta relativa."""
@@ -105,18 +166,17 @@ class AdministrativoService:
     def aprobar_orden_de_compra(self, orden_id: int) -> None:
         """Aprueba una orden de compra que está en estado 'BORRADOR'."""
         with self.uow:
-            orden = self.uow.ordenes_de_compra.get(orden_id)
-            if not orden:
-                raise ValueError(f"Orden de compra con id {orden_id} no encontrada.")
-            if orden.estado != 'BORRADOR':
+            # Transición atómica: solo se lee la orden si no se pudo aplicar, para explicar por qué.
+            if not self.uow.ordenes_de_compra.transition(orden_id, 'BORRADOR', 'APROBADA'):
+                orden = self.uow.ordenes_de_compra.get(orden_id)
+                if not orden:
+                    raise ValueError(f"Orden de compra con id {orden_id} no encontrada.")
                 raise ValueError(f"La orden {orden_id} no está en estado 'BORRADOR', sino '{orden.estado}'.")
-            
-            orden.estado = 'APROBADA'
             self.uow.commit()
 
     def listar_ordenes_pendientes_aprobacion(self) -> List[OrdenCompraDTO]:
         """Devuelve una lista de todas las órdenes de compra en estado 'BORRADOR'."""
-        with self.uow:
+        with self.uow.readonly():
             ordenes_pendientes = self.uow.ordenes_de_compra.find(estado='BORRADOR')
-            return [OrdenCompraDTO.from_orm(o) for o in ordenes_pendientes]
+            return to_dtos(OrdenCompraDTO, ordenes_pendientes)
 
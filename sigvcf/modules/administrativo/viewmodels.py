@@ -7,6 +7,7 @@ from typing import List, Dict, Any
 from sigvcf.modules.administrativo.services import AdministrativoService
 from sigvcf.modules.administrativo.dto import ContratoDTO, ArticuloContratoDTO
 from sigvcf.modules.proveedores.dto import ProveedorDTO
+from sigvcf.modules.busqueda.services import SearchService
 
 class ContratoViewModel(QObject):
     """
@@ -24,10 +25,12 @@ class ContratoViewModel(QObject):
     def __init__(
         self,
         administrativo_service: AdministrativoService = Provide["Container.administrativo_service"],
+        search_service: SearchService = Provide["Container.search_service"],
         parent: QObject | None = None
     ):
         super().__init__(parent)
         self._administrativo_service = administrativo_service
+        self._search_service = search_service
         self._contrato_actual_id = None
 
     @Slot()
@@ -42,6 +45,21 @@ class ContratoViewModel(QObject):
         except Exception as e:
             self.status_message.emit(f"Error al cargar datos: {e}")
 
+    @Slot(str)
+    def buscar_contratos(self, texto: str):
+        """
+        Filtra la lista de contratos por licitación, proveedor o artículo con el índice
+        de texto completo; sin texto se vuelve a la lista completa.
+        """
+        try:
+            if texto.strip():
+                contratos_dto = self._search_service.buscar_contratos(texto)
+            else:
+                contratos_dto = self._administrativo_service.listar_contratos()
+            self.contratos_changed.emit(contratos_dto)
+        except Exception as e:
+            self.status_message.emit(f"Error al buscar contratos: {e}")
+
     @Slot(int)
     def seleccionar_contrato(self, contrato_id: int):
         """Carga los detalles completos de un contrato para su edición."""
@@ -1,7 +1,7 @@
 import sys
 import qtawesome as qta
 from typing import List, Dict, Any
-from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate, QSortFilterProxyModel, Signal
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate, QSortFilterProxyModel, QTimer, Signal
 from PySide6.QtWidgets import (
     QWidget, QHBoxLayout, QVBoxLayout, QTableView, QPushButton, QGroupBox,
     QFormLayout, QLineEdit, QComboBox, QDateEdit, QMessageBox, QLabel
@@ -132,9 +132,8 @@ class ContratosView(QWidget):
 
         self.source_model = ContratosTableModel()
         self.proxy_model = QSortFilterProxyModel()
+        # El proxy solo ordena: el filtrado lo resuelve el índice de búsqueda en la base.
         self.proxy_model.setSourceModel(self.source_model)
-        self.proxy_model.setFilterKeyColumn(1)
-        self.proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
         self.contracts_table.setModel(self.proxy_model)
         
         self._connect_signals()
@@ -145,7 +144,11 @@ class ContratosView(QWidget):
 
         left_panel = QVBoxLayout()
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Buscar por Cód. Licitación...")
+        self.search_input.setPlaceholderText("Buscar por licitación, proveedor o artículo...")
+        # Espera a que el usuario deje de escribir para no consultar en cada tecla.
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
         self.contracts_table = QTableView()
         self.contracts_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.contracts_table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
@@ -210,7 +213,8 @@ class ContratosView(QWidget):
         main_layout.addWidget(right_panel, 2)
 
     def _connect_signals(self):
-        self.search_input.textChanged.connect(self.proxy_model.setFilterRegularExpression)
+        self.search_input.textChanged.connect(self.search_timer.start)
+        self.search_timer.timeout.connect(lambda: self.vm.buscar_contratos(self.search_input.text()))
         self.new_contract_button.clicked.connect(self.vm.crear_nuevo_contrato)
         self.contracts_table.selectionModel().selectionChanged.connect(self._on_contract_selected)
         self.save_button.clicked.connect(self._on_save_clicked)
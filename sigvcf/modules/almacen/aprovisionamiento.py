@@ -0,0 +1,151 @@
+"""
+Motor de aprovisionamiento: calcula las órdenes de compra a proponer a partir de la
+demanda consolidada de ProgramacionMensual.
+
+La demanda del periodo se carga como una matriz artículos × días de NumPy, se descuenta
+contra la capacidad restante de cada artículo en su contrato (cant_maxima - cant_consumida)
+y se agrupa por contrato y ventana de entrega. Todo el cálculo se hace con operaciones
+sobre arreglos completos: el costo en Python no depende del número de artículos ni de días.
+"""
+import datetime
+import itertools
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from sqlalchemy import Date, Integer, cast, func, literal, select
+from sqlalchemy.orm import Session
+
+from sigvcf.core.domain.models import ArticuloContrato, OrdenDeCompra, ProgramacionDia, ProgramacionMensual
+from sigvcf.modules.almacen.dto import OrdenCompraCreateDTO
+
+
+@dataclass(frozen=True)
+class MatrizDemanda:
+    """Demanda programada del periodo: `cantidades[i, d]` del artículo `articulo_ids[i]` el día `desde + d`."""
+    desde: datetime.date
+    articulo_ids: np.ndarray
+    cantidades: np.ndarray
+
+    @property
+    def dias(self) -> int:
+        return self.cantidades.shape[1]
+
+
+def _primer_dia_del_mes(fecha: datetime.date) -> datetime.date:
+    return fecha.replace(day=1)
+
+
+def _enteros(filas, columnas: int) -> np.ndarray:
+    # np.array() sobre objetos Row los sondea uno por uno como posibles arreglos;
+    # aplanarlos con chain y np.fromiter es un orden de magnitud más rápido.
+    return np.fromiter(
+        itertools.chain.from_iterable(filas), dtype=np.int64, count=len(filas) * columnas
+    ).reshape(-1, columnas)
+
+
+def _dias_desde(columna, fecha: datetime.date):
+    # julianday de dos fechas a medianoche difiere en un número entero de días.
+    return cast(func.julianday(columna) - func.julianday(literal(fecha, Date)), Integer)
+
+
+def cargar_demanda(session: Session, desde: datetime.date, hasta: datetime.date) -> MatrizDemanda:
+    """
+    Carga en una sola consulta la demanda diaria programada entre `desde` y `hasta`
+    (inclusive). El día se calcula en SQL como desplazamiento respecto de `desde`, de modo
+    que las filas llegan como enteros y se colocan en la matriz sin convertir fechas en Python.
+    """
+    dias = (hasta - desde).days + 1
+    if dias <= 0:
+        raise ValueError("La fecha final del periodo debe ser igual o posterior a la inicial.")
+
+    desplazamiento = _dias_desde(ProgramacionMensual.mes_anho, desde) + ProgramacionDia.dia - 1
+    # Último día del mes de la programación: descarta claves como el 31 de febrero.
+    dias_del_mes = cast(func.strftime('%d', func.date(ProgramacionMensual.mes_anho, '+1 month', '-1 day')), Integer)
+    stmt = (
+        select(ProgramacionMensual.articulo_contrato_id, desplazamiento, ProgramacionDia.cantidad)
+        .join(ProgramacionDia, ProgramacionDia.programacion_id == ProgramacionMensual.id)
+        .where(
+            ProgramacionMensual.mes_anho >= _primer_dia_del_mes(desde),
+            ProgramacionMensual.mes_anho <= hasta,
+            ProgramacionDia.dia <= dias_del_mes,
+            ProgramacionDia.cantidad > 0,
+        )
+    )
+    # Por la conexión (Core): las filas no pasan por la capa de carga del ORM.
+    datos = _enteros(session.connection().execute(stmt).all(), 3)
+    # Los meses de los extremos aportan días fuera del periodo.
+    datos = datos[(datos[:, 1] >= 0) & (datos[:, 1] < dias)]
+
+    articulo_ids, fila = np.unique(datos[:, 0], return_inverse=True)
+    cantidades = np.zeros((len(articulo_ids), dias), dtype=np.int64)
+    # Hay una programación por artículo y mes, así que cada (artículo, día) aparece una vez.
+    cantidades[fila, datos[:, 1]] = datos[:, 2]
+    return MatrizDemanda(desde=desde, articulo_ids=articulo_ids, cantidades=cantidades)
+
+
+def calcular_propuestas(session: Session, desde: datetime.date, hasta: datetime.date,
+                        dias_ventana: int = 7) -> List[OrdenCompraCreateDTO]:
+    """
+    Propone una orden de compra por contrato y ventana de entrega de `dias_ventana` días
+    con demanda neta positiva, con fecha de entrega al inicio de la ventana.
+
+    La demanda neta de cada artículo es la que cabe en su capacidad restante, atendida en
+    orden cronológico: cuando el acumulado programado supera cant_maxima - cant_consumida,
+    los días siguientes ya no generan pedido. Se omiten las ventanas en las que el contrato
+    ya tiene una orden de compra, para que volver a planear el mismo periodo no duplique
+    las propuestas.
+    """
+    if dias_ventana < 1:
+        raise ValueError("La ventana de entrega debe ser de al menos un día.")
+    demanda = cargar_demanda(session, desde, hasta)
+    if not len(demanda.articulo_ids):
+        return []
+    conexion = session.connection()
+
+    # Contrato y capacidad restante de cada artículo, ordenados por contrato. Se leen todos
+    # y se filtran aquí: una lista IN con decenas de miles de ids excede los parámetros de SQLite.
+    capacidad = _enteros(conexion.execute(
+        select(
+            ArticuloContrato.id,
+            ArticuloContrato.contrato_id,
+            ArticuloContrato.cant_maxima - func.coalesce(ArticuloContrato.cant_consumida, 0),
+        )
+        .where(ArticuloContrato.contrato_id.is_not(None))
+        .order_by(ArticuloContrato.contrato_id, ArticuloContrato.id)
+    ).all(), 3)
+    # Programaciones de artículos inexistentes o sin contrato quedan fuera.
+    capacidad = capacidad[np.isin(capacidad[:, 0], demanda.articulo_ids)]
+    if not len(capacidad):
+        return []
+    filas = np.searchsorted(demanda.articulo_ids, capacidad[:, 0])
+    cantidades = demanda.cantidades[filas]
+    restante = np.maximum(capacidad[:, 2], 0)
+
+    # Demanda neta: el acumulado se recorta a la capacidad y se vuelve a diferenciar.
+    acumulado = np.minimum(np.cumsum(cantidades, axis=1), restante[:, None])
+    neta = np.diff(acumulado, axis=1, prepend=0)
+
+    # Suma por ventanas de entrega (la última puede ser más corta) y luego por contrato.
+    ventanas = -(-demanda.dias // dias_ventana)
+    por_ventana = np.add.reduceat(neta, np.arange(0, demanda.dias, dias_ventana), axis=1)
+    contratos, inicio_contrato = np.unique(capacidad[:, 1], return_index=True)
+    por_contrato = np.add.reduceat(por_ventana, inicio_contrato, axis=0)
+
+    # Ventanas en las que cada contrato ya tiene una orden de compra programada.
+    existentes = _enteros(conexion.execute(
+        select(OrdenDeCompra.contrato_id, _dias_desde(OrdenDeCompra.fecha_entrega_programada, desde))
+        .where(OrdenDeCompra.contrato_id.is_not(None), OrdenDeCompra.fecha_entrega_programada.between(desde, hasta))
+    ).all(), 2)
+    existentes = existentes[np.isin(existentes[:, 0], contratos)]
+    if len(existentes):
+        por_contrato[np.searchsorted(contratos, existentes[:, 0]), existentes[:, 1] // dias_ventana] = 0
+
+    contrato_idx, ventana_idx = np.nonzero(por_contrato > 0)
+    fechas = [desde + datetime.timedelta(days=int(v) * dias_ventana) for v in range(ventanas)]
+    # Datos ya validados por el esquema: se construyen sin pasar por el validador.
+    return [
+        OrdenCompraCreateDTO.model_construct(contrato_id=int(contratos[c]), fecha_entrega_programada=fechas[v])
+        for c, v in zip(contrato_idx.tolist(), ventana_idx.tolist())
+    ]
+
@@ -19,11 +19,27 @@ class OrdenCompraDTO(OrdenCompraCreateDTO):
 
 # --- DTOs para Entradas de Bodega ---
 
+class ArticuloRecibidoDTO(BaseModel):
+    """Cantidad recibida de un artículo del contrato en una entrada de bodega."""
+    articulo_contrato_id: int
+    cantidad: int = Field(gt=0)
+
+class ArticuloOrdenDTO(BaseModel):
+    """Artículo del contrato de una orden de compra, para capturar lo recibido en la entrada."""
+    articulo_contrato_id: int
+    clave_articulo: str
+    descripcion: str
+    unidad_medida: str
+
+    model_config = ConfigDict(from_attributes=True)
+
 class EntradaBodegaCreateDTO(BaseModel):
     """DTO para registrar una nueva entrada de mercancía."""
     orden_compra_id: int
     factura_xml_path: str
     recepcionista_id: int
+    # Cada artículo recibido se registra como un movimiento de entrada en el inventario.
+    articulos: List[ArticuloRecibidoDTO] = []
 
 class EntradaBodegaDTO(EntradaBodegaCreateDTO):
     """DTO completo para representar una entrada de bodega."""
@@ -45,6 +61,12 @@ class SalidaRequerimientoDTO(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class ResultadoDespachoDTO(BaseModel):
+    """Resultado del despacho de un requerimiento dentro de un lote de escaneos."""
+    qr_id: str
+    despachado: bool
+    mensaje: str
+
 # --- DTO para Control de Inventario ---
 
 class StockStatusDTO(BaseModel):
@@ -59,4 +81,24 @@ class StockStatusDTO(BaseModel):
     def stock_disponible(self) -> int:
         return self.cant_maxima - self.cant_consumida
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+class ExistenciaDTO(BaseModel):
+    """Existencia de un artículo en una fecha, calculada a partir del libro de movimientos."""
+    articulo_contrato_id: int
+    clave_articulo: str
+    descripcion: str
+    existencia: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+class MovimientoInventarioDTO(BaseModel):
+    """DTO para auditar un movimiento del libro de inventario."""
+    id: int
+    articulo_contrato_id: int
+    fecha: datetime
+    tipo: str
+    cantidad: int
+    referencia: str
+
+    model_config = ConfigDict(from_attributes=True)
@@ -1,144 +1,427 @@
 import datetime
-from typing import List
+import logging
+from typing import List, Sequence, Tuple
+from sqlalchemy import DateTime, func, insert, literal, select, update
+from sigvcf.infrastructure.dto_conversion import to_dto, to_dtos
+from sigvcf.infrastructure.persistence.rows import DTORow
+from sigvcf.infrastructure.persistence.sequence import SequenceService
 from sigvcf.infrastructure.persistence.unit_of_work import IUnitOfWork
+from sigvcf.infrastructure.persistence.write_behind import WriteBehindQueue
+from sigvcf.modules.almacen import aprovisionamiento
 from sigvcf.modules.almacen.dto import (
     OrdenCompraDTO,
     EntradaBodegaCreateDTO,
     EntradaBodegaDTO,
     StockStatusDTO,
-    OrdenCompraCreateDTO
+    OrdenCompraCreateDTO,
+    ExistenciaDTO,
+    MovimientoInventarioDTO,
+    ArticuloOrdenDTO,
+    ResultadoDespachoDTO,
 )
-from sigvcf.core.domain.models import OrdenDeCompra, EntradaBodega
+from sigvcf.core.domain.models import (
+    ArticuloContrato, Contrato, OrdenDeCompra, ProgramacionMensual, ProgramacionDia,
+    MovimientoInventario, CorteInventario,
+)
+
+logger = logging.getLogger(__name__)
 
 class AlmacenService:
     """
     Servicio de aplicación para el módulo de Almacén.
     Orquesta los casos de uso de aprovisionamiento, entradas y salidas.
     """
-    def __init__(self, uow: IUnitOfWork):
+    def __init__(self, uow: IUnitOfWork, write_queue: WriteBehindQueue | None = None):
         self.uow = uow
+        self.write_queue = write_queue
+        self.folios = SequenceService(uow)
+
+    def calcular_propuestas_aprovisionamiento(self, desde: datetime.date, hasta: datetime.date,
+                                              dias_ventana: int = 7) -> List[OrdenCompraCreateDTO]:
+        """
+        Calcula las órdenes de compra a proponer entre `desde` y `hasta` a partir de la demanda
+        consolidada de las programaciones mensuales, descontada contra la capacidad restante
+        de cada contrato y agrupada en ventanas de entrega de `dias_ventana` días.
+        El resultado se persiste con generar_propuesta_aprovisionamiento().
+        """
+        with self.uow.readonly():
+            return aprovisionamiento.calcular_propuestas(self.uow.session, desde, hasta, dias_ventana)
 
     def generar_propuesta_aprovisionamiento(self, propuestas: List[OrdenCompraCreateDTO]) -> List[OrdenCompraDTO]:
         """
         Crea nuevas órdenes de compra en estado 'BORRADOR' a partir de una lista de propuestas.
         Estas propuestas serían el resultado del análisis de la demanda consolidada.
         """
-        ordenes_creadas = []
         with self.uow:
+            # Validar en una sola consulta que todos los contratos existen
+            contrato_ids = {propuesta.contrato_id for propuesta in propuestas}
+            existentes = set(self.uow.session.execute(
+                select(Contrato.id).where(Contrato.id.in_(contrato_ids))
+            ).scalars())
             for propuesta in propuestas:
-                # Validar que el contrato existe
-                contrato = self.uow.contratos.get(propuesta.contrato_id)
-                if not contrato:
+                if propuesta.contrato_id not in existentes:
                     raise ValueError(f"Contrato con id {propuesta.contrato_id} no encontrado.")
-                
-                nueva_orden = OrdenDeCompra(
-                    contrato_id=propuesta.contrato_id,
-                    fecha_entrega_programada=propuesta.fecha_entrega_programada,
-                    estado='BORRADOR' # Estado inicial para ser aprobado por el área administrativa
-                )
-                self.uow.ordenes_de_compra.add(nueva_orden)
-                ordenes_creadas.append(nueva_orden)
-            
+
+            # Estado inicial 'BORRADOR' para ser aprobado por el área administrativa
+            ordenes_creadas = self.uow.ordenes_de_compra.add_many(
+                [
+                    {
+                        "contrato_id": propuesta.contrato_id,
+                        "fecha_entrega_programada": propuesta.fecha_entrega_programada,
+                        "estado": 'BORRADOR',
+                    }
+                    for propuesta in propuestas
+                ],
+                returning=True,
+            )
+            ordenes_dto = to_dtos(OrdenCompraDTO, ordenes_creadas)
             self.uow.commit()
-            
+
             # Devolvemos los DTOs de las órdenes creadas
-            return [OrdenCompraDTO.from_orm(oc) for oc in ordenes_creadas]
+            return ordenes_dto
+
+    def obtener_articulos_orden(self, orden_id: int) -> List[DTORow[ArticuloOrdenDTO]]:
+        """Artículos del contrato de la orden de compra, en los que se captura lo recibido."""
+        with self.uow.readonly():
+            contrato_de_la_orden = select(OrdenDeCompra.contrato_id).where(OrdenDeCompra.id == orden_id)
+            return self.uow.articulos_contrato.project_rows(
+                ArticuloOrdenDTO,
+                ArticuloContrato.contrato_id == contrato_de_la_orden.scalar_subquery(),
+                columns={"articulo_contrato_id": ArticuloContrato.id},
+                order_by=ArticuloContrato.id,
+            )
 
     def registrar_entrada_bodega(self, entrada_dto: EntradaBodegaCreateDTO) -> EntradaBodegaDTO:
         """
         Registra la recepción de mercancía, validando contra la orden de compra.
-        Genera un Folio R.B. único.
+        Genera un Folio R.B. único y anota los artículos recibidos en el libro de movimientos.
         """
+        return self.registrar_entradas_bodega([entrada_dto])[0]
+
+    def registrar_entradas_bodega(self, entradas: Sequence[EntradaBodegaCreateDTO]) -> List[EntradaBodegaDTO]:
+        """
+        Registra una recepción masiva en una sola transacción: si alguna orden no puede
+        recibirse, no se registra ninguna. Los Folios R.B. del lote se reservan juntos en el
+        contador diario, y las entradas y sus movimientos se insertan con un executemany cada uno.
+        """
+        if not entradas:
+            return []
         with self.uow:
-            orden_compra = self.uow.ordenes_de_compra.get(entrada_dto.orden_compra_id)
-            if not orden_compra:
-                raise ValueError(f"Orden de compra con id {entrada_dto.orden_compra_id} no encontrada.")
-            if orden_compra.estado != 'APROBADA':
-                raise ValueError(f"La orden de compra {orden_compra.id} no está en estado 'APROBADA'.")
-
-            # Generar Folio R.B. (Recibo de Bodega)
-            timestamp = datetime.datetime.utcnow().strftime("%Y%m%d%H%M%S")
-            folio_rb = f"RB-{timestamp}-{orden_compra.id}"
-
-            nueva_entrada = EntradaBodega(
-                folio_rb=folio_rb,
-                orden_compra_id=entrada_dto.orden_compra_id,
-                factura_xml_path=entrada_dto.factura_xml_path,
-                recepcionista_id=entrada_dto.recepcionista_id,
-                fecha_recepcion=datetime.datetime.utcnow()
-            )
-            
-            # Cambiar estado de la orden de compra a 'RECIBIDA'
-            orden_compra.estado = 'RECIBIDA'
+            for entrada_dto in entradas:
+                orden_id = entrada_dto.orden_compra_id
+                # Sin artículos la entrada no suma nada al libro de movimientos, y los despachos
+                # dejarían la existencia en negativo.
+                if not entrada_dto.articulos:
+                    raise ValueError(f"La entrada de la orden de compra {orden_id} no tiene artículos recibidos.")
+                # Cambiar estado de la orden de compra a 'RECIBIDA' en un UPDATE condicional:
+                # dos recepciones simultáneas de la misma orden no pueden registrarse ambas.
+                if not self.uow.ordenes_de_compra.transition(orden_id, 'APROBADA', 'RECIBIDA'):
+                    if not self.uow.ordenes_de_compra.get(orden_id):
+                        raise ValueError(f"Orden de compra con id {orden_id} no encontrada.")
+                    raise ValueError(f"La orden de compra {orden_id} no está en estado 'APROBADA'.")
 
-            self.uow.entradas_bodega.add(nueva_entrada)
+            # Folios R.B. (Recibo de Bodega): un bloque del contador del día para todo el lote.
+            folios = self.folios.reservar("RB", len(entradas))
+            fecha_recepcion = datetime.datetime.utcnow()
+            creadas = self.uow.entradas_bodega.add_many(
+                [
+                    {
+                        "folio_rb": folio_rb,
+                        "orden_compra_id": entrada_dto.orden_compra_id,
+                        "factura_xml_path": entrada_dto.factura_xml_path,
+                        "recepcionista_id": entrada_dto.recepcionista_id,
+                        "fecha_recepcion": fecha_recepcion,
+                    }
+                    for entrada_dto, folio_rb in zip(entradas, folios)
+                ],
+                returning=True,
+            )
+            self._registrar_movimientos_entrada(list(zip(entradas, folios)), fecha_recepcion)
+            # RETURNING no garantiza el orden de las filas: se emparejan por folio.
+            por_folio = {entrada.folio_rb: entrada for entrada in creadas}
+            entradas_dto = [
+                to_dto(EntradaBodegaDTO, por_folio[folio_rb]).model_copy(update={"articulos": entrada_dto.articulos})
+                for entrada_dto, folio_rb in zip(entradas, folios)
+            ]
             self.uow.commit()
-            
-            return EntradaBodegaDTO.from_orm(nueva_entrada)
+            return entradas_dto
+
+    def _registrar_movimientos_entrada(self, recibidas: List[Tuple[EntradaBodegaCreateDTO, str]],
+                                       fecha: datetime.datetime) -> None:
+        """
+        Anota como entradas los artículos recibidos (con el folio de su entrada), que deben
+        pertenecer al contrato de su orden. Se validan todos con una sola consulta.
+        """
+        pares = {
+            (entrada_dto.orden_compra_id, a.articulo_contrato_id)
+            for entrada_dto, _ in recibidas for a in entrada_dto.articulos
+        }
+        if not pares:
+            return
+        validos = set(self.uow.session.execute(
+            select(OrdenDeCompra.id, ArticuloContrato.id)
+            .join(ArticuloContrato, ArticuloContrato.contrato_id == OrdenDeCompra.contrato_id)
+            .where(
+                OrdenDeCompra.id.in_({orden_id for orden_id, _ in pares}),
+                ArticuloContrato.id.in_({articulo_id for _, articulo_id in pares}),
+            )
+        ).tuples())
+        for entrada_dto, _ in recibidas:
+            ajenos = sorted(
+                a.articulo_contrato_id for a in entrada_dto.articulos
+                if (entrada_dto.orden_compra_id, a.articulo_contrato_id) not in validos
+            )
+            if ajenos:
+                raise ValueError(
+                    f"Los artículos {ajenos} no pertenecen al contrato de la orden {entrada_dto.orden_compra_id}."
+                )
+        self.uow.movimientos_inventario.add_many([
+            {"articulo_contrato_id": a.articulo_contrato_id, "fecha": fecha, "tipo": 'ENTRADA',
+             "cantidad": a.cantidad, "referencia": folio_rb}
+            for entrada_dto, folio_rb in recibidas for a in entrada_dto.articulos
+        ])
 
     def despachar_requerimiento(self, qr_id: str) -> None:
         """
         Procesa el despacho de un requerimiento escaneado por QR.
         Cambia el estado de 'PREVIA' a 'SURTIDA' y actualiza el stock consumido.
         """
+        # El stock se descuenta según las programaciones: deben incluir las aún encoladas.
+        if self.write_queue is not None and self.write_queue.enabled:
+            self.write_queue.flush()
         with self.uow:
-            resultados = self.uow.salidas_requerimiento.find(qr_id=qr_id)
-            if not resultados:
-                raise ValueError(f"Requerimiento con QR ID '{qr_id}' no encontrado.")
-            
-            requerimiento = resultados[0]
-            
-            if requerimiento.estado != 'PREVIA':
-                raise ValueError(f"El requerimiento '{qr_id}' no está en estado 'PREVIA' para ser despachado.")
-            
-            # --- Implementación de la lógica de inventario ---
-            self._decrementar_stock_asociado(requerimiento)
-            
-            requerimiento.estado = 'SURTIDA'
+            self._despachar(qr_id)
+            self.uow.commit()
+
+    def despachar_requerimientos(self, qr_ids: Sequence[str]) -> List[ResultadoDespachoDTO]:
+        """
+        Despacha un lote de requerimientos escaneados (p. ej. en el andén de carga) en una
+        sola transacción y devuelve el resultado de cada QR en el orden recibido.
+        Cada requerimiento se procesa en su propio SAVEPOINT: uno inválido o ya surtido se
+        informa en su resultado sin deshacer los demás.
+        """
+        if self.write_queue is not None and self.write_queue.enabled:
+            self.write_queue.flush()
+        resultados = []
+        vistos = set()
+        with self.uow:
+            for qr_id in qr_ids:
+                if qr_id in vistos:
+                    resultados.append(ResultadoDespachoDTO(
+                        qr_id=qr_id, despachado=False, mensaje="Escaneado más de una vez en el lote."
+                    ))
+                    continue
+                vistos.add(qr_id)
+                try:
+                    with self.uow:
+                        self._despachar(qr_id)
+                except ValueError as e:
+                    resultados.append(ResultadoDespachoDTO(qr_id=qr_id, despachado=False, mensaje=str(e)))
+                else:
+                    resultados.append(ResultadoDespachoDTO(qr_id=qr_id, despachado=True, mensaje="Despachado."))
             self.uow.commit()
+        return resultados
+
+    def _despachar(self, qr_id: str) -> None:
+        # El requerimiento se reclama primero con un UPDATE condicional: si dos terminales
+        # escanean el mismo QR, la segunda ya no lo encuentra en 'PREVIA' y no descuenta stock.
+        if not self.uow.salidas_requerimiento.transition(qr_id, 'PREVIA', 'SURTIDA', by="qr_id"):
+            if not self.uow.salidas_requerimiento.find_one_by(qr_id=qr_id):
+                raise ValueError(f"Requerimiento con QR ID '{qr_id}' no encontrado.")
+            raise ValueError(f"El requerimiento '{qr_id}' no está en estado 'PREVIA' para ser despachado.")
+
+        # --- Implementación de la lógica de inventario ---
+        self._decrementar_stock_asociado(qr_id)
 
-    def _decrementar_stock_asociado(self, requerimiento):
+    def _decrementar_stock_asociado(self, qr_id: str):
         """
-        Busca las programaciones mensuales asociadas al requerimiento y actualiza
-        la cantidad consumida de cada artículo de contrato.
+        Busca las programaciones mensuales asociadas al requerimiento, actualiza
+        la cantidad consumida de cada artículo de contrato y anota las salidas en el
+        libro de movimientos. Son dos sentencias de conjunto (INSERT ... SELECT y
+        UPDATE ... FROM) sobre el total del mes por artículo, sin importar cuántos haya.
         """
         try:
             # El QR ID contiene el mes y año: "REQ-YYYYMM-..."
-            parts = requerimiento.qr_id.split('-')
+            parts = qr_id.split('-')
             year_month_str = parts[1]
             year = int(year_month_str[:4])
             month = int(year_month_str[4:])
             mes_requerimiento = datetime.date(year, month, 1)
         except (IndexError, ValueError):
-            raise ValueError(f"Formato de QR ID '{requerimiento.qr_id}' inválido. No se pudo extraer el mes.")
+            raise ValueError(f"Formato de QR ID '{qr_id}' inválido. No se pudo extraer el mes.")
 
-        # Buscar todas las programaciones para ese mes
-        programaciones_del_mes = self.uow.programaciones_mensuales.find(mes_anho=mes_requerimiento)
+        # Total programado de cada artículo en el mes, sumado en SQL sobre programacion_dia.
+        totales_del_mes = (
+            select(
+                ProgramacionMensual.articulo_contrato_id.label("articulo_contrato_id"),
+                func.sum(ProgramacionDia.cantidad).label("cantidad"),
+            )
+            .join(ProgramacionDia, ProgramacionDia.programacion_id == ProgramacionMensual.id)
+            .where(ProgramacionMensual.mes_anho == mes_requerimiento)
+            # Hay una programación por artículo y mes: agrupar por su id equivale a agrupar por
+            # artículo y sigue el orden del índice por mes, sin ordenar en un B-tree temporal.
+            .group_by(ProgramacionMensual.id)
+            .having(func.sum(ProgramacionDia.cantidad) > 0)
+            .subquery("totales_del_mes")
+        )
 
-        if not programaciones_del_mes:
+        # Operación de conjunto: una sentencia para el libro y otra para el stock, sin
+        # importar cuántos artículos tenga el mes. Ambas leen el mismo agregado.
+        salidas = self.uow.session.execute(
+            insert(MovimientoInventario).from_select(
+                ["articulo_contrato_id", "fecha", "tipo", "cantidad", "referencia"],
+                select(
+                    totales_del_mes.c.articulo_contrato_id,
+                    literal(datetime.datetime.utcnow(), DateTime),
+                    literal('SALIDA'),
+                    -totales_del_mes.c.cantidad,
+                    literal(qr_id),
+                )
+                # Solo artículos existentes, igual que el UPDATE de abajo.
+                .join(ArticuloContrato, ArticuloContrato.id == totales_del_mes.c.articulo_contrato_id),
+            )
+        ).rowcount
+        if not salidas:
             # Podría ser un caso válido si se genera un requerimiento vacío, pero es bueno loggearlo.
-            print(f"Advertencia: No se encontraron programaciones para el mes de {mes_requerimiento.strftime('%Y-%m')} al despachar el requerimiento {requerimiento.qr_id}")
+            logger.warning(
+                f"No se encontraron programaciones para el mes de {mes_requerimiento.strftime('%Y-%m')} "
+                f"al despachar el requerimiento {qr_id}"
+            )
             return
 
-        for prog in programaciones_del_mes:
-            cantidad_a_despachar = sum(prog.cantidades_por_dia.values())
-            
-            if cantidad_a_despachar > 0:
-                articulo = self.uow.articulos_contrato.get(prog.articulo_contrato_id)
-                if not articulo:
-                    # Esto indica una inconsistencia de datos. Es importante registrarlo.
-                    print(f"ERROR CRÍTICO: El artículo de contrato ID {prog.articulo_contrato_id} de una programación no fue encontrado.")
-                    continue
-                
-                # Incrementar la cantidad consumida
-                articulo.cant_consumida += cantidad_a_despachar
+        # UPDATE ... FROM: incrementa cant_consumida del lado de SQL, sin leer los artículos.
+        self.uow.session.execute(
+            update(ArticuloContrato)
+            .where(ArticuloContrato.id == totales_del_mes.c.articulo_contrato_id)
+            .values(cant_consumida=func.coalesce(ArticuloContrato.cant_consumida, 0) + totales_del_mes.c.cantidad)
+            .execution_options(synchronize_session=False)
+        )
 
 
-    def obtener_estado_stock(self) -> List[StockStatusDTO]:
+    def obtener_estado_stock(self) -> List[DTORow[StockStatusDTO]]:
         """
         Devuelve el estado actual del stock para todos los artículos de contrato.
         Esta información alimenta la visualización de inventario.
         """
+        with self.uow.readonly():
+            # Solo se leen las columnas del DTO; no se hidratan entidades ArticuloContrato.
+            return self.uow.articulos_contrato.project_rows(
+                StockStatusDTO,
+                columns={"cant_consumida": func.coalesce(ArticuloContrato.cant_consumida, 0)},
+            )
+
+    def obtener_estado_stock_pagina(self, after_key: int | None = None,
+                                    limite: int = 200) -> Tuple[List[DTORow[StockStatusDTO]], int | None]:
+        """
+        Una página del estado del stock, en orden de id, a partir de `after_key`. Devuelve
+        las filas y la clave de la página siguiente (None en la última). La vista de
+        inventario la usa para cargar el stock a medida que se recorre la tabla.
+        """
+        with self.uow.readonly():
+            return self.uow.articulos_contrato.project_rows_page(
+                StockStatusDTO,
+                after_key=after_key,
+                limit=limite,
+                columns={"cant_consumida": func.coalesce(ArticuloContrato.cant_consumida, 0)},
+            )
+
+    def obtener_existencias(self, fecha: datetime.datetime | None = None,
+                            articulo_ids: Sequence[int] | None = None) -> List[DTORow[ExistenciaDTO]]:
+        """
+        Existencia de cada artículo en `fecha` (por defecto, ahora): el último corte de
+        inventario anterior más los movimientos registrados desde ese corte hasta `fecha`.
+        Solo se suman los movimientos posteriores al corte, no el libro completo.
+        """
+        fecha = fecha or datetime.datetime.utcnow()
+
+        def ultimo_corte(columna):
+            return (
+                select(columna)
+                .where(CorteInventario.articulo_contrato_id == ArticuloContrato.id,
+                       CorteInventario.fecha_corte <= fecha)
+                .order_by(CorteInventario.fecha_corte.desc())
+                .limit(1)
+                .correlate(ArticuloContrato)
+                .scalar_subquery()
+            )
+
+        movimientos_desde_el_corte = (
+            select(func.coalesce(func.sum(MovimientoInventario.cantidad), 0))
+            .where(
+                MovimientoInventario.articulo_contrato_id == ArticuloContrato.id,
+                MovimientoInventario.fecha >= func.coalesce(ultimo_corte(CorteInventario.fecha_corte), datetime.datetime.min),
+                MovimientoInventario.fecha <= fecha,
+            )
+            .scalar_subquery()
+        )
+        criterios = [ArticuloContrato.id.in_(articulo_ids)] if articulo_ids is not None else []
+        with self.uow.readonly():
+            return self.uow.articulos_contrato.project_rows(
+                ExistenciaDTO,
+                *criterios,
+                columns={
+                    "articulo_contrato_id": ArticuloContrato.id,
+                    "existencia": func.coalesce(ultimo_corte(CorteInventario.existencia), 0) + movimientos_desde_el_corte,
+                },
+                order_by=ArticuloContrato.id,
+            )
+
+    def generar_cortes_inventario(self, hasta: datetime.date | None = None) -> int:
+        """
+        Agrega cortes diarios de existencia para los movimientos registrados desde el último
+        corte de cada artículo y antes de `hasta` (como máximo, hoy): un corte al inicio del
+        día siguiente a cada día con movimientos. Cada movimiento se acumula una sola vez, así
+        que llamarlo periódicamente cuesta lo registrado desde la llamada anterior.
+        Devuelve el número de cortes agregados.
+        """
+        # Un corte de hoy o posterior dejaría fuera movimientos que aún pueden registrarse.
+        hoy = datetime.datetime.utcnow().date()
+        limite = datetime.datetime.combine(min(hasta or hoy, hoy), datetime.time.min)
+        # Último corte de cada artículo, buscado por clave primaria dentro del recorrido de artículos.
+        ultimo_corte = (
+            select(func.max(CorteInventario.fecha_corte))
+            .where(CorteInventario.articulo_contrato_id == ArticuloContrato.id)
+            .correlate(ArticuloContrato)
+            .scalar_subquery()
+        )
+        existencia_previa = (
+            select(CorteInventario.existencia)
+            .where(CorteInventario.articulo_contrato_id == ArticuloContrato.id,
+                   CorteInventario.fecha_corte == ultimo_corte)
+            .correlate(ArticuloContrato)
+            .scalar_subquery()
+        )
+        dia = func.date(MovimientoInventario.fecha)
+        stmt = (
+            select(ArticuloContrato.id, existencia_previa, dia, func.sum(MovimientoInventario.cantidad))
+            .join(MovimientoInventario, MovimientoInventario.articulo_contrato_id == ArticuloContrato.id)
+            .where(
+                MovimientoInventario.fecha >= func.coalesce(ultimo_corte, datetime.datetime.min),
+                MovimientoInventario.fecha < limite,
+            )
+            .group_by(ArticuloContrato.id, dia)
+            .order_by(ArticuloContrato.id, dia)
+        )
         with self.uow:
-            articulos = self.uow.articulos_contrato.list()
-            return [StockStatusDTO.from_orm(art) for art in articulos]
+            cortes, existencias = [], {}
+            for articulo_id, previa, dia_movimientos, suma in self.uow.session.execute(stmt):
+                existencia = existencias.get(articulo_id, previa or 0) + suma
+                existencias[articulo_id] = existencia
+                cortes.append({
+                    "articulo_contrato_id": articulo_id,
+                    "fecha_corte": datetime.datetime.fromisoformat(dia_movimientos) + datetime.timedelta(days=1),
+                    "existencia": existencia,
+                })
+            # Dos procesos pueden calcular el mismo corte a la vez; el resultado es idéntico.
+            self.uow.cortes_inventario.upsert_many(cortes, ("articulo_contrato_id", "fecha_corte"))
+            self.uow.commit()
+            return len(cortes)
+
+    def obtener_movimientos(self, referencia: str) -> List[MovimientoInventarioDTO]:
+        """Movimientos del libro originados por una entrada (Folio R.B.) o un despacho (QR ID)."""
+        with self.uow.readonly():
+            return self.uow.movimientos_inventario.project(
+                MovimientoInventarioDTO,
+                MovimientoInventario.referencia == referencia,
+                order_by=MovimientoInventario.id,
+            )
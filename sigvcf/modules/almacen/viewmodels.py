@@ -1,6 +1,6 @@
 from dependency_injector.wiring import inject, Provide
 from PySide6.QtCore import QObject, Signal, Slot
-from typing import Dict
+from typing import Dict, List
 
  # Import corregido: Container está en la raíz del proyecto
  # Eliminado import directo de Container para evitar ciclo
@@ -13,11 +13,15 @@ class AlmacenViewModel(QObject):
     Gestiona la lógica de la UI para el control de inventario, entradas y salidas.
     """
     # --- Señales (Salidas hacia la Vista) ---
-    stock_actualizado = Signal(list)
+    stock_actualizado = Signal(list)  # Primera página del stock; reinicia la tabla
+    stock_pagina_cargada = Signal(list)  # Páginas siguientes, a medida que se recorre la tabla
     entrada_registrada = Signal(object) # Emite EntradaBodegaDTO
+    articulos_orden_cargados = Signal(list)  # Emite List[ArticuloOrdenDTO] de la orden a recibir
     exito = Signal(str)
     error = Signal(str)
     operacion_finalizada = Signal(str)  # Señal agregada para compatibilidad con la vista
+    lote_cambiado = Signal(list)  # QR IDs escaneados pendientes de confirmar
+    lote_despachado = Signal(list)  # Emite List[ResultadoDespachoDTO]
 
     @inject
     def __init__(
@@ -27,27 +31,63 @@ class AlmacenViewModel(QObject):
     ):
         super().__init__(parent)
         self.almacen_service = almacen_service
+        # Modo lote: los escaneos se acumulan y se despachan juntos con confirmar_lote().
+        self.modo_lote = False
+        self._lote: List[str] = []
+        # Clave de la siguiente página del stock; None cuando ya se cargó la última.
+        self._siguiente_stock: int | None = None
+
+    @property
+    def hay_mas_stock(self) -> bool:
+        return self._siguiente_stock is not None
 
     # --- Slots (Entradas desde la Vista) ---
 
     @Slot()
     def actualizar_stock(self):
         """
-        Solicita al servicio el estado actual del stock y lo emite.
+        Solicita al servicio la primera página del estado del stock y la emite.
+        Las demás se piden con cargar_mas_stock() cuando la tabla llega al final.
         """
         try:
-            stock_list = self.almacen_service.obtener_estado_stock()
+            stock_list, self._siguiente_stock = self.almacen_service.obtener_estado_stock_pagina()
             self.stock_actualizado.emit(stock_list)
         except Exception as e:
             self.error.emit(f"Error al cargar el stock: {e}")
 
+    @Slot()
+    def cargar_mas_stock(self):
+        """
+        Solicita la página del stock que sigue a la última cargada y la emite.
+        """
+        if self._siguiente_stock is None:
+            return
+        try:
+            stock_list, self._siguiente_stock = self.almacen_service.obtener_estado_stock_pagina(
+                self._siguiente_stock
+            )
+            self.stock_pagina_cargada.emit(stock_list)
+        except Exception as e:
+            self.error.emit(f"Error al cargar el stock: {e}")
+
+    @Slot(int)
+    def cargar_articulos_orden(self, orden_id: int):
+        """
+        Carga los artículos del contrato de la orden para capturar las cantidades recibidas.
+        """
+        try:
+            self.articulos_orden_cargados.emit(self.almacen_service.obtener_articulos_orden(orden_id))
+        except Exception as e:
+            self.error.emit(f"Error al cargar los artículos de la orden: {e}")
+
     @Slot(dict)
     def registrar_nueva_entrada(self, datos_entrada: Dict):
         """
-        Recibe los datos de una nueva entrada de bodega y la registra.
+        Recibe los datos de una nueva entrada de bodega, con las cantidades recibidas por
+        artículo en 'articulos', y la registra.
         """
         try:
-            if not all(k in datos_entrada for k in ["orden_compra_id", "factura_xml_path", "recepcionista_id"]):
+            if not all(k in datos_entrada for k in ["orden_compra_id", "factura_xml_path", "recepcionista_id", "articulos"]):
                 raise ValueError("Faltan datos para registrar la entrada.")
             
             dto = EntradaBodegaCreateDTO(**datos_entrada)
@@ -65,10 +105,61 @@ class AlmacenViewModel(QObject):
         if not qr_id or not qr_id.strip():
             self.error.emit("El código QR no puede estar vacío.")
             return
+        if self.modo_lote:
+            self._encolar_en_lote(qr_id.strip())
+            return
         try:
             self.almacen_service.despachar_requerimiento(qr_id)
             self.exito.emit(f"Requerimiento '{qr_id}' despachado con éxito. El stock ha sido actualizado.")
             # Actualizar la vista de stock después de un despacho exitoso
             self.actualizar_stock()
         except Exception as e:
-            self.error.emit(f"Error en el despacho: {e}")
\ No newline at end of file
+            self.error.emit(f"Error en el despacho: {e}")
+
+    # --- Despacho por lotes ---
+
+    @Slot(bool)
+    def establecer_modo_lote(self, activo: bool):
+        """Activa o desactiva el modo lote; al desactivarlo se descartan los escaneos pendientes."""
+        self.modo_lote = activo
+        if not activo:
+            self.descartar_lote()
+
+    def _encolar_en_lote(self, qr_id: str):
+        if qr_id in self._lote:
+            self.error.emit(f"El requerimiento '{qr_id}' ya está en el lote.")
+            return
+        self._lote.append(qr_id)
+        self.lote_cambiado.emit(list(self._lote))
+
+    @Slot()
+    def descartar_lote(self):
+        self._lote.clear()
+        self.lote_cambiado.emit([])
+
+    @Slot()
+    def confirmar_lote(self):
+        """
+        Despacha los requerimientos escaneados en una sola transacción y actualiza el
+        stock una sola vez al final.
+        """
+        if not self._lote:
+            self.error.emit("No hay requerimientos escaneados en el lote.")
+            return
+        try:
+            resultados = self.almacen_service.despachar_requerimientos(self._lote)
+        except Exception as e:
+            self.error.emit(f"Error en el despacho del lote: {e}")
+            return
+        self._lote.clear()
+        self.lote_cambiado.emit([])
+        self.lote_despachado.emit(resultados)
+        despachados = sum(1 for r in resultados if r.despachado)
+        mensaje = f"Lote despachado: {despachados} de {len(resultados)} requerimientos."
+        rechazados = [f"{r.qr_id}: {r.mensaje}" for r in resultados if not r.despachado]
+        if rechazados:
+            self.error.emit(mensaje + "\n" + "\n".join(rechazados))
+        else:
+            self.exito.emit(mensaje)
+        if despachados:
+            self.actualizar_stock()
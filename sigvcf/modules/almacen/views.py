@@ -5,20 +5,26 @@ from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QTabWidget, QTableView, QPushButton,
     QGroupBox, QFormLayout, QSpinBox, QLineEdit, QMessageBox,
-    QHeaderView
+    QHeaderView, QCheckBox, QListWidget, QHBoxLayout, QTableWidget, QTableWidgetItem
 )
 
 from sigvcf.modules.almacen.viewmodels import AlmacenViewModel
-from sigvcf.modules.almacen.dto import StockStatusDTO, EntradaBodegaDTO
+from sigvcf.modules.almacen.dto import StockStatusDTO, EntradaBodegaDTO, ArticuloOrdenDTO
 from .views_3d import Warehouse3DView
 
 # --- Modelo de Tabla para el Stock ---
 
 class StockTableModel(QAbstractTableModel):
-    def __init__(self, data: List[StockStatusDTO] = [], parent=None):
+    """
+    Tabla del stock cargada por páginas: cuando la vista llega a la última fila cargada,
+    Qt llama a fetchMore() y `cargar_mas` pide la página siguiente, que llega por append_data().
+    """
+    def __init__(self, data: List[StockStatusDTO] = [], parent=None, cargar_mas=None):
         super().__init__(parent)
-        self._data = data
+        self._data = list(data)
         self._headers = ["Clave Artículo", "Descripción", "Contratado", "Consumido", "Disponible"]
+        self._cargar_mas = cargar_mas
+        self._hay_mas = False
 
     def rowCount(self, parent=QModelIndex()):
         return len(self._data)
@@ -41,11 +47,31 @@ class StockTableModel(QAbstractTableModel):
             if index.column() == 4: return stock_item.stock_disponible
         return None
     
-    def update_data(self, data: List[StockStatusDTO]):
+    def update_data(self, data: List[StockStatusDTO], hay_mas: bool = False):
         self.beginResetModel()
-        self._data = data
+        self._data = list(data)
+        self._hay_mas = hay_mas
         self.endResetModel()
 
+    def append_data(self, data: List[StockStatusDTO], hay_mas: bool):
+        self._hay_mas = hay_mas
+        if not data:
+            return
+        self.beginInsertRows(QModelIndex(), len(self._data), len(self._data) + len(data) - 1)
+        self._data.extend(data)
+        self.endInsertRows()
+
+    def rows(self) -> List[StockStatusDTO]:
+        return self._data
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return self._hay_mas and self._cargar_mas is not None and not parent.isValid()
+
+    def fetchMore(self, parent=QModelIndex()):
+        # Se desactiva hasta que llegue la página para no pedirla dos veces.
+        self._hay_mas = False
+        self._cargar_mas()
+
 # --- Vista Principal del Módulo de Almacén ---
 
 class AlmacenView(QWidget):
@@ -72,7 +98,7 @@ class AlmacenView(QWidget):
         stock_layout.addWidget(self.stock_table)
         stock_layout.addWidget(self.actualizar_stock_button, alignment=Qt.AlignmentFlag.AlignRight)
         self.tabs.addTab(stock_tab, "Control de Inventario")
-        self.source_model = StockTableModel()
+        self.source_model = StockTableModel(cargar_mas=self.vm.cargar_mas_stock)
         self.stock_table.setModel(self.source_model)
 
         # --- Pestaña 2: Visualización 3D de Stock ---
@@ -94,12 +120,23 @@ class AlmacenView(QWidget):
         self.factura_path_edit.setPlaceholderText("Ej: /path/a/factura_proveedor.xml")
         self.recepcionista_id_spinbox = QSpinBox()
         self.recepcionista_id_spinbox.setRange(1, 999)
+        self.cargar_articulos_button = QPushButton("Cargar Artículos")
+        self.cargar_articulos_button.setIcon(qta.icon('fa5s.list', color='white'))
+        orden_layout = QHBoxLayout()
+        orden_layout.addWidget(self.orden_id_spinbox)
+        orden_layout.addWidget(self.cargar_articulos_button)
+        # Una fila por artículo del contrato de la orden; se captura la cantidad recibida.
+        self.articulos_recibidos_table = QTableWidget(0, 4)
+        self.articulos_recibidos_table.setHorizontalHeaderLabels(["Clave Artículo", "Descripción", "Unidad", "Cantidad Recibida"])
+        self.articulos_recibidos_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.registrar_entrada_button = QPushButton("Registrar Entrada")
         self.registrar_entrada_button.setIcon(qta.icon('fa5s.dolly-flatbed', color='white'))
-        form_layout.addRow("ID de Orden de Compra:", self.orden_id_spinbox)
+        form_layout.addRow("ID de Orden de Compra:", orden_layout)
         form_layout.addRow("Ruta de Factura XML:", self.factura_path_edit)
         form_layout.addRow("ID del Recepcionista:", self.recepcionista_id_spinbox)
+        form_layout.addRow(self.articulos_recibidos_table)
         form_layout.addRow(self.registrar_entrada_button)
+        self._articulos_orden: List[ArticuloOrdenDTO] = []
         recepcion_layout.addWidget(recepcion_group)
         recepcion_layout.addStretch()
         self.tabs.addTab(recepcion_tab, "Recepción de Mercancía")
@@ -113,37 +150,101 @@ class AlmacenView(QWidget):
         self.qr_id_edit.setPlaceholderText("Introduzca o escanee el ID del QR del requerimiento")
         self.despachar_button = QPushButton("Despachar")
         self.despachar_button.setIcon(qta.icon('fa5s.shipping-fast', color='white'))
+        self.modo_lote_checkbox = QCheckBox("Modo lote: acumular escaneos y despacharlos juntos")
         despacho_form.addRow("ID de QR:", self.qr_id_edit)
+        despacho_form.addRow(self.modo_lote_checkbox)
         despacho_form.addRow(self.despachar_button)
         despacho_layout.addWidget(despacho_group)
+
+        self.lote_group = QGroupBox("Lote escaneado")
+        lote_layout = QVBoxLayout(self.lote_group)
+        self.lote_list = QListWidget()
+        self.confirmar_lote_button = QPushButton("Confirmar Lote")
+        self.confirmar_lote_button.setIcon(qta.icon('fa5s.check-double', color='white'))
+        self.descartar_lote_button = QPushButton("Descartar")
+        self.descartar_lote_button.setIcon(qta.icon('fa5s.trash-alt', color='white'))
+        lote_buttons_layout = QHBoxLayout()
+        lote_buttons_layout.addStretch()
+        lote_buttons_layout.addWidget(self.descartar_lote_button)
+        lote_buttons_layout.addWidget(self.confirmar_lote_button)
+        lote_layout.addWidget(self.lote_list)
+        lote_layout.addLayout(lote_buttons_layout)
+        self.lote_group.setVisible(False)
+        despacho_layout.addWidget(self.lote_group)
         despacho_layout.addStretch()
         self.tabs.addTab(despacho_tab, "Despacho por QR")
 
     def _connect_signals(self):
         self.actualizar_stock_button.clicked.connect(self.vm.actualizar_stock)
         self.registrar_entrada_button.clicked.connect(self._on_registrar_entrada)
+        self.cargar_articulos_button.clicked.connect(self._on_cargar_articulos)
+        self.orden_id_spinbox.editingFinished.connect(self._on_cargar_articulos)
+        self.vm.articulos_orden_cargados.connect(self._update_articulos_recibidos)
         self.despachar_button.clicked.connect(self._on_despachar)
+        # Los lectores de QR terminan cada lectura con Enter.
+        self.qr_id_edit.returnPressed.connect(self._on_despachar)
+        self.modo_lote_checkbox.toggled.connect(self._on_modo_lote)
+        self.confirmar_lote_button.clicked.connect(self.vm.confirmar_lote)
+        self.descartar_lote_button.clicked.connect(self.vm.descartar_lote)
+        self.vm.lote_cambiado.connect(self._update_lote_list)
 
         self.vm.stock_actualizado.connect(self._update_stock_table)
-        self.vm.stock_actualizado.connect(self.warehouse_3d_view.update_stock) # Conectar a la vista 3D
+        self.vm.stock_pagina_cargada.connect(self._append_stock_table)
         self.vm.operacion_finalizada.connect(self._show_status_message)
         self.vm.entrada_registrada.connect(self._confirmar_entrada)
 
     def _on_registrar_entrada(self):
+        articulos = []
+        for fila, articulo in enumerate(self._articulos_orden):
+            cantidad = self.articulos_recibidos_table.cellWidget(fila, 3).value()
+            if cantidad > 0:
+                articulos.append({"articulo_contrato_id": articulo.articulo_contrato_id, "cantidad": cantidad})
         datos_entrada = {
             "orden_compra_id": self.orden_id_spinbox.value(),
             "factura_xml_path": self.factura_path_edit.text(),
-            "recepcionista_id": self.recepcionista_id_spinbox.value()
+            "recepcionista_id": self.recepcionista_id_spinbox.value(),
+            "articulos": articulos,
         }
         self.vm.registrar_nueva_entrada(datos_entrada)
 
+    def _on_cargar_articulos(self):
+        self.vm.cargar_articulos_orden(self.orden_id_spinbox.value())
+
+    def _update_articulos_recibidos(self, articulos: List[ArticuloOrdenDTO]):
+        self._articulos_orden = list(articulos)
+        self.articulos_recibidos_table.setRowCount(len(self._articulos_orden))
+        for fila, articulo in enumerate(self._articulos_orden):
+            for columna, valor in enumerate((articulo.clave_articulo, articulo.descripcion, articulo.unidad_medida)):
+                item = QTableWidgetItem(valor)
+                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
+                self.articulos_recibidos_table.setItem(fila, columna, item)
+            cantidad = QSpinBox()
+            cantidad.setRange(0, 999999)
+            self.articulos_recibidos_table.setCellWidget(fila, 3, cantidad)
+
     def _on_despachar(self):
         qr_id = self.qr_id_edit.text()
         self.vm.despachar_por_qr(qr_id)
         self.qr_id_edit.clear()
 
+    def _on_modo_lote(self, activo: bool):
+        self.vm.establecer_modo_lote(activo)
+        self.lote_group.setVisible(activo)
+        self.despachar_button.setText("Agregar al Lote" if activo else "Despachar")
+
+    def _update_lote_list(self, qr_ids: List[str]):
+        self.lote_list.clear()
+        self.lote_list.addItems(qr_ids)
+        self.confirmar_lote_button.setText(f"Confirmar Lote ({len(qr_ids)})" if qr_ids else "Confirmar Lote")
+
     def _update_stock_table(self, stock_list: List[StockStatusDTO]):
-        self.source_model.update_data(stock_list)
+        self.source_model.update_data(stock_list, self.vm.hay_mas_stock)
+        self.warehouse_3d_view.update_stock(self.source_model.rows())
+
+    def _append_stock_table(self, stock_list: List[StockStatusDTO]):
+        self.source_model.append_data(stock_list, self.vm.hay_mas_stock)
+        # La vista 3D muestra los artículos ya cargados en la tabla.
+        self.warehouse_3d_view.update_stock(self.source_model.rows())
 
     def _show_status_message(self, message: str):
         if "Error" in message:
@@ -161,3 +262,4 @@ class AlmacenView(QWidget):
         self.orden_id_spinbox.setValue(1)
         self.factura_path_edit.clear()
         self.recepcionista_id_spinbox.setValue(1)
+        self._update_articulos_recibidos([])
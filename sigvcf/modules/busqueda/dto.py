@@ -0,0 +1,18 @@
+# sigvcf/modules/busqueda/dto.py
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+
+class ResultadoBusquedaDTO(BaseModel):
+    """
+    DTO de un resultado de búsqueda de texto completo. `puntuacion` es el bm25 de FTS5:
+    cuanto menor (más negativo), más relevante. `fragmento` resalta los términos
+    encontrados entre corchetes.
+    """
+    tipo: str  # 'ARTICULO', 'PROVEEDOR' o 'REPORTE'
+    id: int
+    titulo: str
+    fragmento: str
+    puntuacion: float
+    contrato_id: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
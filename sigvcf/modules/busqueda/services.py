@@ -0,0 +1,130 @@
+import re
+from typing import List
+
+from sqlalchemy import column, func, select, table, union
+
+from sigvcf.core.domain.models import ArticuloContrato, Contrato, Proveedor, ReporteIncumplimiento
+from sigvcf.infrastructure.persistence.rows import DTORow
+from sigvcf.infrastructure.persistence.unit_of_work import IUnitOfWork
+from sigvcf.modules.administrativo.dto import ContratoDTO
+from sigvcf.modules.busqueda.dto import ResultadoBusquedaDTO
+
+# Tablas virtuales FTS5 (ver models.py). La columna oculta con el nombre de la tabla es la
+# que recibe MATCH; rowid es el id de la fila de origen.
+_CONTRATO = table("busqueda_contrato", column("rowid"), column("busqueda_contrato"))
+_ARTICULO = table("busqueda_articulo", column("rowid"), column("busqueda_articulo"))
+_PROVEEDOR = table("busqueda_proveedor", column("rowid"), column("busqueda_proveedor"))
+_REPORTE = table("busqueda_reporte", column("rowid"), column("busqueda_reporte"))
+
+_TERMINO = re.compile(r"\w+")
+
+
+def consulta_fts(texto: str) -> str | None:
+    """
+    Convierte lo que escribe el usuario en una consulta MATCH de FTS5: cada palabra se
+    busca como prefijo ("arr" encuentra "arroz") y todas deben aparecer. Los operadores y
+    la puntuación de FTS5 se descartan, así que cualquier texto es una consulta válida.
+    Devuelve None si no queda ninguna palabra.
+    """
+    terminos = _TERMINO.findall(texto or "")
+    if not terminos:
+        return None
+    return " ".join(f'"{termino}"*' for termino in terminos)
+
+
+class SearchService:
+    """
+    Servicio de búsqueda de texto completo sobre artículos de contrato, proveedores y
+    reportes de incumplimiento, respaldado por los índices FTS5 que mantienen los triggers.
+    Los resultados se ordenan por relevancia (bm25) y se limitan en SQL, de modo que la
+    interfaz nunca necesita cargar todas las filas para filtrarlas.
+    """
+    def __init__(self, uow: IUnitOfWork):
+        self.uow = uow
+
+    def _ejecutar(self, stmt, tipo: str) -> List[ResultadoBusquedaDTO]:
+        construir = ResultadoBusquedaDTO.model_construct
+        with self.uow.readonly():
+            return [construir(tipo=tipo, **fila) for fila in self.uow.session.execute(stmt).mappings()]
+
+    @staticmethod
+    def _coincidencias(indice, modelo, consulta: str, titulo, columna_fragmento: int, limite: int, *extra):
+        oculta = indice.c[indice.name]
+        return (
+            select(
+                modelo.id.label("id"),
+                titulo.label("titulo"),
+                func.snippet(oculta, columna_fragmento, "[", "]", "…", 12).label("fragmento"),
+                func.bm25(oculta).label("puntuacion"),
+                *extra,
+            )
+            .select_from(indice)
+            .join(modelo, modelo.id == indice.c.rowid)
+            .where(oculta.match(consulta))
+            .order_by(func.bm25(oculta))
+            .limit(limite)
+        )
+
+    def buscar_articulos(self, texto: str, limite: int = 50) -> List[ResultadoBusquedaDTO]:
+        """Artículos de contrato por clave o descripción."""
+        consulta = consulta_fts(texto)
+        if consulta is None:
+            return []
+        stmt = self._coincidencias(
+            _ARTICULO, ArticuloContrato, consulta, ArticuloContrato.clave_articulo, 1, limite,
+            ArticuloContrato.contrato_id.label("contrato_id"),
+        )
+        return self._ejecutar(stmt, 'ARTICULO')
+
+    def buscar_proveedores(self, texto: str, limite: int = 50) -> List[ResultadoBusquedaDTO]:
+        """Proveedores por razón social o RFC."""
+        consulta = consulta_fts(texto)
+        if consulta is None:
+            return []
+        stmt = self._coincidencias(_PROVEEDOR, Proveedor, consulta, Proveedor.razon_social, 0, limite)
+        return self._ejecutar(stmt, 'PROVEEDOR')
+
+    def buscar_reportes(self, texto: str, limite: int = 50) -> List[ResultadoBusquedaDTO]:
+        """Reportes de incumplimiento por tipo o descripción."""
+        consulta = consulta_fts(texto)
+        if consulta is None:
+            return []
+        stmt = self._coincidencias(
+            _REPORTE, ReporteIncumplimiento, consulta, ReporteIncumplimiento.tipo, 1, limite,
+            ReporteIncumplimiento.contrato_id.label("contrato_id"),
+        )
+        return self._ejecutar(stmt, 'REPORTE')
+
+    def buscar(self, texto: str, limite_por_tipo: int = 20) -> List[ResultadoBusquedaDTO]:
+        """
+        Búsqueda combinada en artículos, proveedores y reportes, ordenada por relevancia.
+        Cada índice aporta a lo sumo `limite_por_tipo` resultados.
+        """
+        resultados = (
+            self.buscar_articulos(texto, limite_por_tipo)
+            + self.buscar_proveedores(texto, limite_por_tipo)
+            + self.buscar_reportes(texto, limite_por_tipo)
+        )
+        return sorted(resultados, key=lambda r: r.puntuacion)
+
+    def buscar_contratos(self, texto: str) -> List[DTORow[ContratoDTO]]:
+        """
+        Contratos cuyo código de licitación, alguno de sus artículos o su proveedor
+        coinciden con `texto` (sin sus artículos, como en listar_contratos).
+        """
+        consulta = consulta_fts(texto)
+        if consulta is None:
+            return []
+        por_codigo = select(_CONTRATO.c.rowid).where(_CONTRATO.c.busqueda_contrato.match(consulta))
+        por_articulo = select(ArticuloContrato.contrato_id).where(
+            ArticuloContrato.id.in_(select(_ARTICULO.c.rowid).where(_ARTICULO.c.busqueda_articulo.match(consulta)))
+        )
+        por_proveedor = select(Contrato.id).where(
+            Contrato.proveedor_id.in_(select(_PROVEEDOR.c.rowid).where(_PROVEEDOR.c.busqueda_proveedor.match(consulta)))
+        )
+        with self.uow.readonly():
+            return self.uow.contratos.project_rows(
+                ContratoDTO,
+                Contrato.id.in_(union(por_codigo, por_articulo, por_proveedor)),
+                order_by=Contrato.codigo_licitacion,
+            )
@@ -3,6 +3,10 @@ from typing import List
 from sqlalchemy.orm import joinedload
 from sqlalchemy import select
 
+from sigvcf.infrastructure.dto_conversion import to_dto, to_dtos
+from sigvcf.infrastructure.persistence.async_unit_of_work import IAsyncUnitOfWork
+from sigvcf.infrastructure.persistence.loading import loader_plan
+from sigvcf.infrastructure.persistence.rows import DTORow
 from sigvcf.infrastructure.persistence.unit_of_work import IUnitOfWork
 from sigvcf.modules.financiero.dto import RegistroContableDTO, ExpedienteEntradaDTO
 from sigvcf.core.domain.models import RegistroContable, EntradaBodega, OrdenDeCompra, Contrato, Proveedor
@@ -12,77 +16,97 @@ class FinancieroService:
     Servicio de aplicación para el módulo de Recursos Financieros.
     Orquesta la verificación de expedientes y la contabilidad gubernamental.
     """
-    def __init__(self, uow: IUnitOfWork):
+    # Proyección con JOINs de los expedientes pendientes: los campos del contrato y del
+    # proveedor se leen en la misma consulta, sin cargar las entidades relacionadas.
+    _PROYECCION_EXPEDIENTES = dict(
+        columns={
+            "entrada_id": EntradaBodega.id,
+            "codigo_licitacion_contrato": Contrato.codigo_licitacion,
+            "proveedor_rfc": Proveedor.rfc,
+        },
+        joins=[EntradaBodega.orden_de_compra, OrdenDeCompra.contrato, Contrato.proveedor],
+    )
+
+    def __init__(self, uow: IUnitOfWork, async_uow: IAsyncUnitOfWork | None = None):
         self.uow = uow
+        self.async_uow = async_uow
 
-    def obtener_expedientes_pendientes(self) -> List[ExpedienteEntradaDTO]:
+    def obtener_expedientes_pendientes(self) -> List[DTORow[ExpedienteEntradaDTO]]:
         """
         Obtiene una lista de DTOs de expedientes pendientes de verificación,
         filtrando y precargando relaciones eficientemente en la base de datos.
         """
-        with self.uow:
-            stmt = (
-                select(EntradaBodega)
-                .join(EntradaBodega.orden_de_compra)
-                .options(
-                    joinedload(EntradaBodega.orden_de_compra)
-                    .joinedload(OrdenDeCompra.contrato)
-                    .joinedload(Contrato.proveedor)
-                )
-                .where(OrdenDeCompra.estado == 'RECIBIDA')
+        with self.uow.readonly(report=True):
+            return self.uow.entradas_bodega.project_rows(
+                ExpedienteEntradaDTO, OrdenDeCompra.estado == 'RECIBIDA', **self._PROYECCION_EXPEDIENTES
             )
-            # .unique() es importante para desduplicar resultados cuando se usan joins.
-            resultados = self.uow.session.execute(stmt).scalars().unique().all()
-            return [ExpedienteEntradaDTO.from_orm(e) for e in resultados]
 
+    async def obtener_expedientes_pendientes_async(self) -> List[DTORow[ExpedienteEntradaDTO]]:
+        """Versión asíncrona de obtener_expedientes_pendientes sobre la Unidad de Trabajo async."""
+        async with self.async_uow.readonly(report=True):
+            return await self.async_uow.entradas_bodega.project_rows(
+                ExpedienteEntradaDTO, OrdenDeCompra.estado == 'RECIBIDA', **self._PROYECCION_EXPEDIENTES
+            )
+
+    @staticmethod
+    def _polizas_pendientes_stmt():
+        return (
+            select(RegistroContable)
+            .join(RegistroContable.entrada_bodega)
+            .join(EntradaBodega.orden_de_compra)
+            .where(OrdenDeCompra.estado == 'VERIFICADO')
+        )
+
+    @loader_plan()
     def obtener_polizas_pendientes(self) -> List[RegistroContableDTO]:
         """
         Obtiene una lista de DTOs de pólizas pendientes de aprobación,
-        filtrando y precargando relaciones eficientemente en la base de datos.
+        filtrando en la base de datos. El DTO solo usa columnas del registro contable,
+        así que los JOINs sirven únicamente para el filtro y no se carga ninguna relación.
         """
-        with self.uow:
-            stmt = (
-                select(RegistroContable)
-                .join(RegistroContable.entrada_bodega)
-                .join(EntradaBodega.orden_de_compra)
-                .options(
-                    joinedload(RegistroContable.entrada_bodega)
-                    .joinedload(EntradaBodega.orden_de_compra)
-                    .joinedload(OrdenDeCompra.proveedor)
-                )
-                .where(OrdenDeCompra.estado == 'VERIFICADO')
-            )
-            resultados = self.uow.session.execute(stmt).scalars().unique().all()
-            return [RegistroContableDTO.from_orm(r) for r in resultados]
-
+        with self.uow.readonly(report=True):
+            resultados = self.uow.session.execute(self._polizas_pendientes_stmt()).scalars().all()
+            return to_dtos(RegistroContableDTO, resultados)
+
+    @loader_plan()
+    async def obtener_polizas_pendientes_async(self) -> List[RegistroContableDTO]:
+        """Versión asíncrona de obtener_polizas_pendientes sobre la Unidad de Trabajo async."""
+        async with self.async_uow.readonly(report=True):
+            resultados = (await self.async_uow.session.execute(self._polizas_pendientes_stmt())).scalars().all()
+            return to_dtos(RegistroContableDTO, resultados)
+
+    @loader_plan(joinedload(EntradaBodega.orden_de_compra))
     def verificar_expediente(self, entrada_id: int) -> None:
         """
         Marca un expediente de entrada como verificado, precargando relaciones.
         """
+        orden_id = (
+            select(EntradaBodega.orden_compra_id).where(EntradaBodega.id == entrada_id).scalar_subquery()
+        )
         with self.uow:
-            entrada = self.uow.session.query(EntradaBodega).options(
-                joinedload(EntradaBodega.orden_de_compra)
-            ).filter(EntradaBodega.id == entrada_id).one_or_none()
-
-            if not entrada:
-                raise ValueError(f"Entrada de bodega con id {entrada_id} no encontrada.")
-            
-            orden = entrada.orden_de_compra
-            if orden.estado != 'RECIBIDA':
-                raise ValueError(f"La orden de compra asociada {orden.id} no está en estado 'RECIBida'.")
-
-            orden.estado = 'VERIFICADO'
+            # UPDATE condicional sobre la orden de la entrada; la entrada solo se carga si falla.
+            if not self.uow.ordenes_de_compra.transition(orden_id, 'RECIBIDA', 'VERIFICADO'):
+                entrada = self.uow.session.query(EntradaBodega).filter(EntradaBodega.id == entrada_id).one_or_none()
+                if not entrada:
+                    raise ValueError(f"Entrada de bodega con id {entrada_id} no encontrada.")
+                raise ValueError(
+                    f"La orden de compra asociada {entrada.orden_de_compra.id} no está en estado 'RECIBIDA'."
+                )
             self.uow.commit()
 
+    @loader_plan(
+        # El proveedor se alcanza a través del contrato: OrdenDeCompra no tiene relación directa.
+        joinedload(EntradaBodega.orden_de_compra)
+        .joinedload(OrdenDeCompra.contrato)
+        .joinedload(Contrato.proveedor),
+        joinedload(EntradaBodega.registro_contable),
+    )
     def generar_poliza_contable(self, entrada_id: int, contador_id: int) -> RegistroContableDTO:
         """
         Genera la póliza contable para una entrada de bodega verificada, precargando relaciones.
         """
         with self.uow:
-            entrada = self.uow.session.query(EntradaBodega).options(
-                joinedload(EntradaBodega.orden_de_compra)
-                .joinedload(OrdenDeCompra.proveedor)
-            ).filter(EntradaBodega.id == entrada_id).one_or_none()
+            entrada = self.uow.session.query(EntradaBodega).filter(EntradaBodega.id == entrada_id).one_or_none()
 
             if not entrada:
                 raise ValueError(f"Entrada de bodega con id {entrada_id} no encontrada.")
@@ -96,7 +120,7 @@ class FinancieroService:
             asiento_contable = (
                 f"POLIZA-DEVENGO-{datetime.date.today().year}-"
                 f"CARGO:6151-Inventario/{entrada.folio_rb};"
-                f"ABONO:2112-Cuentas por Pagar a Corto Plazo/{entrada.orden_de_compra.proveedor.rfc}"
+                f"ABONO:2112-Cuentas por Pagar a Corto Plazo/{entrada.orden_de_compra.contrato.proveedor.rfc}"
             )
 
             nuevo_registro = RegistroContable(
@@ -109,24 +133,28 @@ class FinancieroService:
             self.uow.registros_contables.add(nuevo_registro)
             self.uow.commit()
 
-            return RegistroContableDTO.from_orm(nuevo_registro)
+            return to_dto(RegistroContableDTO, nuevo_registro)
 
+    @loader_plan(joinedload(RegistroContable.entrada_bodega).joinedload(EntradaBodega.orden_de_compra))
     def aprobar_poliza(self, registro_contable_id: int) -> None:
         """
         Aprueba la póliza, liberando la factura para pago, precargando relaciones.
         """
+        orden_id = (
+            select(EntradaBodega.orden_compra_id)
+            .join(RegistroContable, RegistroContable.entrada_bodega_id == EntradaBodega.id)
+            .where(RegistroContable.id == registro_contable_id)
+            .scalar_subquery()
+        )
         with self.uow:
-            registro = self.uow.session.query(RegistroContable).options(
-                joinedload(RegistroContable.entrada_bodega)
-                .joinedload(EntradaBodega.orden_de_compra)
-            ).filter(RegistroContable.id == registro_contable_id).one_or_none()
-
-            if not registro:
-                raise ValueError(f"Registro contable con id {registro_contable_id} no encontrado.")
+            if not self.uow.ordenes_de_compra.transition(orden_id, 'VERIFICADO', 'PAGO_EN_TRAMITE'):
+                registro = self.uow.session.query(RegistroContable).filter(
+                    RegistroContable.id == registro_contable_id
+                ).one_or_none()
 
-            orden = registro.entrada_bodega.orden_de_compra
-            if orden.estado != 'VERIFICADO':
-                 raise ValueError(f"La póliza no puede ser aprobada si la orden no está 'VERIFICADA'. Estado actual: {orden.estado}")
+                if not registro:
+                    raise ValueError(f"Registro contable con id {registro_contable_id} no encontrado.")
 
-            orden.estado = 'PAGO_EN_TRAMITE'
+                orden = registro.entrada_bodega.orden_de_compra
+                raise ValueError(f"La póliza no puede ser aprobada si la orden no está 'VERIFICADA'. Estado actual: {orden.estado}")
             self.uow.commit()
@@ -1,7 +1,10 @@
+import asyncio
+
 from dependency_injector.wiring import inject, Provide
 from PySide6.QtCore import QObject, Signal, Slot
 
  # Eliminado import directo de Container para evitar ciclo
+from sigvcf.infrastructure.async_runner import AsyncRunner
 from sigvcf.modules.financiero.services import FinancieroService
 from sigvcf.modules.financiero.dto import RegistroContableDTO, ExpedienteEntradaDTO
 
@@ -21,34 +24,42 @@ class FinancieroViewModel(QObject):
     def __init__(
         self,
         financiero_service: FinancieroService = Provide["Container.financiero_service"],
+        async_runner: AsyncRunner = Provide["Container.async_runner"],
         parent: QObject | None = None
     ):
         super().__init__(parent)
         self.financiero_service = financiero_service
+        self.async_runner = async_runner
 
     # --- Slots (Entradas desde la Vista) ---
 
     @Slot()
     def cargar_bandejas(self):
-        """Carga los datos para ambas bandejas (Contador y Jefatura)."""
-        self._cargar_expedientes_pendientes()
-        self._cargar_polizas_pendientes()
+        """
+        Carga las dos bandejas (Contador y Jefatura) en el bucle asíncrono, sin bloquear la
+        interfaz. Cada bandeja se emite en cuanto su consulta termina.
+        """
+        self.async_runner.submit(self._cargar_bandejas())
+
+    async def _cargar_bandejas(self):
+        # Consultas independientes: se ejecutan en paralelo, cada una en su propia sesión.
+        await asyncio.gather(self._cargar_expedientes_pendientes(), self._cargar_polizas_pendientes())
 
-    def _cargar_expedientes_pendientes(self):
+    async def _cargar_expedientes_pendientes(self):
         """Carga DTOs de expedientes pendientes llamando al servicio."""
         try:
             # La lógica de consulta y filtrado se delega al servicio.
             # El servicio devuelve una lista de DTOs, no modelos de dominio.
-            expedientes_pendientes_dto = self.financiero_service.obtener_expedientes_pendientes()
+            expedientes_pendientes_dto = await self.financiero_service.obtener_expedientes_pendientes_async()
             self.expedientes_pendientes_cargados.emit(expedientes_pendientes_dto)
         except Exception as e:
             self.error.emit(f"Error al cargar expedientes: {e}")
 
-    def _cargar_polizas_pendientes(self):
+    async def _cargar_polizas_pendientes(self):
         """Carga DTOs de pólizas pendientes llamando al servicio."""
         try:
             # La lógica de consulta, filtrado y conversión a DTO se delega al servicio.
-            polizas_dto = self.financiero_service.obtener_polizas_pendientes()
+            polizas_dto = await self.financiero_service.obtener_polizas_pendientes_async()
             self.polizas_pendientes_cargadas.emit(polizas_dto)
         except Exception as e:
             self.error.emit(f"Error al cargar pólizas: {e}")
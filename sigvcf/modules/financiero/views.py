@@ -28,7 +28,7 @@ class ExpedientesTableModel(QAbstractTableModel):
     def data(self, index, role):
         if role == Qt.ItemDataRole.DisplayRole:
             expediente = self._data[index.row()]
-            if index.column() == 0: return expediente.id
+            if index.column() == 0: return expediente.entrada_id
             if index.column() == 1: return expediente.folio_rb
             if index.column() == 2: return expediente.orden_compra_id
             if index.column() == 3: return expediente.fecha_recepcion.strftime('%Y-%m-%d %H:%M')
@@ -36,7 +36,7 @@ class ExpedientesTableModel(QAbstractTableModel):
 
     def get_id_at_row(self, row: int) -> int | None:
         if 0 <= row < len(self._data):
-            return self._data[row].id
+            return self._data[row].entrada_id
         return None
 
 class PolizasTableModel(QAbstractTableModel):
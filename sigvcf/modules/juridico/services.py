@@ -1,5 +1,8 @@
 from typing import List
 from sqlalchemy.orm import joinedload
+from sigvcf.infrastructure.dto_conversion import to_dto
+from sigvcf.infrastructure.persistence.loading import loader_plan
+from sigvcf.infrastructure.persistence.rows import DTORow
 from sigvcf.infrastructure.persistence.unit_of_work import IUnitOfWork
 from sigvcf.modules.juridico.dto import ReporteIncumplimientoDTO, ReporteIncumplimientoCreateDTO, PenalizacionDTO
 from sigvcf.core.domain.models import ReporteIncumplimiento, OrdenDeCompra
@@ -30,17 +33,16 @@ class JuridicoService:
             self.uow.reportes_incumplimiento.add(nuevo_reporte)
             self.uow.commit()
 
-            return ReporteIncumplimientoDTO.from_orm(nuevo_reporte)
+            return to_dto(ReporteIncumplimientoDTO, nuevo_reporte)
 
+    @loader_plan(joinedload(OrdenDeCompra.entrada_bodega))
     def calcular_penalizacion_por_atraso(self, orden_id: int) -> PenalizacionDTO:
         """
         Calcula la penalización por atraso para una orden de compra específica,
         precargando las relaciones necesarias para evitar N+1 queries.
         """
-        with self.uow:
-            orden = self.uow.session.query(OrdenDeCompra).options(
-                joinedload(OrdenDeCompra.entrada_bodega)
-            ).filter(OrdenDeCompra.id == orden_id).one_or_none()
+        with self.uow.readonly():
+            orden = self.uow.ordenes_de_compra.get(orden_id)
 
             if not orden:
                 raise ValueError(f"Orden de compra con id {orden_id} no encontrada.")
@@ -73,16 +75,15 @@ class JuridicoService:
                 calculo_detalle=f"Cálculo: {dias_atraso} días de atraso * ${penalizacion_por_dia}/día."
             )
 
-    def listar_incumplimientos_pendientes(self) -> List[ReporteIncumplimientoDTO]:
+    def listar_incumplimientos_pendientes(self) -> List[DTORow[ReporteIncumplimientoDTO]]:
         """
         Devuelve una lista de todos los reportes de incumplimiento que no están 'RESUELTO',
         filtrando directamente en la base de datos para mayor eficiencia.
         """
-        with self.uow:
-            # Filtrar directamente en la base de datos en lugar de en memoria.
-            # Esto es mucho más eficiente que self.uow.reportes_incumplimiento.list().
-            reportes_pendientes = self.uow.session.query(ReporteIncumplimiento).filter(
-                ReporteIncumplimiento.estado != 'RESUELTO'
-            ).all()
-            
-            return [ReporteIncumplimientoDTO.from_orm(r) for r in reportes_pendientes]
+        with self.uow.readonly(report=True):
+            # Filtrar directamente en la base de datos en lugar de en memoria,
+            # proyectando solo las columnas del DTO.
+            return self.uow.reportes_incumplimiento.project_rows(
+                ReporteIncumplimientoDTO,
+                ReporteIncumplimiento.estado != 'RESUELTO',
+            )
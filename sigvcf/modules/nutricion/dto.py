@@ -27,6 +27,22 @@ class ProgramacionMensualDTO(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class DesviacionProgramadoDTO(BaseModel):
+    """
+    Diferencia entre el total programado mantenido en un artículo (cant_programada) y el
+    recalculado a partir de sus programaciones mensuales.
+    """
+    articulo_contrato_id: int
+    clave_articulo: str
+    cant_programada: int
+    cant_recalculada: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @property
+    def diferencia(self) -> int:
+        return self.cant_programada - self.cant_recalculada
+
 class SalidaRequerimientoDTO(BaseModel):
     """
     DTO para representar un requerimiento de salida consolidado.
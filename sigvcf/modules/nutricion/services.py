@@ -1,32 +1,97 @@
-import uuid
 import datetime
-from typing import List
-from sqlalchemy import select, func
+from typing import List, Tuple
+from sqlalchemy import select, func, true
 
+from sigvcf.infrastructure.dto_conversion import to_dto
+from sigvcf.infrastructure.persistence.rows import DTORow
+from sigvcf.infrastructure.persistence.sequence import SequenceService
 from sigvcf.infrastructure.persistence.unit_of_work import IUnitOfWork
-from sigvcf.modules.nutricion.dto import ProgramacionMensualDTO, SalidaRequerimientoDTO, ArticuloContratoSimpleDTO
-from sigvcf.core.domain.models import ProgramacionMensual, SalidaRequerimiento, ArticuloContrato
+from sigvcf.infrastructure.persistence.write_behind import WriteBehindQueue
+from sigvcf.modules.nutricion.dto import (
+    ProgramacionMensualDTO, SalidaRequerimientoDTO, ArticuloContratoSimpleDTO, DesviacionProgramadoDTO,
+)
+from sigvcf.core.domain.models import ProgramacionMensual, ProgramacionDia, SalidaRequerimiento, ArticuloContrato
 
 class NutricionService:
     """
     Servicio de aplicación para el módulo de Nutrición.
     Orquesta la planificación de necesidades y la generación de requerimientos.
     """
-    def __init__(self, uow: IUnitOfWork):
+    # Clave única de la programación: se usa como clave de conflicto del upsert diferido.
+    _CLAVES_PROGRAMACION = ("articulo_contrato_id", "mes_anho")
+
+    def __init__(self, uow: IUnitOfWork, write_queue: WriteBehindQueue | None = None):
         self.uow = uow
+        self.write_queue = write_queue
+        self.folios = SequenceService(uow)
+
+    def _aplicar_escrituras_pendientes(self) -> None:
+        """Confirma las programaciones encoladas antes de una lectura que debe verlas."""
+        if self.write_queue is not None and self.write_queue.enabled:
+            self.write_queue.flush()
+
+    def _programado_en_cola(self, articulo_id: int) -> int:
+        """
+        Diferencia que aplicarán al total programado del artículo sus programaciones aún
+        encoladas: cada una reemplaza a la confirmada del mismo mes, así que suma su total y
+        resta el de esa programación. Se lee sin vaciar la cola, dentro del ámbito abierto.
+        """
+        if self.write_queue is None or not self.write_queue.enabled:
+            return 0
+        pendientes = self.write_queue.pending_rows(
+            "programaciones_mensuales", ProgramacionMensual, articulo_contrato_id=articulo_id
+        )
+        if not pendientes:
+            return 0
+        confirmado = self.uow.session.execute(
+            select(func.coalesce(func.sum(ProgramacionDia.cantidad), 0))
+            .join(ProgramacionMensual, ProgramacionMensual.id == ProgramacionDia.programacion_id)
+            .where(
+                ProgramacionMensual.articulo_contrato_id == articulo_id,
+                ProgramacionMensual.mes_anho.in_({fila["mes_anho"] for fila in pendientes}),
+            )
+        ).scalar_one()
+        encolado = sum(int(cantidad) for fila in pendientes for cantidad in fila["cantidades_por_dia"].values())
+        return encolado - confirmado
 
-    def obtener_articulos_disponibles(self) -> List[ArticuloContratoSimpleDTO]:
+    def obtener_articulos_disponibles(self) -> List[DTORow[ArticuloContratoSimpleDTO]]:
         """
         Obtiene una lista de DTOs de todos los artículos de contrato disponibles.
         """
-        with self.uow:
-            articulos = self.uow.articulos_contrato.list()
-            return [ArticuloContratoSimpleDTO.from_orm(a) for a in articulos]
+        with self.uow.readonly():
+            return self.uow.articulos_contrato.project_rows(ArticuloContratoSimpleDTO)
+
+    def obtener_articulos_disponibles_pagina(
+        self, after_key: int | None = None, limite: int = 200,
+    ) -> Tuple[List[DTORow[ArticuloContratoSimpleDTO]], int | None]:
+        """
+        Una página de los artículos disponibles, en orden de id, a partir de `after_key`.
+        Devuelve las filas y la clave de la página siguiente (None en la última).
+        """
+        with self.uow.readonly():
+            return self.uow.articulos_contrato.project_rows_page(
+                ArticuloContratoSimpleDTO, after_key=after_key, limit=limite,
+            )
 
     def guardar_programacion_mensual(self, programacion_dto: ProgramacionMensualDTO) -> ProgramacionMensualDTO:
         """
         Guarda (crea o actualiza) la programación de un artículo para un mes específico.
+
+        Con la cola de escrituras diferidas activa, la programación se valida y se encola:
+        se confirma junto con las demás en la siguiente escritura de la cola, y el DTO
+        devuelto es el recibido (sin id si la programación es nueva).
         """
+        if self.write_queue is not None and self.write_queue.enabled:
+            with self.uow.readonly():
+                if not self.uow.articulos_contrato.get(programacion_dto.articulo_contrato_id):
+                    raise ValueError(f"Artículo con id {programacion_dto.articulo_contrato_id} no encontrado.")
+            self.write_queue.put(
+                "programaciones_mensuales",
+                self._CLAVES_PROGRAMACION,
+                programacion_dto.model_dump(exclude={"id"}),
+            )
+            return programacion_dto
+
         with self.uow:
             # Buscar eficientemente si ya existe una programación para este artículo y mes
             programacion = self.uow.programaciones_mensuales.find_one_by(
@@ -53,21 +118,23 @@ class NutricionService:
                 self.uow.programaciones_mensuales.add(programacion)
             
             self.uow.commit()
-            return ProgramacionMensualDTO.from_orm(programacion)
+            return to_dto(ProgramacionMensualDTO, programacion)
 
     def generar_requerimiento_consolidado(self, mes: datetime.date, usuario_id: int) -> SalidaRequerimientoDTO:
         """
         Consolida todas las programaciones de un mes y genera un único
         documento de SalidaRequerimiento con un QR.
         """
+        self._aplicar_escrituras_pendientes()
         with self.uow:
             # Validar que existan programaciones para ese mes
             programaciones_del_mes = self.uow.programaciones_mensuales.find(mes_anho=mes)
             if not programaciones_del_mes:
                 raise ValueError(f"No hay programaciones para el mes {mes.strftime('%Y-%m')} para consolidar.")
 
-            # Generar un QR ID único para este requerimiento consolidado
-            qr_id = f"REQ-{mes.strftime('%Y%m')}-{uuid.uuid4().hex[:8].upper()}"
+            # QR ID único del contador diario; conserva el mes en el segundo segmento
+            # ("REQ-YYYYMM-..."), del que lo lee el despacho en almacén.
+            qr_id = self.folios.reservar("REQ", prefijo=f"REQ-{mes.strftime('%Y%m')}")[0]
 
             nuevo_requerimiento = SalidaRequerimiento(
                 qr_id=qr_id,
@@ -79,35 +146,58 @@ class NutricionService:
             self.uow.salidas_requerimiento.add(nuevo_requerimiento)
             self.uow.commit()
 
-            return SalidaRequerimientoDTO.from_orm(nuevo_requerimiento)
+            return to_dto(SalidaRequerimientoDTO, nuevo_requerimiento)
 
     def validar_disponibilidad_articulo(self, articulo_id: int, cantidad_total_mes: int) -> bool:
         """
         Valida si la cantidad solicitada para un artículo en un mes es viable
-        contra el contrato, calculando el total programado eficientemente.
+        contra el contrato, con el total programado mantenido en el artículo.
+        Se llama en cada edición de la captura: no vacía la cola de escrituras diferidas,
+        sino que superpone al total confirmado las programaciones aún encoladas.
         """
-        with self.uow:
+        with self.uow.readonly():
             articulo = self.uow.articulos_contrato.get(articulo_id)
             if not articulo:
                 raise ValueError(f"Artículo con id {articulo_id} no encontrado.")
 
-            # 1. Calcular el total ya programado de forma eficiente.
-            # Se selecciona solo la columna necesaria en lugar de objetos completos.
-            # La suma se realiza en Python ya que sumar valores de un campo JSON
-            # no es una operación estándar de SQL y varía por dialecto.
-            stmt = select(ProgramacionMensual.cantidades_por_dia).where(
-                ProgramacionMensual.articulo_contrato_id == articulo_id
-            )
-            lista_de_cantidades_por_dia = self.uow.session.execute(stmt).scalars().all()
-            
-            total_ya_programado = sum(
-                sum(cantidades.values()) for cantidades in lista_de_cantidades_por_dia if cantidades
-            )
-
+            # 1. El total ya programado se mantiene en el propio artículo (cant_programada):
+            # los triggers de programacion_mensual le aplican la diferencia de cada guardado.
+            # Los guardados todavía en la cola se suman sin confirmarlos.
+            programado = articulo.cant_programada + self._programado_en_cola(articulo_id)
             # 2. Calcular el disponible real.
             # Es el máximo del contrato menos lo ya consumido (despachado) y menos
             # lo que está en otras programaciones pendientes.
-            disponible_real = articulo.cant_maxima - articulo.cant_consumida - total_ya_programado
+            disponible_real = articulo.cant_maxima - articulo.cant_consumida - programado
             
             # 3. La validación es si la nueva cantidad para este mes cabe en lo que queda.
             return cantidad_total_mes <= disponible_real
+
+    def reconciliar_cant_programada(self, corregir: bool = True) -> List[DesviacionProgramadoDTO]:
+        """
+        Recalcula el total programado de cada artículo a partir de las cantidades diarias
+        (cantidades_por_dia) de sus programaciones y lo compara con cant_programada.
+        Devuelve los artículos desviados y, si `corregir`, reescribe su total recalculado.
+        """
+        self._aplicar_escrituras_pendientes()
+        dias = func.json_each(ProgramacionMensual.cantidades_por_dia).table_valued("value")
+        recalculada = func.coalesce(
+            select(func.sum(dias.c.value))
+            .select_from(ProgramacionMensual)
+            .join(dias, true())
+            .where(ProgramacionMensual.articulo_contrato_id == ArticuloContrato.id)
+            .scalar_subquery(),
+            0,
+        )
+        with (self.uow if corregir else self.uow.readonly()):
+            desviaciones = self.uow.articulos_contrato.project(
+                DesviacionProgramadoDTO,
+                ArticuloContrato.cant_programada != recalculada,
+                columns={"articulo_contrato_id": ArticuloContrato.id, "cant_recalculada": recalculada},
+                order_by=ArticuloContrato.id,
+            )
+            if corregir and desviaciones:
+                self.uow.articulos_contrato.update_many([
+                    {"id": d.articulo_contrato_id, "cant_programada": d.cant_recalculada} for d in desviaciones
+                ])
+                self.uow.commit()
+            return desviaciones
@@ -10,7 +10,8 @@ from sigvcf.modules.nutricion.dto import ProgramacionMensualDTO, ArticuloContrat
 logger = logging.getLogger(__name__)
 
 class NutricionViewModel(QObject):
-    articulos_cargados = Signal(list)
+    articulos_cargados = Signal(list)  # Primera página de artículos; reinicia el combo
+    articulos_pagina_cargada = Signal(list)  # Páginas siguientes, al recorrer la lista del combo
     requerimiento_generado = Signal(object)
     exito = Signal(str)
     error = Signal(str)
@@ -24,20 +25,41 @@ class NutricionViewModel(QObject):
     ):
         super().__init__(parent)
         self.nutricion_service = nutricion_service
+        # Clave de la siguiente página de artículos; None cuando ya se cargó la última.
+        self._siguiente_articulos: int | None = None
+
+    @property
+    def hay_mas_articulos(self) -> bool:
+        return self._siguiente_articulos is not None
 
     @Slot()
     def cargar_articulos_disponibles(self):
-        """Carga DTOs de artículos disponibles llamando al servicio de nutrición."""
+        """Carga la primera página de artículos disponibles llamando al servicio de nutrición."""
         logger.info("ViewModel: Cargando artículos disponibles para nutrición.")
         try:
             # La lógica de consulta y conversión a DTO se delega al servicio.
-            articulos_dto = self.nutricion_service.obtener_articulos_disponibles()
+            articulos_dto, self._siguiente_articulos = self.nutricion_service.obtener_articulos_disponibles_pagina()
             self.articulos_cargados.emit(articulos_dto)
         except Exception as e:
             msg = f"Error al cargar artículos: {e}"
             logger.error(f"ViewModel: {msg}", exc_info=True)
             self.error.emit(msg)
 
+    @Slot()
+    def cargar_mas_articulos(self):
+        """Carga la página de artículos que sigue a la última cargada."""
+        if self._siguiente_articulos is None:
+            return
+        try:
+            articulos_dto, self._siguiente_articulos = self.nutricion_service.obtener_articulos_disponibles_pagina(
+                self._siguiente_articulos
+            )
+            self.articulos_pagina_cargada.emit(articulos_dto)
+        except Exception as e:
+            msg = f"Error al cargar artículos: {e}"
+            logger.error(f"ViewModel: {msg}", exc_info=True)
+            self.error.emit(msg)
+
     @Slot(int, int)
     def validar_disponibilidad_para_mes(self, articulo_id: int, cantidad_total_mes: int):
         logger.info(f"ViewModel: Validando disponibilidad para artículo {articulo_id}, cantidad {cantidad_total_mes}.")
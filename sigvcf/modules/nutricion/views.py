@@ -70,6 +70,9 @@ class NutricionView(QWidget):
         self.programacion_table.cellChanged.connect(self._on_cell_changed)
 
         self.vm.articulos_cargados.connect(self._update_articulos_combo)
+        self.vm.articulos_pagina_cargada.connect(self._append_articulos_combo)
+        # Los artículos llegan por páginas: la siguiente se pide al llegar al final de la lista.
+        self.articulo_combo.view().verticalScrollBar().valueChanged.connect(self._on_articulos_scroll)
         self.vm.programacion_guardada.connect(self._show_status_message)
         self.vm.requerimiento_generado.connect(self._show_requerimiento_info)
 
@@ -139,6 +142,16 @@ class NutricionView(QWidget):
             self.articulo_combo.addItem(f"{articulo.descripcion} ({articulo.clave_articulo})", articulo.id)
         self.articulo_combo.blockSignals(False)
 
+    def _append_articulos_combo(self, articulos: List[ArticuloContratoSimpleDTO]):
+        self.articulo_combo.blockSignals(True)
+        for articulo in articulos:
+            self.articulo_combo.addItem(f"{articulo.descripcion} ({articulo.clave_articulo})", articulo.id)
+        self.articulo_combo.blockSignals(False)
+
+    def _on_articulos_scroll(self, valor: int):
+        if self.vm.hay_mas_articulos and valor == self.articulo_combo.view().verticalScrollBar().maximum():
+            self.vm.cargar_mas_articulos()
+
     def _show_status_message(self, message: str):
         if "Error" in message or "Advertencia" in message:
             QMessageBox.warning(self, "Atención", message)
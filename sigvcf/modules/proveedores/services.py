@@ -1,9 +1,11 @@
 ### FILE: sigvcf/modules/proveedores/services.py
 
 from typing import List
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select
+from sqlalchemy.orm import contains_eager, joinedload
 
-from sigvcf.core.domain.models import OrdenDeCompra, Contrato
+from sigvcf.core.domain.models import OrdenDeCompra, Contrato, EntradaBodega
+from sigvcf.infrastructure.persistence.loading import loader_plan
 from sigvcf.infrastructure.persistence.unit_of_work import IUnitOfWork
 from sigvcf.modules.proveedores.dto import OrdenCompraProveedorDTO, EstadoEntregaDTO
 
@@ -15,25 +17,25 @@ class ProveedorService:
     def __init__(self, uow: IUnitOfWork):
         self.uow = uow
 
+    @loader_plan(contains_eager(OrdenDeCompra.contrato))
     def consultar_ordenes_pendientes(self, proveedor_id: int) -> List[OrdenCompraProveedorDTO]:
         """
         Consulta las órdenes de compra que están aprobadas y pendientes de entrega
         para un proveedor específico.
         """
-        with self.uow:
+        with self.uow.readonly():
             proveedor = self.uow.proveedores.get(proveedor_id)
             if not proveedor:
                 raise ValueError(f"Proveedor con id {proveedor_id} no encontrado.")
 
             estados_pendientes = ['APROBADA', 'FACTURA_CARGADA']
 
-            # Consulta única y eficiente con JOIN explícito y carga eager de la relación
-            # para evitar el problema N+1.
+            # Consulta única con JOIN explícito; el plan de carga puebla la relación
+            # contrato desde ese mismo JOIN (contains_eager) para evitar el problema N+1.
             ordenes = self.uow.session.query(OrdenDeCompra)\
-                .join(Contrato, OrdenDeCompra.contrato_id == Contrato.id)\
+                .join(OrdenDeCompra.contrato)\
                 .filter(Contrato.proveedor_id == proveedor_id)\
                 .filter(OrdenDeCompra.estado.in_(estados_pendientes))\
-                .options(joinedload(OrdenDeCompra.contrato))\
                 .all()
 
             ordenes_dto = [
@@ -47,6 +49,7 @@ class ProveedorService:
             
             return ordenes_dto
 
+    @loader_plan(joinedload(OrdenDeCompra.contrato))
     def cargar_factura_xml(self, orden_id: int, proveedor_id: int, xml_content: str) -> None:
         """
         Permite a un proveedor cargar el XML de una factura para una orden de compra.
@@ -54,51 +57,62 @@ class ProveedorService:
         En un sistema real, el xml_content se guardaría en un sistema de archivos
         y la ruta se asociaría a la orden. Aquí, simulamos el proceso cambiando el estado.
         """
-        with self.uow:
-            orden = self.uow.ordenes_de_compra.get(orden_id)
-            if not orden:
-                raise ValueError(f"Orden de compra con id {orden_id} no encontrada.")
-            
-            # Validar que la orden pertenece al proveedor que realiza la acción
-            if orden.contrato.proveedor_id != proveedor_id:
-                raise PermissionError("El proveedor no tiene permiso sobre esta orden de compra.")
+        # --- Simulación de validación y guardado de XML ---
+        if not xml_content.strip().startswith('<') or not xml_content.strip().endswith('>'):
+             raise ValueError("Contenido XML no válido.")
+        # En un sistema real:
+        # 1. Parsear el XML y validar su estructura (CFDI).
+        # 2. Validar que los datos del XML coincidan con la orden de compra.
+        # 3. Guardar el archivo en una ubicación segura (ej. S3, disco local).
+        #    factura_path = file_storage.save(f"facturas/{orden_id}.xml", xml_content)
+        # 4. Asociar 'factura_path' a la orden (requeriría un campo en el modelo).
+        # --- Fin de la simulación ---
 
-            if orden.estado != 'APROBADA':
+        # La orden debe pertenecer al proveedor que realiza la acción.
+        del_proveedor = OrdenDeCompra.contrato_id.in_(
+            select(Contrato.id).where(Contrato.proveedor_id == proveedor_id)
+        )
+        with self.uow:
+            # Cambiar el estado para indicar que la factura está lista para la recepción física,
+            # en un UPDATE condicional; la orden solo se carga para explicar un rechazo.
+            if not self.uow.ordenes_de_compra.transition(orden_id, 'APROBADA', 'FACTURA_CARGADA', del_proveedor):
+                orden = self.uow.ordenes_de_compra.get(orden_id)
+                if not orden:
+                    raise ValueError(f"Orden de compra con id {orden_id} no encontrada.")
+                if orden.contrato.proveedor_id != proveedor_id:
+                    raise PermissionError("El proveedor no tiene permiso sobre esta orden de compra.")
                 raise ValueError(f"La factura solo puede cargarse para órdenes en estado 'APROBADA'. Estado actual: {orden.estado}")
-
-            # --- Simulación de validación y guardado de XML ---
-            if not xml_content.strip().startswith('<') or not xml_content.strip().endswith('>'):
-                 raise ValueError("Contenido XML no válido.")
-            # En un sistema real:
-            # 1. Parsear el XML y validar su estructura (CFDI).
-            # 2. Validar que los datos del XML coincidan con la orden de compra.
-            # 3. Guardar el archivo en una ubicación segura (ej. S3, disco local).
-            #    factura_path = file_storage.save(f"facturas/{orden_id}.xml", xml_content)
-            # 4. Asociar 'factura_path' a la orden (requeriría un campo en el modelo).
-            # --- Fin de la simulación ---
-
-            # Cambiar el estado para indicar que la factura está lista para la recepción física
-            orden.estado = 'FACTURA_CARGADA'
             self.uow.commit()
 
+    @loader_plan(joinedload(EntradaBodega.orden_de_compra).joinedload(OrdenDeCompra.contrato))
     def consultar_estado_entrega(self, folio_rb: str, proveedor_id: int) -> EstadoEntregaDTO:
         """
         Permite a un proveedor consultar el estado de una entrega específica
         usando el Folio de Recibo de Bodega (R.B.).
         """
-        with self.uow:
-            entradas = self.uow.entradas_bodega.find(folio_rb=folio_rb)
-            if not entradas:
-                raise ValueError(f"No se encontró ninguna entrega con el folio '{folio_rb}'.")
-            
-            entrada = entradas[0]
-            
-            # Validar que la entrega pertenece a una orden del proveedor
-            if entrada.orden_de_compra.contrato.proveedor_id != proveedor_id:
-                raise PermissionError("El proveedor no tiene permiso para consultar este folio.")
+        with self.uow.readonly():
+            estado = self._estado_entrega(folio_rb, proveedor_id)
+        # Las entregas de contratos cerrados se consultan en el archivo histórico.
+        if estado is None and self.uow.archive_available:
+            with self.uow.readonly(archive=True):
+                estado = self._estado_entrega(folio_rb, proveedor_id)
+        if estado is None:
+            raise ValueError(f"No se encontró ninguna entrega con el folio '{folio_rb}'.")
+        return estado
+
+    def _estado_entrega(self, folio_rb: str, proveedor_id: int) -> EstadoEntregaDTO | None:
+        entradas = self.uow.entradas_bodega.find(folio_rb=folio_rb)
+        if not entradas:
+            return None
+
+        entrada = entradas[0]
+
+        # Validar que la entrega pertenece a una orden del proveedor
+        if entrada.orden_de_compra.contrato.proveedor_id != proveedor_id:
+            raise PermissionError("El proveedor no tiene permiso para consultar este folio.")
 
-            return EstadoEntregaDTO(
-                folio_rb=entrada.folio_rb,
-                fecha_recepcion=entrada.fecha_recepcion,
-                estado_orden_compra=entrada.orden_de_compra.estado
-            )
\ No newline at end of file
+        return EstadoEntregaDTO(
+            folio_rb=entrada.folio_rb,
+            fecha_recepcion=entrada.fecha_recepcion,
+            estado_orden_compra=entrada.orden_de_compra.estado
+        )
\ No newline at end of file